@@ -0,0 +1,176 @@
+import typing
+import pygame
+
+import utils.constants as constants
+
+from components.button import Button
+from components.input import InputTextBox
+from components.label import Label
+from components.scene import Scene, SceneManager
+from modules.game.logic import CheckResult, GameBotLogic, GameUserLogic
+from modules.game.random_stream import CounterRandom, Stream
+from modules.game.scenes import EndScene, GameBotScene, GameMode, GameUserScene
+from modules.game.strategies import BisectionStrategy
+from modules.lobby.scenes import StartScene
+from utils.config import ConfigStore
+from utils.enum_types import AlignType
+from utils.transform import TransformUtils
+
+class Case:
+    """
+    One benchmark: setup runs once, run does one operation and is timed many times
+    """
+    def __init__(self, name: str, setup: typing.Callable[[], typing.Callable[[], None]]) -> None:
+        self.name = name
+        self.setup = setup
+
+def labelDraw(screen: pygame.surface.Surface) -> typing.Callable[[], None]:
+    label = Label(text="Your number is between 0 and 1000", x=250, y=200, anchor=AlignType.MID_CENTER)
+    return lambda: label.draw(screen)
+
+def labelSetText(screen: pygame.surface.Surface) -> typing.Callable[[], None]:
+    label = Label(x=250, y=200, anchor=AlignType.MID_CENTER)
+    texts = ["You tried {} times".format(i) for i in range(8)]
+    state = [0]
+
+    def run() -> None:
+        state[0] = (state[0] + 1) % len(texts)
+        label.setText(texts[state[0]])
+        label.draw(screen)
+    return run
+
+def labelCount(screen: pygame.surface.Surface) -> typing.Callable[[], None]:
+    label = Label(x=250, y=30, anchor=AlignType.TOP_CENTER)
+    state = [0]
+
+    def run() -> None:
+        state[0] += 1
+        label.setText("You tried {} times".format(state[0]))
+        label.draw(screen)
+    return run
+
+def inputTyping(screen: pygame.surface.Surface) -> typing.Callable[[], None]:
+    inputBox = InputTextBox(x=160, y=140)
+    inputBox.setFocus(True)
+    digits = "0123456789"
+    state = [0]
+
+    def run() -> None:
+        state[0] += 1
+        if len(inputBox.getText()) >= 12: inputBox.clearText()
+        inputBox.pushText(digits[state[0] % len(digits)])
+        inputBox.draw(screen)
+    return run
+
+def buttonDraw(screen: pygame.surface.Surface) -> typing.Callable[[], None]:
+    button = Button(x=160, y=200, text="Check")
+    return lambda: button.draw(screen)
+
+def inputDraw(screen: pygame.surface.Surface) -> typing.Callable[[], None]:
+    inputBox = InputTextBox(x=160, y=140, padding=(8, 0), textAnchor=AlignType.MID_LEFT, align=AlignType.MID_LEFT)
+    inputBox.setFocus(True)
+    inputBox.pushText("512")
+    return lambda: inputBox.draw(screen)
+
+def alignAnchor(screen: pygame.surface.Surface) -> typing.Callable[[], None]:
+    alignTypes = list(AlignType)
+
+    def run() -> None:
+        for alignType in alignTypes:
+            TransformUtils.alignAnchor(alignType, 250, 250, 120, 30)
+    return run
+
+def sceneFrame(getScene: typing.Callable[[], Scene]) -> typing.Callable[[pygame.surface.Surface], typing.Callable[[], None]]:
+    def setup(screen: pygame.surface.Surface) -> typing.Callable[[], None]:
+        scene = getScene()
+        scene.onEnter()
+
+        def run() -> None:
+            scene.update()
+            scene.drawFull(screen)
+        return run
+    return setup
+
+def sceneIdleFrame(screen: pygame.surface.Surface) -> typing.Callable[[], None]:
+    scene = GameBotScene.getInstance()
+    scene.onEnter()
+    scene.drawFull(screen)
+
+    def run() -> None:
+        scene.update()
+        scene.drawDirty(screen)
+    return run
+
+def scenePush(screen: pygame.surface.Surface) -> typing.Callable[[], None]:
+    sceneMgr = SceneManager.getInstance()
+    startScene = StartScene.getInstance()
+    gameScene = GameBotScene.getInstance()
+
+    def run() -> None:
+        sceneMgr.clear()
+        sceneMgr.push(startScene)
+        sceneMgr.push(gameScene)
+        sceneMgr.draw(screen)
+    return run
+
+def configLoad(screen: pygame.surface.Surface) -> typing.Callable[[], None]:
+    return lambda: ConfigStore().load(GameBotScene.CONFIG_FILE, GameBotScene.WIDGET_SCHEMAS)
+
+def configLoadCached(screen: pygame.surface.Surface) -> typing.Callable[[], None]:
+    configStore = ConfigStore()
+    return lambda: configStore.load(GameBotScene.CONFIG_FILE, GameBotScene.WIDGET_SCHEMAS)
+
+def botGame(screen: pygame.surface.Surface) -> typing.Callable[[], None]:
+    logic = GameBotLogic(rng=CounterRandom(0, 0, Stream.HOST))
+
+    def run() -> None:
+        logic.start()
+        lowerBound, upperBound = logic.getLowerHint(), logic.getUpperHint()
+        while True:
+            answer = (lowerBound + upperBound) // 2
+            checkResult = logic.checkAnswer(answer)
+            if checkResult == CheckResult.EQUAL: return
+            if checkResult == CheckResult.GREATER_THAN:
+                lowerBound = answer + 1
+            else:
+                upperBound = answer - 1
+    return run
+
+def userGame(screen: pygame.surface.Surface) -> typing.Callable[[], None]:
+    logic = GameUserLogic(rng=CounterRandom(0, 0, Stream.GUESSER), strategy=BisectionStrategy())
+    secret = (GameUserLogic.MIN_RAND + GameUserLogic.MAX_RAND) // 3
+
+    def run() -> None:
+        logic.start()
+        while logic.getGuessNumber() != secret:
+            if logic.getGuessNumber() < secret:
+                logic.updateLower()
+            else:
+                logic.updateUpper()
+            logic.guess()
+    return run
+
+CASES: typing.List[Case] = [
+    Case("widget.label.draw", labelDraw),
+    Case("widget.label.setText", labelSetText),
+    Case("widget.label.count", labelCount),
+    Case("widget.input.typing", inputTyping),
+    Case("widget.button.draw", buttonDraw),
+    Case("widget.input.draw", inputDraw),
+    Case("transform.alignAnchor", alignAnchor),
+    Case("scene.StartScene.frame", sceneFrame(StartScene.getInstance)),
+    Case("scene.GameBotScene.frame", sceneFrame(GameBotScene.getInstance)),
+    Case("scene.GameUserScene.frame", sceneFrame(GameUserScene.getInstance)),
+    Case("scene.EndScene.frame", sceneFrame(lambda: EndScene.getInstance(GameMode.BOT_HOST))),
+    Case("scene.GameBotScene.idleFrame", sceneIdleFrame),
+    Case("scene.push", scenePush),
+    Case("config.load", configLoad),
+    Case("config.loadCached", configLoadCached),
+    Case("logic.botGame", botGame),
+    Case("logic.userGame", userGame)
+]
+
+def createScreen() -> pygame.surface.Surface:
+    if not pygame.display.get_init(): pygame.display.init()
+    if not pygame.font.get_init(): pygame.font.init()
+    return pygame.display.set_mode((constants.WIDTH, constants.HEIGHT))
@@ -0,0 +1,123 @@
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import argparse
+import json
+import logging
+import platform
+import statistics
+import sys
+import time
+import typing
+
+import pygame
+
+COMPARE_KEY = "bestUsPerOp"
+
+class BenchmarkResult:
+    def __init__(self, name: str, samples: typing.List[float], loops: int) -> None:
+        self.name = name
+        self.samples = samples
+        self.loops = loops
+
+    def getMedian(self) -> float:
+        return statistics.median(self.samples)
+
+    def getBest(self) -> float:
+        return min(self.samples)
+
+    def toDict(self) -> dict:
+        return {
+            "usPerOp": round(self.getMedian(), 4),
+            "bestUsPerOp": round(self.getBest(), 4),
+            "loops": self.loops,
+            "repeats": len(self.samples)
+        }
+
+class BenchmarkRunner:
+    """
+    Calibrates the loop count of each case so one repeat lasts at least minTime, then keeps the per
+    operation time of every repeat in microseconds
+    """
+    DEFAULT_MIN_TIME = 0.05
+    DEFAULT_REPEATS = 5
+    DEFAULT_THRESHOLD = 0.15
+
+    def __init__(self, minTime: float = DEFAULT_MIN_TIME, repeats: int = DEFAULT_REPEATS) -> None:
+        self.minTime = minTime
+        self.repeats = repeats
+
+    def run(self, name: str, operation: typing.Callable[[], None]) -> BenchmarkResult:
+        loops = 1
+        while True:
+            elapsed = self._time(operation, loops)
+            if elapsed >= self.minTime: break
+            loops *= 2 if elapsed <= 0 else max(2, min(10, int(self.minTime / elapsed) + 1))
+
+        samples = [self._time(operation, loops) / loops * 1e6 for _ in range(self.repeats)]
+        return BenchmarkResult(name, samples, loops)
+
+    def _time(self, operation: typing.Callable[[], None], loops: int) -> float:
+        startTime = time.perf_counter()
+        for _ in range(loops):
+            operation()
+        return time.perf_counter() - startTime
+
+def compare(baseline: dict, results: dict, threshold: float) -> typing.List[str]:
+    """
+    Names of the cases slower than the baseline by more than threshold. The best repeat is compared, it is
+    the least disturbed by other processes
+    """
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline: continue
+
+        ratio = result[COMPARE_KEY] / max(baseline[name][COMPARE_KEY], 1e-9)
+        status = "REGRESSION" if ratio > 1 + threshold else ("faster" if ratio < 1 - threshold else "ok")
+        print("{:34s} {:>12.3f}us {:>12.3f}us {:>7.2f}x {}".format(name, baseline[name][COMPARE_KEY], result[COMPARE_KEY], ratio, status))
+        if status == "REGRESSION": regressions.append(name)
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark widgets, scenes, config loading and game logic headless")
+    parser.add_argument("--filter", default="", help="only run cases whose name contains this text")
+    parser.add_argument("--save", metavar="PATH", help="write the results as a json baseline")
+    parser.add_argument("--compare", metavar="PATH", help="compare against a json baseline, exit 1 on regressions")
+    parser.add_argument("--threshold", type=float, default=BenchmarkRunner.DEFAULT_THRESHOLD, help="allowed slowdown, 0.1 is 10%%")
+    parser.add_argument("--min-time", type=float, default=BenchmarkRunner.DEFAULT_MIN_TIME)
+    parser.add_argument("--repeats", type=int, default=BenchmarkRunner.DEFAULT_REPEATS)
+    args = parser.parse_args()
+
+    from bench.cases import CASES, createScreen
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    screen = createScreen()
+    runner = BenchmarkRunner(args.min_time, args.repeats)
+
+    results = {}
+    for case in CASES:
+        if args.filter not in case.name: continue
+
+        result = runner.run(case.name, case.setup(screen))
+        results[case.name] = result.toDict()
+        print("{:34s} {:>12.3f}us/op best={:.3f}us loops={}".format(case.name, result.getMedian(), result.getBest(), result.loops))
+
+    pygame.quit()
+
+    if args.save is not None:
+        with open(args.save, "w") as f:
+            json.dump({"python": platform.python_version(), "pygame": pygame.version.ver, "results": results}, f, indent=2)
+
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(baseline, results, args.threshold)
+        if len(regressions) > 0:
+            print("regressions: {}".format(", ".join(regressions)))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
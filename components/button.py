@@ -1,13 +1,18 @@
 import pygame
 import typing
 
+from components.widget import Widget
+
+from utils.config import ConfigField, ConfigSchema, toColor, toInt, toStr
 from utils.enum_types import MouseEvent
+from utils.font_cache import FontCache
 from utils.logger import Logger
+from utils.text_cache import TextCache
 
-pygame.init()
-FONT = pygame.font.Font(None, 30)
+class ButtonConfig:
+    __slots__ = ("posX", "posY", "text", "color", "textColor", "width", "height")
 
-class Button:
+class Button(Widget):
     DEFAULT_COLOR = (255, 255, 255)
     DEFAULT_TEXT_COLOR = (0, 0, 0)
     DEFAULT_TEXT = ""
@@ -16,11 +21,22 @@ class Button:
     DEFAULT_WIDTH = 180
     DEFAULT_HEIGHT = 40
 
+    SCHEMA = ConfigSchema(ButtonConfig, [
+        ConfigField("posX", DEFAULT_X, toInt),
+        ConfigField("posY", DEFAULT_Y, toInt),
+        ConfigField("text", DEFAULT_TEXT, toStr),
+        ConfigField("color", DEFAULT_COLOR, toColor),
+        ConfigField("textColor", DEFAULT_TEXT_COLOR, toColor),
+        ConfigField("width", DEFAULT_WIDTH, toInt),
+        ConfigField("height", DEFAULT_HEIGHT, toInt)
+    ])
+
     logger = Logger(__name__).getInstance()
 
-    def __init__(self, conf: dict = None, x: int = DEFAULT_X, y: int = DEFAULT_Y, text: str = DEFAULT_TEXT, 
+    def __init__(self, conf: dict | ButtonConfig = None, x: int = DEFAULT_X, y: int = DEFAULT_Y, text: str = DEFAULT_TEXT, 
             color: tuple[int, int, int] = DEFAULT_COLOR, textColor: tuple[int, int, int] = DEFAULT_TEXT_COLOR, 
             width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT) -> None:
+        super().__init__()
 
         self.isClicked: bool = False
         self.eventListeners: dict[MouseEvent, typing.Callable[[], None]] = {}
@@ -30,18 +46,21 @@ class Button:
         else:
             self._initWithParams(x, y, text, color, textColor, width, height)
 
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
+        self.rect: pygame.Rect = None
+        self.textImg: pygame.surface.Surface = None
+        self.textPos: tuple[int, int] = None
 
-    def _initWithConf(self, conf: dict):
-        Button.logger.info("Button._initWithConf. conf={}".format(conf))
+    def _initWithConf(self, conf: dict | ButtonConfig):
+        conf = Button.SCHEMA.ensure(conf)
+        Button.logger.debug("Button._initWithConf. text=%s posX=%s posY=%s", conf.text, conf.posX, conf.posY)
 
-        self.x = conf["posX"] if "posX" in conf else Button.DEFAULT_X
-        self.y = conf["posY"] if "posY" in conf else Button.DEFAULT_Y
-        self.text = conf["text"] if "text" in conf else Button.DEFAULT_TEXT
-        self.color = tuple(conf["color"]) if "color" in conf else Button.DEFAULT_COLOR
-        self.textColor = conf["textColor"] if "textColor" in conf else Button.DEFAULT_TEXT_COLOR
-        self.width = conf["width"] if "width" in conf else Button.DEFAULT_WIDTH
-        self.height = conf["height"] if "height" in conf else Button.DEFAULT_HEIGHT
+        self.x = conf.posX
+        self.y = conf.posY
+        self.text = conf.text
+        self.color = conf.color
+        self.textColor = conf.textColor
+        self.width = conf.width
+        self.height = conf.height
 
     def _initWithParams(self, x: int, y: int, text: str, color: tuple[int, int, int], textColor: tuple[int, int, int], width: int, height: int) -> None:
         self.x = x
@@ -52,21 +71,54 @@ class Button:
         self.width = width
         self.height = height
 
-    def draw(self, screen: pygame.surface.Surface) -> None:
-        pos = pygame.mouse.get_pos()
+    def isInteractive(self) -> bool:
+        return True
+
+    def onMouseDown(self, pos: tuple[int, int]) -> None:
+        self.isClicked = True
 
-        if self.rect.collidepoint(pos):
-            if pygame.mouse.get_pressed()[0] == 1 and not self.isClicked:
-                self.isClicked = True
-            
-            if pygame.mouse.get_pressed()[0] == 0 and self.isClicked:
-                self.isClicked = False
-                if MouseEvent.ON_TOUCH_END in self.eventListeners: self.eventListeners[MouseEvent.ON_TOUCH_END]()
+    def onMouseUp(self, pos: tuple[int, int]) -> None:
+        if not self.isClicked: return
 
+        self.isClicked = False
+        if self.getRect().collidepoint(pos) and MouseEvent.ON_TOUCH_END in self.eventListeners: 
+            self.eventListeners[MouseEvent.ON_TOUCH_END]()
+
+    def layout(self) -> None:
+        self.rect = pygame.Rect(self.x + self.origin[0], self.y + self.origin[1], self.width, self.height)
+
+        textWidth, textHeight = self._getTextImg().get_size()
+        self.textPos = (self.rect.x + self.width // 2 - textWidth // 2, self.rect.y + self.height // 2 - textHeight // 2)
+
+    def draw(self, screen: pygame.surface.Surface) -> None:
+        self.ensureLayout()
         pygame.draw.rect(screen, self.color, self.rect)
+        screen.blit(self._getTextImg(), self.textPos)
+
+    def _getTextImg(self) -> pygame.surface.Surface:
+        if self.textImg is None:
+            self.textImg = TextCache.getInstance().render(FontCache.getInstance().getDefault(), self.text, True, self.textColor)
+        return self.textImg
+
+    def setSize(self, width: int, height: int) -> None:
+        if (width, height) == (self.width, self.height): return
+
+        self.width = width
+        self.height = height
+        self.invalidateLayout()
+        self.markDirty()
+
+    def setText(self, text: str) -> None:
+        if text == self.text: return
+
+        self.text = text
+        self.textImg = None
+        self.invalidateLayout()
+        self.markDirty()
 
-        textImg = FONT.render(self.text, True, self.textColor)
-        screen.blit(textImg, (self.x + self.width // 2 - textImg.get_size()[0] // 2, self.y + self.height // 2 - textImg.get_size()[1] // 2))
+    def getRect(self) -> pygame.Rect:
+        self.ensureLayout()
+        return self.rect
 
     def addEventListener(self, event: MouseEvent, handler: typing.Callable[[], None]) -> None:
         self.eventListeners[event] = handler
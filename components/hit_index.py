@@ -0,0 +1,57 @@
+import typing
+import pygame
+
+from components.widget import Widget
+
+class HitIndex:
+    """
+    Uniform grid over widget rects, a point query only looks at the widgets of one cell
+    """
+    DEFAULT_CELL_SIZE = 64
+
+    def __init__(self, cellSize: int = DEFAULT_CELL_SIZE) -> None:
+        self.cellSize = cellSize
+        self.cells: dict[tuple[int, int], typing.List[Widget]] = {}
+        self.rects: dict[Widget, pygame.Rect] = {}
+        self.order: dict[Widget, int] = {}
+
+    def insert(self, widget: Widget, rect: pygame.Rect) -> None:
+        if widget in self.rects: self.remove(widget)
+
+        self.rects[widget] = pygame.Rect(rect)
+        self.order[widget] = len(self.order)
+        for cell in self._getCells(rect):
+            self.cells.setdefault(cell, []).append(widget)
+
+    def remove(self, widget: Widget) -> None:
+        rect = self.rects.pop(widget, None)
+        if rect is None: return
+
+        self.order.pop(widget)
+        for cell in self._getCells(rect):
+            self.cells[cell].remove(widget)
+            if len(self.cells[cell]) == 0: del self.cells[cell]
+
+    def query(self, pos: tuple[int, int]) -> typing.List[Widget]:
+        """
+        Widgets under a point, the last one was inserted last
+        """
+        cell = (pos[0] // self.cellSize, pos[1] // self.cellSize)
+        hits = [widget for widget in self.cells.get(cell, []) if self.rects[widget].collidepoint(pos)]
+        hits.sort(key=self.order.__getitem__)
+        return hits
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.rects.clear()
+        self.order.clear()
+
+    def __len__(self) -> int:
+        return len(self.rects)
+
+    def _getCells(self, rect: pygame.Rect) -> typing.Iterator[tuple[int, int]]:
+        if rect.width <= 0 or rect.height <= 0: return
+
+        for cellX in range(rect.left // self.cellSize, (rect.right - 1) // self.cellSize + 1):
+            for cellY in range(rect.top // self.cellSize, (rect.bottom - 1) // self.cellSize + 1):
+                yield (cellX, cellY)
@@ -1,11 +1,16 @@
 import pygame
 
 from components.label import Label
+from components.widget import Widget
 
+from utils.config import ConfigField, ConfigSchema, toColor, toEnum, toInt, toIntTuple
 from utils.enum_types import AlignType
 from utils.transform import TransformUtils
 
-class InputTextBox:
+class InputTextBoxConfig:
+    __slots__ = ("posX", "posY", "width", "height", "color", "borderWidth", "textColor", "padding", "textAnchor", "align")
+
+class InputTextBox(Widget):
     DEFAULT_X = 0
     DEFAULT_Y = 0
     DEFAULT_WIDTH = 180
@@ -17,36 +22,49 @@ class InputTextBox:
     DEFAULT_TEXT_ANCHOR = AlignType.TOP_LEFT
     DEFAULT_ALIGN = AlignType.TOP_LEFT
 
-    def __init__(self, conf: dict = None, x: int = DEFAULT_X, y: int = DEFAULT_Y, color: tuple[int, int, int] = DEFAULT_COLOR, 
+    SCHEMA = ConfigSchema(InputTextBoxConfig, [
+        ConfigField("posX", DEFAULT_X, toInt),
+        ConfigField("posY", DEFAULT_Y, toInt),
+        ConfigField("width", DEFAULT_WIDTH, toInt),
+        ConfigField("height", DEFAULT_HEIGHT, toInt),
+        ConfigField("color", DEFAULT_COLOR, toColor),
+        ConfigField("borderWidth", DEFAULT_BORDER_WIDTH, toInt),
+        ConfigField("textColor", DEFAULT_TEXT_COLOR, toColor),
+        ConfigField("padding", DEFAULT_PADDING, toIntTuple),
+        ConfigField("textAnchor", DEFAULT_TEXT_ANCHOR, toEnum(AlignType)),
+        ConfigField("align", DEFAULT_ALIGN, toEnum(AlignType))
+    ])
+
+    def __init__(self, conf: dict | InputTextBoxConfig = None, x: int = DEFAULT_X, y: int = DEFAULT_Y, color: tuple[int, int, int] = DEFAULT_COLOR, 
             width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT, borderWidth: int = DEFAULT_BORDER_WIDTH, 
             textColor: tuple[int, int, int] = DEFAULT_TEXT_COLOR, padding: tuple[int, int] = DEFAULT_PADDING,
             textAnchor: AlignType = DEFAULT_TEXT_ANCHOR, align: AlignType = DEFAULT_ALIGN) -> None:
+        super().__init__()
+
         self.text = ""
 
         if conf is not None:
             self._initWithConf(conf)
         else:
-            self._initWithParams(x, y, width, height, color, width, height, borderWidth, padding, textAnchor, align)
+            self._initWithParams(x, y, color, width, height, borderWidth, textColor, padding, textAnchor, align)
 
         self.isActive = False
-        self.isClicked = False
-        self.rect = pygame.Rect(self.x, self.y, self.width, self.height)
-        textPosX, textPosY = TransformUtils.alignContent(self.align, self.x + self.padding[0], self.y + self.padding[1],
-            self.width - self.padding[0] * 2, self.height - self.padding[1] * 2)
-        print(textPosX, textPosY, self.x, self.y, self.align)
-        self.textLabel: Label = Label(color=textColor, x=textPosX, y=textPosY, anchor=self.textAnchor)
-
-    def _initWithConf(self, conf: dict):
-        self.x = conf["posX"] if "posX" in conf else InputTextBox.DEFAULT_X
-        self.y = conf["posY"] if "posY" in conf else InputTextBox.DEFAULT_Y
-        self.width = conf["width"] if "width" in conf else InputTextBox.DEFAULT_WIDTH
-        self.height = conf["height"] if "height" in conf else InputTextBox.DEFAULT_HEIGHT
-        self.color = tuple(conf["color"]) if "color" in conf else InputTextBox.DEFAULT_COLOR
-        self.borderWidth = conf["borderWidth"] if "borderWidth" in conf else InputTextBox.DEFAULT_BORDER_WIDTH
-        self.textColor = tuple(conf["textColor"]) if "textColor" in conf else InputTextBox.DEFAULT_TEXT_COLOR
-        self.padding = tuple(conf["padding"]) if "padding" in conf else InputTextBox.DEFAULT_PADDING
-        self.textAnchor = AlignType[conf["textAnchor"]] if "textAnchor" in conf else InputTextBox.DEFAULT_TEXT_ANCHOR
-        self.align = AlignType[conf["align"]] if "align" in conf else InputTextBox.DEFAULT_ALIGN
+        self.rect: pygame.Rect = None
+        self.textLabel: Label = Label(color=self.textColor, anchor=self.textAnchor)
+
+    def _initWithConf(self, conf: dict | InputTextBoxConfig):
+        conf = InputTextBox.SCHEMA.ensure(conf)
+
+        self.x = conf.posX
+        self.y = conf.posY
+        self.width = conf.width
+        self.height = conf.height
+        self.color = conf.color
+        self.borderWidth = conf.borderWidth
+        self.textColor = conf.textColor
+        self.padding = conf.padding
+        self.textAnchor = conf.textAnchor
+        self.align = conf.align
 
     def _initWithParams(self, x: int, y: int, color: tuple[int, int, int], width: int, height: int, borderWidth: int, 
             textColor: tuple[int, int, int], padding: tuple[int, int], textAnchor: AlignType, align: AlignType):
@@ -61,32 +79,78 @@ class InputTextBox:
         self.textAnchor = textAnchor
         self.align = align
 
-    def draw(self, screen: pygame.surface.Surface) -> None:
-        pos = pygame.mouse.get_pos()
+    def isInteractive(self) -> bool:
+        return True
 
-        if pygame.mouse.get_pressed()[0] == 1 and not self.isClicked:
-            self.isClicked = True
-            self.isActive = self.rect.collidepoint(pos)
-        
-        if pygame.mouse.get_pressed()[0] == 0 and self.isClicked:
-            self.isClicked = False
+    def isFocusable(self) -> bool:
+        return True
 
-        self.textLabel.setText(self.text)
+    def setFocus(self, isFocused: bool) -> None:
+        self.isActive = isFocused
+
+    def layout(self) -> None:
+        self.rect = pygame.Rect(self.x + self.origin[0], self.y + self.origin[1], self.width, self.height)
+        textPosX, textPosY = TransformUtils.alignContent(self.align, self.rect.x + self.padding[0], self.rect.y + self.padding[1],
+            self.width - self.padding[0] * 2, self.height - self.padding[1] * 2)
+        self.textLabel.setPosition(textPosX, textPosY)
+
+    def draw(self, screen: pygame.surface.Surface) -> None:
+        self.ensureLayout()
         self.textLabel.draw(screen)
         pygame.draw.rect(screen, self.color, self.rect, self.borderWidth)
 
+    def drawStatic(self, surface: pygame.surface.Surface) -> None:
+        self.ensureLayout()
+        pygame.draw.rect(surface, self.color, self.rect, self.borderWidth)
+
+    def drawDynamic(self, screen: pygame.surface.Surface) -> None:
+        self.ensureLayout()
+        self.textLabel.draw(screen)
+
+    def setSize(self, width: int, height: int) -> None:
+        if (width, height) == (self.width, self.height): return
+
+        self.width = width
+        self.height = height
+        self.invalidateLayout()
+        self.markDirty()
+
+    def getRect(self) -> pygame.Rect:
+        self.ensureLayout()
+        return self.rect.union(self.textLabel.getRect())
+
+    def getHitRect(self) -> pygame.Rect:
+        # The text can run past the box and grows with typing, only the box takes clicks
+        self.ensureLayout()
+        return self.rect
+
+    def isDirty(self) -> bool:
+        return self.dirty or self.textLabel.isDirty()
+
+    def markClean(self) -> None:
+        self.textLabel.markClean()
+        super().markClean()
+
+    def restoreState(self, other: "InputTextBox") -> None:
+        self.text = other.text
+        self.isActive = other.isActive
+        self.textLabel.setText(self.text)
+
     def pushText(self, text: str):
         if not self.isActive: return
 
         self.text += text
+        self.textLabel.setText(self.text)
 
     def popText(self):
         if not self.isActive: return
 
         self.text = self.text[0:-1]
+        self.textLabel.setText(self.text)
 
     def clearText(self):
         self.text = ""
+        self.textLabel.setText(self.text)
 
     def getText(self):
         return self.text
\ No newline at end of file
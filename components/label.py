@@ -1,22 +1,38 @@
 import pygame
 
+from components.widget import Widget
+
+from utils.config import ConfigField, ConfigSchema, toBool, toColor, toEnum, toInt, toStr
 from utils.enum_types import AlignType
+from utils.font_cache import FontCache
+from utils.text_cache import TextCache
 from utils.transform import TransformUtils
 
-pygame.init()
+class LabelConfig:
+    __slots__ = ("text", "color", "posX", "posY", "isSmooth", "anchor")
 
-class Label:
+class Label(Widget):
     DEFAULT_TEXT = ""
     DEFAULT_COLOR = (255, 255, 255)
-    DEFAULT_FONT = pygame.font.Font(None, 30)
+    DEFAULT_FONT = None
     DEFAULT_SMOOTH = True
     DEFAULT_X = 0
     DEFAULT_Y = 0
     DEFAULT_ANCHOR = AlignType.TOP_LEFT
 
-    def __init__(self, conf: dict = None, text: str = DEFAULT_TEXT, color: tuple[int, int, int] = DEFAULT_COLOR, 
+    SCHEMA = ConfigSchema(LabelConfig, [
+        ConfigField("text", DEFAULT_TEXT, toStr),
+        ConfigField("color", DEFAULT_COLOR, toColor),
+        ConfigField("posX", DEFAULT_X, toInt),
+        ConfigField("posY", DEFAULT_Y, toInt),
+        ConfigField("isSmooth", DEFAULT_SMOOTH, toBool),
+        ConfigField("anchor", DEFAULT_ANCHOR, toEnum(AlignType))
+    ])
+
+    def __init__(self, conf: dict | LabelConfig = None, text: str = DEFAULT_TEXT, color: tuple[int, int, int] = DEFAULT_COLOR, 
             font: pygame.font.Font = DEFAULT_FONT, x: int = DEFAULT_X, y: int = DEFAULT_Y, isSmooth: bool = DEFAULT_SMOOTH, 
             anchor: AlignType = DEFAULT_ANCHOR) -> None:
+        super().__init__()
 
         if conf is not None:
             self._initWithConf(conf)
@@ -24,14 +40,18 @@ class Label:
             self._initWithParams(text, color, x, y, isSmooth, anchor)
         
         self.font = font
+        self.textImg: pygame.surface.Surface = None
+        self.rect: pygame.Rect = None
 
-    def _initWithConf(self, conf: dict) -> None:
-        self.text = conf["text"] if "text" in conf else Label.DEFAULT_TEXT
-        self.color = tuple(conf["color"]) if "color" in conf else Label.DEFAULT_COLOR
-        self.x = conf["posX"] if "posX" in conf else Label.DEFAULT_X
-        self.y = conf["posY"] if "posY" in conf else Label.DEFAULT_Y
-        self.isSmooth = conf["isSmooth"] if "isSmooth" in conf else Label.DEFAULT_SMOOTH
-        self.anchor = AlignType[conf["anchor"]] if "anchor" in conf else Label.DEFAULT_ANCHOR
+    def _initWithConf(self, conf: dict | LabelConfig) -> None:
+        conf = Label.SCHEMA.ensure(conf)
+
+        self.text = conf.text
+        self.color = conf.color
+        self.x = conf.posX
+        self.y = conf.posY
+        self.isSmooth = conf.isSmooth
+        self.anchor = conf.anchor
 
     def _initWithParams(self, text: str, color: tuple[int, int, int], x: int, y: int, isSmooth: bool, anchor: AlignType) -> None:
         self.text = text
@@ -41,13 +61,35 @@ class Label:
         self.isSmooth = isSmooth
         self.anchor = anchor
 
+    def layout(self) -> None:
+        width, height = self._getTextImg().get_size()
+        posX, posY = TransformUtils.alignAnchor(self.anchor, self.x + self.origin[0], self.y + self.origin[1], width, height)
+        self.rect = pygame.Rect(posX, posY, width, height)
+
     def draw(self, screen: pygame.surface.Surface) -> None:
-        textImg = self.font.render(self.text, self.isSmooth, self.color)
-        posX, posY = TransformUtils.alignAnchor(self.anchor, self.x, self.y, textImg.get_size()[0], textImg.get_size()[1])
-        screen.blit(textImg, (posX, posY))
+        self.ensureLayout()
+        screen.blit(self._getTextImg(), self.rect)
+
+    def getRect(self) -> pygame.Rect:
+        self.ensureLayout()
+        return self.rect
+
+    def _getTextImg(self) -> pygame.surface.Surface:
+        if self.textImg is None:
+            if self.font is None: self.font = FontCache.getInstance().getDefault()
+            self.textImg = TextCache.getInstance().render(self.font, self.text, self.isSmooth, self.color)
+        return self.textImg
 
     def setText(self, text: str) -> None:
+        if text == self.text: return
+
         self.text = text
+        self.textImg = None
+        self.invalidateLayout()
+        self.markDirty()
+
+    def restoreState(self, other: "Label") -> None:
+        if self.text == "": self.setText(other.text)
 
     def clearText(self) -> None:
-        self.text = ""
\ No newline at end of file
+        self.setText("")
\ No newline at end of file
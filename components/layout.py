@@ -0,0 +1,47 @@
+import typing
+
+from components.widget import Widget
+
+class LayoutEngine:
+    """
+    Places the design area of the scenes (the size their configs are written for) in the middle of the window.
+    Widgets keep their resolved positions until their text, size, config or the window changes, so a pass
+    over hundreds of widgets only lays out the ones that were invalidated
+    """
+    def __init__(self, designSize: tuple[int, int], windowSize: tuple[int, int] = None) -> None:
+        self.designSize = designSize
+        self.windowSize = designSize if windowSize is None else windowSize
+        self.origin = self._computeOrigin()
+
+        self.passes = 0
+        self.relayouts = 0
+
+    def setWindowSize(self, windowSize: tuple[int, int]) -> bool:
+        """
+        Return whether the origin moved, in which case every widget is laid out again on the next apply
+        """
+        self.windowSize = tuple(windowSize)
+        origin = self._computeOrigin()
+        if origin == self.origin: return False
+
+        self.origin = origin
+        return True
+
+    def getOrigin(self) -> tuple[int, int]:
+        return self.origin
+
+    def apply(self, widgets: typing.Iterable[Widget]) -> int:
+        """
+        Move the widgets to the current origin and lay out the invalid ones, return how many were laid out
+        """
+        count = 0
+        for widget in widgets:
+            widget.setOrigin(self.origin)
+            if widget.ensureLayout(): count += 1
+
+        self.passes += 1
+        self.relayouts += count
+        return count
+
+    def _computeOrigin(self) -> tuple[int, int]:
+        return (max(0, (self.windowSize[0] - self.designSize[0]) // 2), max(0, (self.windowSize[1] - self.designSize[1]) // 2))
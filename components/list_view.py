@@ -0,0 +1,186 @@
+import array
+import typing
+import pygame
+
+from components.label import Label
+from components.widget import Widget
+
+from utils.config import ConfigField, ConfigSchema, toColor, toInt, toPositiveInt
+from utils.enum_types import AlignType
+from utils.font_cache import FontCache
+
+class ListViewConfig:
+    __slots__ = ("posX", "posY", "width", "height", "rowHeight", "fontSize", "color", "textColor", "borderWidth", "padding")
+
+class ListView(Widget):
+    """
+    Scrollable list of (value, code) rows kept in two integer arrays and turned into text by a formatter.
+    Only the visible rows are drawn, by a pool of one Label per visible line that is given new text when
+    the list scrolls, so the cost of a frame does not grow with the number of rows. Row surfaces are
+    shared through the TextCache, scrolling back to rows seen recently renders nothing
+    """
+    DEFAULT_X = 0
+    DEFAULT_Y = 0
+    DEFAULT_WIDTH = 300
+    DEFAULT_HEIGHT = 200
+    DEFAULT_ROW_HEIGHT = 20
+    DEFAULT_FONT_SIZE = 24
+    DEFAULT_COLOR = (255, 255, 255)
+    DEFAULT_TEXT_COLOR = (255, 255, 255)
+    DEFAULT_BORDER_WIDTH = 1
+    DEFAULT_PADDING = 6
+
+    # Limits of the "q" array values are kept in
+    MIN_VALUE = -(1 << 63)
+    MAX_VALUE = (1 << 63) - 1
+
+    SCHEMA = ConfigSchema(ListViewConfig, [
+        ConfigField("posX", DEFAULT_X, toInt),
+        ConfigField("posY", DEFAULT_Y, toInt),
+        ConfigField("width", DEFAULT_WIDTH, toInt),
+        ConfigField("height", DEFAULT_HEIGHT, toInt),
+        ConfigField("rowHeight", DEFAULT_ROW_HEIGHT, toPositiveInt),
+        ConfigField("fontSize", DEFAULT_FONT_SIZE, toInt),
+        ConfigField("color", DEFAULT_COLOR, toColor),
+        ConfigField("textColor", DEFAULT_TEXT_COLOR, toColor),
+        ConfigField("borderWidth", DEFAULT_BORDER_WIDTH, toInt),
+        ConfigField("padding", DEFAULT_PADDING, toInt)
+    ])
+
+    def __init__(self, conf: dict | ListViewConfig = None, x: int = DEFAULT_X, y: int = DEFAULT_Y, width: int = DEFAULT_WIDTH,
+            height: int = DEFAULT_HEIGHT, rowHeight: int = DEFAULT_ROW_HEIGHT, fontSize: int = DEFAULT_FONT_SIZE,
+            color: tuple[int, int, int] = DEFAULT_COLOR, textColor: tuple[int, int, int] = DEFAULT_TEXT_COLOR,
+            borderWidth: int = DEFAULT_BORDER_WIDTH, padding: int = DEFAULT_PADDING,
+            formatter: typing.Callable[[int, int], str] = None) -> None:
+        super().__init__()
+
+        if conf is not None:
+            self._initWithConf(conf)
+        else:
+            self._initWithParams(x, y, width, height, rowHeight, fontSize, color, textColor, borderWidth, padding)
+
+        self.formatter: typing.Callable[[int, int], str] = (lambda value, code: str(value)) if formatter is None else formatter
+        self.values = array.array("q")
+        self.codes = array.array("b")
+        self.firstRow = 0
+        self.isFollowingEnd = True
+
+        self.rect: pygame.Rect = None
+        font = FontCache.getInstance().get(None, self.fontSize)
+        self.rows: typing.List[Label] = [Label(color=self.textColor, font=font, anchor=AlignType.MID_LEFT) for _ in range(self.getVisibleRows())]
+
+    def _initWithConf(self, conf: dict | ListViewConfig) -> None:
+        conf = ListView.SCHEMA.ensure(conf)
+
+        self.x = conf.posX
+        self.y = conf.posY
+        self.width = conf.width
+        self.height = conf.height
+        self.rowHeight = conf.rowHeight
+        self.fontSize = conf.fontSize
+        self.color = conf.color
+        self.textColor = conf.textColor
+        self.borderWidth = conf.borderWidth
+        self.padding = conf.padding
+
+    def _initWithParams(self, x: int, y: int, width: int, height: int, rowHeight: int, fontSize: int, color: tuple[int, int, int],
+            textColor: tuple[int, int, int], borderWidth: int, padding: int) -> None:
+        if rowHeight <= 0:
+            raise ValueError("ListView._initWithParams. rowHeight must be positive, got={}".format(rowHeight))
+
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.rowHeight = rowHeight
+        self.fontSize = fontSize
+        self.color = color
+        self.textColor = textColor
+        self.borderWidth = borderWidth
+        self.padding = padding
+
+    def setFormatter(self, formatter: typing.Callable[[int, int], str]) -> None:
+        self.formatter = formatter
+        self._refreshRows()
+
+    def getVisibleRows(self) -> int:
+        return max(0, (self.height - 2 * self.borderWidth) // self.rowHeight)
+
+    def getCount(self) -> int:
+        return len(self.values)
+
+    def getRow(self, index: int) -> tuple[int, int]:
+        return (self.values[index], self.codes[index])
+
+    def append(self, value: int, code: int) -> None:
+        """
+        Add a row at the end, a value past the 64 bit range is kept as the nearest limit
+        """
+        self.values.append(min(max(value, ListView.MIN_VALUE), ListView.MAX_VALUE))
+        self.codes.append(code)
+
+        if self.isFollowingEnd: self.firstRow = max(0, self.getCount() - len(self.rows))
+        if self.getCount() - 1 < self.firstRow + len(self.rows): self._refreshRows()
+
+    def clear(self) -> None:
+        del self.values[:]
+        del self.codes[:]
+        self.isFollowingEnd = True
+        self.firstRow = 0
+        self._refreshRows()
+
+    def scroll(self, rows: int) -> None:
+        self.scrollTo(self.firstRow + rows)
+
+    def scrollTo(self, firstRow: int) -> None:
+        """
+        Show rows from firstRow, clamped so the last page stays full. A list scrolled to its end follows new rows
+        """
+        lastFirstRow = max(0, self.getCount() - len(self.rows))
+        firstRow = min(max(0, firstRow), lastFirstRow)
+        self.isFollowingEnd = firstRow == lastFirstRow
+        if firstRow == self.firstRow: return
+
+        self.firstRow = firstRow
+        self._refreshRows()
+
+    def onMouseWheel(self, wheelY: int) -> None:
+        # Wheel up shows older rows
+        self.scroll(-wheelY)
+
+    def _refreshRows(self) -> None:
+        for index, label in enumerate(self.rows):
+            row = self.firstRow + index
+            label.setText(self.formatter(self.values[row], self.codes[row]) if row < self.getCount() else "")
+        self.markDirty()
+
+    def layout(self) -> None:
+        self.rect = pygame.Rect(self.x + self.origin[0], self.y + self.origin[1], self.width, self.height)
+        for index, label in enumerate(self.rows):
+            label.setPosition(self.rect.x + self.padding, self.rect.y + self.borderWidth + index * self.rowHeight + self.rowHeight // 2)
+
+    def draw(self, screen: pygame.surface.Surface) -> None:
+        self.drawDynamic(screen)
+        self.drawStatic(screen)
+
+    def drawStatic(self, surface: pygame.surface.Surface) -> None:
+        self.ensureLayout()
+        if self.borderWidth > 0: pygame.draw.rect(surface, self.color, self.rect, self.borderWidth)
+
+    def drawDynamic(self, screen: pygame.surface.Surface) -> None:
+        self.ensureLayout()
+        for label in self.rows:
+            if label.text != "": label.draw(screen)
+
+    def getRect(self) -> pygame.Rect:
+        self.ensureLayout()
+        return self.rect
+
+    def restoreState(self, other: "ListView") -> None:
+        self.values = other.values
+        self.codes = other.codes
+        self.formatter = other.formatter
+        self.firstRow = other.firstRow
+        # The page size may have changed with the config, clamp the old position to it
+        self.scrollTo(self.getCount() if other.isFollowingEnd else other.firstRow)
+        self._refreshRows()
@@ -0,0 +1,132 @@
+import importlib
+import queue
+import threading
+import time
+import typing
+import pygame
+
+from components.scene import Scene, SceneManager, SceneRegistry
+from utils.config import ConfigStore
+from utils.font_cache import FontCache
+from utils.logger import Logger
+from utils.text_cache import TextCache
+
+class PreloadJob:
+    QUEUED = "queued"
+    WARM = "warm"
+    READY = "ready"
+    FAILED = "failed"
+
+    def __init__(self, moduleName: str, className: str, args: tuple, onReady: typing.Callable[[Scene], None] = None) -> None:
+        self.moduleName = moduleName
+        self.className = className
+        self.args = args
+        self.onReady = onReady
+
+        self.state = PreloadJob.QUEUED
+        self.sceneClass: type = None
+        self.warmSeconds = 0.0
+        self.buildSeconds = 0.0
+
+class ScenePreloader:
+    """
+    Gets the scenes the player is likely to open next ready before they are pushed.
+    A background thread imports the scene module, compiles its config, opens the fonts and renders the texts of
+    its config into the TextCache. The scene itself is built on the main thread by poll, one per call while the
+    current scene is idle, and its static layer is composited so the push only runs onEnter and the dynamic widgets.
+    A scene pushed before it is ready is built the usual way by its getInstance, a scene the SceneRegistry
+    evicted since it was built can be requested again
+    """
+    _instance = None
+
+    logger = Logger(__name__).getInstance()
+
+    def __init__(self) -> None:
+        self.jobs: dict[tuple, PreloadJob] = {}
+        self.queue: queue.Queue = queue.Queue()
+        self.warmJobs: queue.Queue = queue.Queue()
+        self.thread: threading.Thread = None
+
+    def request(self, moduleName: str, className: str, *args: typing.Any, onReady: typing.Callable[[Scene], None] = None) -> None:
+        """
+        Preload className of moduleName, built with getInstance(*args). Asking again for a scene is free
+        """
+        key = (moduleName, className) + args
+        if key in self.jobs and self._isLoaded(self.jobs[key]): return
+
+        job = PreloadJob(moduleName, className, args, onReady)
+        self.jobs[key] = job
+        self.queue.put(job)
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="ScenePreloader", daemon=True)
+            self.thread.start()
+
+    def isReady(self, moduleName: str, className: str, *args: typing.Any) -> bool:
+        job = self.jobs.get((moduleName, className) + args)
+        return job is not None and job.state == PreloadJob.READY and self._isLoaded(job)
+
+    def _isLoaded(self, job: PreloadJob) -> bool:
+        """
+        Whether a job is still queued or warm, or built a scene the SceneRegistry still holds
+        """
+        return job.state != PreloadJob.READY or SceneRegistry.getInstance().has(job.sceneClass, *job.args)
+
+    def _run(self) -> None:
+        while True:
+            job = self.queue.get()
+            startTime = time.perf_counter()
+            try:
+                self._warm(job)
+                job.state = PreloadJob.WARM
+            except Exception:
+                ScenePreloader.logger.exception("ScenePreloader._run. failed to warm %s.%s", job.moduleName, job.className)
+                job.state = PreloadJob.FAILED
+            job.warmSeconds = time.perf_counter() - startTime
+            self.warmJobs.put(job)
+
+    def _warm(self, job: PreloadJob) -> None:
+        job.sceneClass = getattr(importlib.import_module(job.moduleName), job.className)
+        if job.sceneClass.CONFIG_FILE is None: return
+
+        conf = ConfigStore.getInstance().load(job.sceneClass.CONFIG_FILE, job.sceneClass.WIDGET_SCHEMAS)
+        font = FontCache.getInstance().getDefault()
+        for widgetConf in conf.values():
+            text = getattr(widgetConf, "text", "")
+            if text == "": continue
+
+            # Buttons draw their text in textColor, labels in color and optionally without antialiasing
+            color = getattr(widgetConf, "textColor", None) or widgetConf.color
+            TextCache.getInstance().render(font, text, getattr(widgetConf, "isSmooth", True), color)
+
+    def poll(self, screen: pygame.surface.Surface = None) -> Scene:
+        """
+        Build one warmed scene on the main thread, return it or None when nothing was ready to build
+        """
+        try:
+            job = self.warmJobs.get_nowait()
+        except queue.Empty:
+            return None
+        if job.state != PreloadJob.WARM: return None
+
+        startTime = time.perf_counter()
+        scene = job.sceneClass.getInstance(*job.args)
+        SceneManager.getInstance().applyLayout(scene)
+        if screen is not None and scene.staticLayer is None: scene.getStaticLayer(screen)
+        job.buildSeconds = time.perf_counter() - startTime
+        job.state = PreloadJob.READY
+
+        ScenePreloader.logger.debug("ScenePreloader.poll. ready scene=%s warmMs=%.2f buildMs=%.2f", job.className,
+            job.warmSeconds * 1000, job.buildSeconds * 1000)
+        if job.onReady is not None: job.onReady(scene)
+        return scene
+
+    def getStats(self) -> dict:
+        states = [job.state for job in self.jobs.values()]
+        return {state: states.count(state) for state in (PreloadJob.QUEUED, PreloadJob.WARM, PreloadJob.READY, PreloadJob.FAILED)}
+
+    @staticmethod
+    def getInstance() -> "ScenePreloader":
+        if ScenePreloader._instance is None:
+            ScenePreloader._instance = ScenePreloader()
+        return ScenePreloader._instance
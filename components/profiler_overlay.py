@@ -0,0 +1,52 @@
+import typing
+import pygame
+
+from components.label import Label
+from components.widget import Widget
+
+from utils.enum_types import AlignType
+from utils.font_cache import FontCache
+from utils.profiler import FrameProfiler
+
+class ProfilerOverlay(Widget):
+    """
+    Live frame stats drawn over the current scene. The text is refreshed every few frames to keep its own cost low
+    """
+    TOGGLE_KEY = pygame.K_F3
+    DEFAULT_X = 4
+    DEFAULT_Y = 4
+    DEFAULT_COLOR = (255, 255, 0)
+    DEFAULT_FONT_SIZE = 18
+    DEFAULT_LINE_HEIGHT = 16
+    DEFAULT_REFRESH_FRAMES = 30
+
+    PHASES = [FrameProfiler.INPUT, FrameProfiler.UPDATE, FrameProfiler.DRAW]
+
+    def __init__(self, profiler: FrameProfiler, x: int = DEFAULT_X, y: int = DEFAULT_Y, color: tuple[int, int, int] = DEFAULT_COLOR,
+            refreshFrames: int = DEFAULT_REFRESH_FRAMES) -> None:
+        super().__init__()
+
+        self.profiler = profiler
+        self.x = x
+        self.y = y
+        self.refreshFrames = refreshFrames
+        self.lastRefreshFrame = -refreshFrames
+
+        font = FontCache.getInstance().get(None, ProfilerOverlay.DEFAULT_FONT_SIZE)
+        self.lines: typing.List[Label] = [Label(color=color, font=font, x=x, y=y + i * ProfilerOverlay.DEFAULT_LINE_HEIGHT,
+            anchor=AlignType.TOP_LEFT) for i in range(len(ProfilerOverlay.PHASES) + 1)]
+
+    def refresh(self, sceneName: str) -> None:
+        if self.profiler.frames - self.lastRefreshFrame < self.refreshFrames: return
+        self.lastRefreshFrame = self.profiler.frames
+
+        self.lines[0].setText("{} overruns={}".format(self.profiler.getSummary(), self.profiler.overruns))
+        for label, phase in zip(self.lines[1:], ProfilerOverlay.PHASES):
+            label.setText(self.profiler.getSummary(sceneName, phase))
+
+    def draw(self, screen: pygame.surface.Surface) -> None:
+        for label in self.lines:
+            label.draw(screen)
+
+    def getRect(self) -> pygame.Rect:
+        return self.lines[0].getRect().unionall([label.getRect() for label in self.lines[1:]])
@@ -1,58 +1,605 @@
+import collections
+import time
 import typing
 import pygame
 
+from components.hit_index import HitIndex
+from components.layout import LayoutEngine
+from components.profiler_overlay import ProfilerOverlay
+from components.widget import Widget
+
+from utils.config import ConfigSchema, ConfigStore
+from utils.logger import Logger
+from utils.profiler import FrameProfiler
+import utils.constants as constants
+
 class Scene:
+    CONFIG_FILE: str = None
+    WIDGET_SCHEMAS: dict[str, ConfigSchema] = {}
+    STATIC_WIDGETS: typing.List[str] = []
+    # Event types given to input, the SceneManager handles quitting, resizing and left clicks itself
+    EVENT_TYPES: typing.List[int] = []
+
     def __init__(self) -> None:
-        pass
+        self.needsFullRedraw: bool = True
+        self.hitIndex: HitIndex = None
+        self.staticLayer: pygame.surface.Surface = None
+        # Fraction of an update step between the last update and this draw, for scenes drawing motion in between
+        self.alpha: float = 1.0
     def input(self, event: pygame.event.Event) -> None:
         pass
     def update(self) -> None:
-        pass
+        for widget in self.getWidgets():
+            widget.update()
     def draw(self, screen: pygame.surface.Surface) -> None:
-        pass
+        if not constants.STATIC_LAYER_RENDERING:
+            screen.fill(constants.BACKGROUND_COLOR)
+            for widget in self.getWidgets():
+                widget.draw(screen)
+            return
+
+        screen.blit(self.getStaticLayer(screen), (0, 0))
+        for widget in self.getDynamicWidgets():
+            widget.drawDynamic(screen)
     def onEnter(self) -> None:
         pass
     def onExit(self) -> None:
         pass
+    def getWidgets(self) -> typing.List[Widget]:
+        return []
+
+    def buildWidgets(self) -> None:
+        pass
+
+    def init(self) -> None:
+        pass
+
+    def release(self) -> None:
+        """
+        Drop what this scene holds outside of itself once the SceneRegistry evicted it, so it can be collected
+        """
+        if self.CONFIG_FILE is not None: ConfigStore.getInstance().unwatch(self.CONFIG_FILE, self.onConfigReload)
+        self.hitIndex = None
+        self.staticLayer = None
+
+    def onConfigReload(self) -> None:
+        """
+        Rebuild the widgets of this scene from its reloaded config, keeping their runtime state
+        """
+        oldWidgets = {name: getattr(self, name) for name in self.WIDGET_SCHEMAS}
+
+        self.buildWidgets()
+        for name, widget in oldWidgets.items():
+            getattr(self, name).restoreState(widget)
+        self.init()
+
+        # A covered scene is laid out when it is entered again, the pointer belongs to the top scene
+        sceneMgr = SceneManager.getInstance()
+        if sceneMgr.getTop() is self:
+            sceneMgr.retargetPointer({widget: getattr(self, name) for name, widget in oldWidgets.items()})
+            sceneMgr.instrument(self)
+            sceneMgr.applyLayout(self)
+        self.invalidateHitIndex()
+        self.invalidateStaticLayer()
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self.needsFullRedraw = True
+
+    def isAnimating(self) -> bool:
+        return False
+
+    def hasPendingWork(self) -> bool:
+        if self.needsFullRedraw or self.isAnimating(): return True
+
+        for widget in self.getWidgets():
+            if widget.isDirty(): return True
+        return False
+
+    def getHitIndex(self) -> HitIndex:
+        if self.hitIndex is None:
+            self.hitIndex = HitIndex()
+            for widget in self.getWidgets():
+                if widget.isInteractive(): self.hitIndex.insert(widget, widget.getHitRect())
+        return self.hitIndex
+
+    def invalidateHitIndex(self) -> None:
+        self.hitIndex = None
+
+    def getStaticWidgets(self) -> typing.List[Widget]:
+        return [getattr(self, name) for name in self.STATIC_WIDGETS]
+
+    def getDynamicWidgets(self) -> typing.List[Widget]:
+        staticWidgets = self.getStaticWidgets()
+        return [widget for widget in self.getWidgets() if widget not in staticWidgets]
+
+    def getStaticLayer(self, screen: pygame.surface.Surface) -> pygame.surface.Surface:
+        """
+        Background, static widgets and the static parts of the other widgets composited once. Dynamic widgets
+        are always drawn over it, whatever their position in getWidgets
+        """
+        if self.isStaticLayerStale(screen):
+            self.staticLayer = pygame.Surface(screen.get_size(), 0, screen)
+            self.staticLayer.fill(constants.BACKGROUND_COLOR)
+
+            staticWidgets = self.getStaticWidgets()
+            for widget in self.getWidgets():
+                if widget in staticWidgets:
+                    widget.draw(self.staticLayer)
+                    widget.markClean()
+                else:
+                    widget.drawStatic(self.staticLayer)
+        return self.staticLayer
+
+    def isStaticLayerStale(self, screen: pygame.surface.Surface) -> bool:
+        if self.staticLayer is None or self.staticLayer.get_size() != screen.get_size(): return True
+
+        for widget in self.getStaticWidgets():
+            if widget.isDirty(): return True
+        return False
+
+    def invalidateStaticLayer(self) -> None:
+        self.staticLayer = None
+
+    def drawFull(self, screen: pygame.surface.Surface) -> typing.List[pygame.Rect]:
+        self.needsFullRedraw = False
+        self.draw(screen)
+        for widget in self.getWidgets(): widget.markClean()
+        return [screen.get_rect()]
+
+    def drawDirty(self, screen: pygame.surface.Surface) -> typing.List[pygame.Rect]:
+        isLayered = constants.STATIC_LAYER_RENDERING
+        if self.needsFullRedraw or (isLayered and self.isStaticLayerStale(screen)):
+            return self.drawFull(screen)
+
+        widgets = self.getDynamicWidgets() if isLayered else self.getWidgets()
+
+        dirtyWidgets = [widget for widget in widgets if widget.isDirty()]
+        if len(dirtyWidgets) == 0: return []
+
+        dirtyRects: typing.List[pygame.Rect] = []
+        for widget in dirtyWidgets:
+            dirtyRects.extend(widget.getDirtyRects())
+
+        for rect in dirtyRects:
+            screen.set_clip(rect)
+            if isLayered:
+                screen.blit(self.staticLayer, rect, rect)
+            else:
+                screen.fill(constants.BACKGROUND_COLOR)
+            for widget in widgets:
+                if not widget.getRect().colliderect(rect): continue
+
+                if isLayered:
+                    widget.drawDynamic(screen)
+                else:
+                    widget.draw(screen)
+        screen.set_clip(None)
+
+        for widget in dirtyWidgets: widget.markClean()
+
+        return dirtyRects
 
 class SceneManager:
+    """
+    Stack of scenes where only the top one runs. A scene is exited when another one covers or removes it
+    and entered again when it is back on top, the outgoing scene always exits before the incoming one enters
+    """
+    DEFAULT_MAX_DEPTH = constants.SCENE_STACK_MAX_DEPTH
+    DEFAULT_MAX_EVENTS = constants.MAX_EVENTS_PER_FRAME
+    BASE_EVENT_TYPES = [pygame.QUIT, pygame.VIDEORESIZE, pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED, pygame.MOUSEBUTTONDOWN,
+        pygame.MOUSEBUTTONUP]
+    # Only these are ever kept out of the queue, text input, expose and lifecycle events always get through
+    FLOOD_EVENT_TYPES = [pygame.MOUSEMOTION, pygame.ACTIVEEVENT, pygame.WINDOWENTER, pygame.WINDOWLEAVE, pygame.WINDOWFOCUSGAINED,
+        pygame.WINDOWFOCUSLOST, pygame.WINDOWTAKEFOCUS, pygame.WINDOWMOVED]
+
     _instance = None
 
-    def __init__(self) -> None:
+    logger = Logger(__name__).getInstance()
+
+    def __init__(self, maxDepth: int = DEFAULT_MAX_DEPTH, maxEvents: int = DEFAULT_MAX_EVENTS) -> None:
         SceneManager._instance = self
 
         self.scenes: typing.List[Scene] = []
+        self.maxDepth = maxDepth
+
+        self.maxEvents = maxEvents
+        self.isFilteringEvents: bool = False
+        self.eventTypes: set[int] = set(SceneManager.BASE_EVENT_TYPES)
+        self.pendingEvents: typing.List[pygame.event.Event] = []
+        self.frameEventCounts: dict[str, int] = {}
+        self.eventStats: dict[str, int] = {"frames": 0, "received": 0, "dispatched": 0, "coalesced": 0, "filtered": 0,
+            "deferred": 0, "maxFrameEvents": 0}
+        self.isRetained: bool = False
+
+        self.pressedWidget: Widget = None
+        self.focusedWidget: Widget = None
+        self.isFrameRequested: bool = False
+
+        self.profiler: FrameProfiler = None
+        self.overlay: ProfilerOverlay = None
+
+        self.layoutEngine: LayoutEngine = LayoutEngine((constants.WIDTH, constants.HEIGHT))
 
     def isEmpty(self) -> bool:
         return len(self.scenes) == 0
 
+    def requestFrame(self) -> None:
+        """
+        Ask the main loop for one more frame at full rate even if nothing is dirty
+        """
+        self.isFrameRequested = True
+
+    def hasPendingWork(self) -> bool:
+        if self.isFrameRequested or len(self.pendingEvents) > 0: return True
+        if self.profiler is not None and self.profiler.isOverlayVisible: return True
+        if len(self.scenes) <= 0: return False
+
+        return self.scenes[-1].hasPendingWork()
+
+    def setRetainedMode(self, isRetained: bool) -> None:
+        self.isRetained = isRetained
+        if len(self.scenes) > 0: self.scenes[-1].invalidate()
+
+    def setProfiler(self, profiler: FrameProfiler) -> None:
+        """
+        Time input, update and draw of the top scene and its widgets, None turns the hooks off
+        """
+        self.profiler = profiler
+        self.overlay = ProfilerOverlay(profiler) if profiler is not None else None
+        self._updateEventTypes()
+        if len(self.scenes) > 0: self.instrument(self.scenes[-1])
+
+    def instrument(self, scene: Scene) -> None:
+        """
+        Time the widgets of a scene shown or rebuilt while the profiler is on
+        """
+        if self.profiler is None: return
+        self.profiler.instrument(type(scene).__name__, {name: getattr(scene, name) for name in scene.WIDGET_SCHEMAS if hasattr(scene, name)})
+
+    def toggleOverlay(self) -> None:
+        if self.profiler is None: return
+
+        self.profiler.isOverlayVisible = not self.profiler.isOverlayVisible
+        if len(self.scenes) > 0: self.scenes[-1].invalidate()
+
+    def setEventFiltering(self, isFiltering: bool) -> None:
+        """
+        Keep the floods of motion and focus events nobody handles out of the pygame queue, they then neither fill it
+        nor wake an idle loop
+        """
+        self.isFilteringEvents = isFiltering
+        self._updateEventTypes()
+        self._applyEventFilter()
+
+    def _updateEventTypes(self) -> None:
+        eventTypes = set(SceneManager.BASE_EVENT_TYPES)
+        if len(self.scenes) > 0: eventTypes.update(self.scenes[-1].EVENT_TYPES)
+        if self.profiler is not None: eventTypes.add(pygame.KEYDOWN)
+        if eventTypes == self.eventTypes: return
+
+        self.eventTypes = eventTypes
+        if self.isFilteringEvents: self._applyEventFilter()
+
+    def _applyEventFilter(self) -> None:
+        if not self.isFilteringEvents:
+            pygame.event.set_allowed(None)
+            return
+
+        pygame.event.set_allowed(None)
+        pygame.event.set_blocked([eventType for eventType in SceneManager.FLOOD_EVENT_TYPES if eventType not in self.eventTypes])
+
+    def inputBatch(self, events: typing.List[pygame.event.Event]) -> None:
+        """
+        Dispatch the events of a frame. Runs of mouse motion are merged into their latest event, events no one
+        handles are dropped, and past maxEvents the rest waits for the next frames in order
+        """
+        stats = self.eventStats
+        stats["frames"] += 1
+        stats["received"] += len(events)
+        self.frameEventCounts = {}
+        for event in events:
+            name = pygame.event.event_name(event.type)
+            self.frameEventCounts[name] = self.frameEventCounts.get(name, 0) + 1
+        stats["maxFrameEvents"] = max(stats["maxFrameEvents"], len(events))
+
+        batch = self.pendingEvents + self._coalesceMotion(events)
+        self.pendingEvents = batch[self.maxEvents:]
+        if len(self.pendingEvents) > 0:
+            stats["deferred"] += len(self.pendingEvents)
+            SceneManager.logger.debug("SceneManager.inputBatch. deferred=%s counts=%s", len(self.pendingEvents), self.frameEventCounts)
+
+        for event in batch[:self.maxEvents]:
+            # The top scene may change in the middle of the batch, filter with the types of the scene getting the event
+            if event.type not in self.eventTypes:
+                stats["filtered"] += 1
+                continue
+            stats["dispatched"] += 1
+            self.input(event)
+
+    def _coalesceMotion(self, events: typing.List[pygame.event.Event]) -> typing.List[pygame.event.Event]:
+        coalesced: typing.List[pygame.event.Event] = []
+        for event in events:
+            if event.type == pygame.MOUSEMOTION and len(coalesced) > 0 and coalesced[-1].type == pygame.MOUSEMOTION:
+                previous = coalesced[-1]
+                attributes = dict(event.dict)
+                if "rel" in previous.dict and "rel" in attributes:
+                    attributes["rel"] = (previous.rel[0] + event.rel[0], previous.rel[1] + event.rel[1])
+                coalesced[-1] = pygame.event.Event(pygame.MOUSEMOTION, attributes)
+                self.eventStats["coalesced"] += 1
+                continue
+            coalesced.append(event)
+        return coalesced
+
+    def getFrameEventCounts(self) -> dict[str, int]:
+        """
+        Events received in the last frame by type name
+        """
+        return self.frameEventCounts
+
+    def formatEventStats(self) -> str:
+        return " ".join("{}={}".format(key, value) for key, value in self.eventStats.items())
+
     def input(self, event: pygame.event.Event) -> None:
+        if self.profiler is None:
+            self._dispatch(event)
+            return
+
+        if event.type == pygame.KEYDOWN and event.key == ProfilerOverlay.TOGGLE_KEY:
+            self.toggleOverlay()
+            return
+
+        sceneName = self._getSceneName()
+        startTime = time.perf_counter()
+        self._dispatch(event)
+        self.profiler.addWork(sceneName, FrameProfiler.INPUT, time.perf_counter() - startTime)
+
+    def _dispatch(self, event: pygame.event.Event) -> None:
+        if event.type == pygame.VIDEORESIZE:
+            self.onResize(event.size)
+
+        if len(self.scenes) <= 0: return
+
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            # The uncovered window lost its pixels, an idle adaptive loop would otherwise not draw them again
+            self.scenes[-1].invalidate()
+            self.requestFrame()
+            return
+
+        if event.type == pygame.MOUSEBUTTONDOWN and event.button == pygame.BUTTON_LEFT:
+            self._onMouseDown(event.pos)
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == pygame.BUTTON_LEFT:
+            self._onMouseUp(event.pos)
+
         if len(self.scenes) <= 0: return
 
         self.scenes[-1].input(event)
+
+    def _onMouseDown(self, pos: tuple[int, int]) -> None:
+        hits = self.scenes[-1].getHitIndex().query(pos)
+        target = hits[-1] if len(hits) > 0 else None
+
+        focusTarget = target if target is not None and target.isFocusable() else None
+        if focusTarget is not self.focusedWidget:
+            if self.focusedWidget is not None: self.focusedWidget.setFocus(False)
+            self.focusedWidget = focusTarget
+            if self.focusedWidget is not None: self.focusedWidget.setFocus(True)
+
+        self.pressedWidget = target
+        if target is not None: target.onMouseDown(pos)
+
+    def _onMouseUp(self, pos: tuple[int, int]) -> None:
+        pressedWidget = self.pressedWidget
+        self.pressedWidget = None
+        if pressedWidget is not None: pressedWidget.onMouseUp(pos)
+
+    def onResize(self, windowSize: tuple[int, int]) -> None:
+        self.layoutEngine.setWindowSize(windowSize)
+        if len(self.scenes) <= 0: return
+
+        self.applyLayout(self.scenes[-1])
+        self.scenes[-1].invalidate()
+
+    def applyLayout(self, scene: Scene) -> None:
+        """
+        Bring the widgets of a scene to the current window origin before it is shown
+        """
+        if self.layoutEngine.apply(scene.getWidgets()) > 0: scene.invalidateHitIndex()
+
+    def getTop(self) -> Scene:
+        return self.scenes[-1] if len(self.scenes) > 0 else None
+
+    def retargetPointer(self, replacements: dict[Widget, Widget]) -> None:
+        """
+        Move the focus to the widgets rebuilt in place of the old ones, a press in progress is dropped
+        """
+        self.pressedWidget = None
+        self.focusedWidget = replacements.get(self.focusedWidget, self.focusedWidget)
+
+    def resetPointer(self) -> None:
+        if self.focusedWidget is not None: self.focusedWidget.setFocus(False)
+        self.focusedWidget = None
+        self.pressedWidget = None
         
     def update(self) -> None:
         if len(self.scenes) <= 0: return
 
-        self.scenes[-1].update()
+        if self.profiler is None:
+            self.scenes[-1].update()
+            return
 
-    def draw(self, screen: pygame.surface.Surface) -> None:
-        if len(self.scenes) <= 0: return
+        scene = self.scenes[-1]
+        sceneName = self._getSceneName()
+        startTime = time.perf_counter()
+        scene.update()
+        self.profiler.addWork(sceneName, FrameProfiler.UPDATE, time.perf_counter() - startTime)
+
+    def draw(self, screen: pygame.surface.Surface, alpha: float = 1.0) -> typing.List[pygame.Rect]:
+        """
+        Return the areas of the screen changed by this frame. alpha is how far the frame is past the last update
+        """
+        self.isFrameRequested = False
+        if len(self.scenes) <= 0: return []
+
+        self.scenes[-1].alpha = alpha
+
+        if self.profiler is None:
+            return self._drawScene(screen)
+
+        sceneName = self._getSceneName()
+        startTime = time.perf_counter()
+        dirtyRects = self._drawScene(screen)
+        self.profiler.addWork(sceneName, FrameProfiler.DRAW, time.perf_counter() - startTime)
+
+        if not self.profiler.isOverlayVisible: return dirtyRects
+
+        startTime = time.perf_counter()
+        self.overlay.refresh(sceneName)
+        self.overlay.draw(screen)
+        self.profiler.addWork(ProfilerOverlay.__name__, FrameProfiler.DRAW, time.perf_counter() - startTime)
+
+        self.scenes[-1].invalidate()
+        return [screen.get_rect()]
+
+    def _drawScene(self, screen: pygame.surface.Surface) -> typing.List[pygame.Rect]:
+        if self.isRetained:
+            return self.scenes[-1].drawDirty(screen)
 
-        self.scenes[-1].draw(screen)
+        return self.scenes[-1].drawFull(screen)
+
+    def _getSceneName(self) -> str:
+        return type(self.scenes[-1]).__name__ if len(self.scenes) > 0 else ""
+
+    def isActive(self, scene: Scene) -> bool:
+        return scene in self.scenes
 
     def push(self, scene: Scene) -> None:
-        if len(self.scenes) > 0: self.scenes[-1].onExit()
+        self._exitTop()
+        self.scenes.append(scene)
+
+        if len(self.scenes) > self.maxDepth:
+            # The covered scenes have already exited, the oldest ones are just forgotten
+            SceneManager.logger.warning("SceneManager.push. depth=%s over maxDepth=%s, dropping scenes=%s", len(self.scenes), self.maxDepth,
+                [type(item).__name__ for item in self.scenes[:-self.maxDepth]])
+            del self.scenes[:-self.maxDepth]
+
+        self._enterTop()
+
+    def pop(self) -> Scene:
+        """
+        Remove the top scene and enter the one under it, return the removed scene
+        """
+        if len(self.scenes) <= 0: return None
+
+        self._exitTop()
+        scene = self.scenes.pop()
+        if len(self.scenes) > 0: self._enterTop()
+        return scene
 
+    def replace(self, scene: Scene) -> Scene:
+        """
+        Put scene in place of the top scene, return the replaced scene
+        """
+        self._exitTop()
+        replaced = self.scenes.pop() if len(self.scenes) > 0 else None
         self.scenes.append(scene)
-        
-        scene.onEnter()
+        self._enterTop()
+        return replaced
+
+    def popTo(self, scene: Scene) -> None:
+        """
+        Remove the scenes above scene and enter it again. A scene not on the stack becomes its only scene
+        """
+        if scene not in self.scenes:
+            self.clear()
+            self.push(scene)
+            return
+        if self.scenes[-1] is scene: return
+
+        self._exitTop()
+        del self.scenes[self.scenes.index(scene) + 1:]
+        self._enterTop()
 
     def clear(self) -> None:
+        self._exitTop()
         self.scenes = []
+        self._updateEventTypes()
+
+    def _exitTop(self) -> None:
+        if len(self.scenes) > 0: self.scenes[-1].onExit()
+        self.resetPointer()
+
+    def _enterTop(self) -> None:
+        self._updateEventTypes()
+        scene = self.scenes[-1]
+        self.instrument(scene)
+        self.applyLayout(scene)
+        scene.invalidate()
+        scene.onEnter()
 
     @staticmethod
     def getInstance():
         if SceneManager._instance is None:
             SceneManager()
         return SceneManager._instance
+
+
+class SceneRegistry:
+    """
+    Builds scenes on demand and keeps at most capacity of them, a scene and its arguments are built once
+    until evicted. The least recently used scenes that are not on the SceneManager stack are evicted first,
+    scenes on the stack are never evicted, and an evicted scene is built again the next time it is asked for
+    """
+    DEFAULT_CAPACITY = constants.SCENE_CACHE_SIZE
+
+    _instance = None
+
+    logger = Logger(__name__).getInstance()
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        self.capacity = capacity
+        self.scenes: collections.OrderedDict[tuple, Scene] = collections.OrderedDict()
+        self.builds = 0
+        self.evictions = 0
+
+    def get(self, sceneClass: type, *args: typing.Any) -> Scene:
+        key = (sceneClass,) + args
+        scene = self.scenes.get(key)
+        if scene is not None:
+            self.scenes.move_to_end(key)
+            return scene
+
+        scene = sceneClass(*args)
+        self.scenes[key] = scene
+        self.builds += 1
+        self._evict(key)
+        return scene
+
+    def has(self, sceneClass: type, *args: typing.Any) -> bool:
+        return ((sceneClass,) + args) in self.scenes
+
+    def _evict(self, keptKey: tuple) -> None:
+        """
+        Drop the oldest scenes over capacity, keptKey is the scene being handed out, about to be pushed
+        """
+        sceneMgr = SceneManager.getInstance()
+        for key in list(self.scenes):
+            if len(self.scenes) <= self.capacity: return
+            if key == keptKey or sceneMgr.isActive(self.scenes[key]): continue
+
+            SceneRegistry.logger.debug("SceneRegistry._evict. scene=%s", key[0].__name__)
+            self.scenes.pop(key).release()
+            self.evictions += 1
+
+    def getStats(self) -> dict:
+        return {
+            "scenes": len(self.scenes),
+            "builds": self.builds,
+            "evictions": self.evictions
+        }
+
+    @staticmethod
+    def getInstance() -> "SceneRegistry":
+        if SceneRegistry._instance is None:
+            SceneRegistry._instance = SceneRegistry()
+        return SceneRegistry._instance
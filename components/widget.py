@@ -0,0 +1,110 @@
+import pygame
+
+
+class Widget:
+    def __init__(self) -> None:
+        self.dirty: bool = True
+        self.drawnRect: pygame.Rect = None
+
+        self.origin: tuple[int, int] = (0, 0)
+        self.isLayoutValid: bool = False
+
+    def update(self) -> None:
+        pass
+
+    def draw(self, screen: pygame.surface.Surface) -> None:
+        pass
+
+    def drawStatic(self, surface: pygame.surface.Surface) -> None:
+        """
+        Part of the widget that never changes, drawn once into the static layer of its scene
+        """
+        pass
+
+    def drawDynamic(self, screen: pygame.surface.Surface) -> None:
+        self.draw(screen)
+
+    def getRect(self) -> pygame.Rect:
+        return pygame.Rect(0, 0, 0, 0)
+
+    def getHitRect(self) -> pygame.Rect:
+        """
+        Area taking clicks, kept in the hit index of the scene so it must not change between layouts
+        """
+        return self.getRect()
+
+    def layout(self) -> None:
+        """
+        Resolve the screen position of the widget from its config position, anchor and size
+        """
+        pass
+
+    def ensureLayout(self) -> bool:
+        """
+        Run layout if something it depends on changed, return whether it ran
+        """
+        if self.isLayoutValid: return False
+
+        self.layout()
+        self.isLayoutValid = True
+        return True
+
+    def invalidateLayout(self) -> None:
+        self.isLayoutValid = False
+
+    def setOrigin(self, origin: tuple[int, int]) -> None:
+        """
+        Offset of the scene design area inside the window, added to the configured position
+        """
+        if origin == self.origin: return
+
+        self.origin = origin
+        self.invalidateLayout()
+        self.markDirty()
+
+    def setPosition(self, x: int, y: int) -> None:
+        if (x, y) == (self.x, self.y): return
+
+        self.x = x
+        self.y = y
+        self.invalidateLayout()
+        self.markDirty()
+
+    def isInteractive(self) -> bool:
+        return False
+
+    def isFocusable(self) -> bool:
+        return False
+
+    def onMouseDown(self, pos: tuple[int, int]) -> None:
+        pass
+
+    def onMouseUp(self, pos: tuple[int, int]) -> None:
+        pass
+
+    def setFocus(self, isFocused: bool) -> None:
+        pass
+
+    def restoreState(self, other: "Widget") -> None:
+        """
+        Take over the runtime state of the widget this one replaces after a config reload
+        """
+        pass
+
+    def isDirty(self) -> bool:
+        return self.dirty
+
+    def markDirty(self) -> None:
+        self.dirty = True
+
+    def markClean(self) -> None:
+        self.dirty = False
+        self.drawnRect = self.getRect()
+
+    def getDirtyRects(self) -> list[pygame.Rect]:
+        """
+        Area covered by the last drawn frame of the widget plus the area it will cover next
+        """
+        if self.drawnRect is None or self.drawnRect == self.getRect():
+            return [self.getRect()]
+        return [self.drawnRect, self.getRect()]
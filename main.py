@@ -1,39 +1,193 @@
+import time
+STARTUP_TIME = time.perf_counter()
+
+import argparse
+import os
+import random
+import sys
 import pygame
 
 import utils.constants as constants
 import components.scene as scene
 
+from components.preloader import ScenePreloader
+from modules.game.logic import GameBotLogic, GameUserLogic
+from modules.game.random_stream import Stream, streamKey
+from modules.game.results_store import ResultsStore
 from modules.lobby.scenes import StartScene
+from utils.capture import FrameCapture, createWriter
+from utils.config import ConfigStore
+from utils.frame_pacer import FixedStepPacer, FramePacer
+from utils.logger import Logger, LogPipeline, configure as configureLogging, setLevel as setLogLevel
+from utils.profiler import FrameProfiler
+from utils.replay import InputRecorder, InputReplayer
+from utils.startup_timer import StartupTimer
+
+LOGGER = Logger(__name__).getInstance()
+
+def init(timer: StartupTimer) -> tuple[pygame.surface.Surface, ConfigStore, scene.SceneManager, LogPipeline]:
+    """
+    Set up logging and only the pygame subsystems the game uses, once, then load the config and the first scene
+    """
+    logPipeline = configureLogging(constants.LOG_LEVEL, constants.LOG_QUEUE_SIZE, constants.LOG_JSON_PATH,
+        constants.LOG_SAMPLING, constants.LOG_RATE_LIMITS) if constants.LOG_ASYNC else None
+    if logPipeline is None: setLogLevel(constants.LOG_LEVEL)
+
+    if not pygame.display.get_init(): pygame.display.init()
+    if not pygame.font.get_init(): pygame.font.init()
+
+    window = pygame.display.set_mode((constants.WIDTH, constants.HEIGHT), pygame.RESIZABLE if constants.RESIZABLE_WINDOW else 0)
+    pygame.display.set_caption(constants.GAME)
+    timer.mark("init")
+
+    configStore = ConfigStore.configure(constants.CONFIG_CACHE_DIR, constants.CONFIG_POLL_INTERVAL_MS)
+    configStore.preload(constants.CONFIG_ROOT)
+    timer.mark("config")
+
+    sceneManager = scene.SceneManager.getInstance()
+    sceneManager.setRetainedMode(constants.DIRTY_RECT_RENDERING)
+    sceneManager.setEventFiltering(constants.EVENT_FILTERING)
+    if constants.PROFILER_ENABLED:
+        sceneManager.setProfiler(FrameProfiler(1000 / constants.FPS, constants.PROFILER_WINDOW_SIZE))
+    sceneManager.push(StartScene.getInstance())
+    timer.mark("scene")
 
-pygame.init()
-WINDOW = pygame.display.set_mode((constants.WIDTH, constants.HEIGHT))
-pygame.display.set_caption(constants.GAME)
+    return window, configStore, sceneManager, logPipeline
 
-SCENE_MANAGER = scene.SceneManager.getInstance()
-SCENE_MANAGER.push(StartScene.getInstance())
+def parseArgs() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=constants.GAME)
+    parser.add_argument("--seed", type=int, default=None, help="seed of the bot and guesser random numbers")
+    parser.add_argument("--record", metavar="PATH", help="record the input events of this session")
+    parser.add_argument("--replay", metavar="PATH", help="replay a recorded session headless as fast as possible")
+    parser.add_argument("--capture", metavar="PATH", help="capture the drawn frames to a .y4m or .raw video or a PNG directory")
+    return parser.parse_args()
+
+def seedLogic(seed: int) -> None:
+    GameBotLogic.getInstance().setRandom(random.Random(streamKey(seed, Stream.HOST)))
+    GameUserLogic.getInstance().setRandom(random.Random(streamKey(seed, Stream.GUESSER)))
+
+def getSessionState(sceneManager: scene.SceneManager) -> dict:
+    return {
+        "scenes": [type(item).__name__ for item in sceneManager.scenes],
+        "bot": GameBotLogic.getInstance().getSnapshot(),
+        "user": GameUserLogic.getInstance().getSnapshot()
+    }
 
 def main():
+    startupTimer = StartupTimer(constants.STARTUP_BUDGET_MS, STARTUP_TIME)
+    startupTimer.mark("import")
+
+    args = parseArgs()
+    replayer = InputReplayer(args.replay) if args.replay is not None else None
+    if replayer is not None: os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+    window, configStore, sceneManager, logPipeline = init(startupTimer)
+
+    if replayer is not None:
+        seed = replayer.seed
+    else:
+        seed = args.seed if args.seed is not None else random.randrange(1 << 32)
+    seedLogic(seed)
+    recorder = InputRecorder(args.record, seed) if args.record is not None else None
+    # Replayed games were already recorded when they were played
+    resultsStore = ResultsStore.configure(constants.RESULTS_STORE_PATH) if constants.RESULTS_STORE_ENABLED and replayer is None else None
+    LOGGER.info("main. seed=%s", seed)
+
+    # A replay waits for the writer so the capture has every frame, a live session drops frames instead
+    capture = FrameCapture(createWriter(args.capture), constants.FPS, constants.CAPTURE_POOL_SIZE,
+        replayer is not None) if args.capture is not None else None
+
     running: bool = True
-    clock: pygame.time.Clock = pygame.time.Clock()
+    if constants.FIXED_TIMESTEP:
+        pacer = FixedStepPacer(constants.UPDATE_RATE, constants.FPS, constants.IDLE_WAIT_TIMEOUT_MS, constants.ADAPTIVE_FRAME_PACING,
+            constants.MAX_CATCH_UP_STEPS)
+    else:
+        pacer = FramePacer(constants.FPS, constants.IDLE_WAIT_TIMEOUT_MS, constants.ADAPTIVE_FRAME_PACING)
+    frame = 0
+    replayStartTime = time.perf_counter()
 
     while running:
-        clock.tick(constants.FPS)
+        if replayer is None:
+            events = pacer.nextFrame(sceneManager.hasPendingWork())
+        else:
+            if replayer.isFinished(frame): break
+            pygame.event.pump()
+            events = replayer.getEvents(frame)
 
-        running = not SCENE_MANAGER.isEmpty()
+        if recorder is not None: recorder.recordFrame(frame, events)
+        frame += 1
 
-        for event in pygame.event.get():
-            SCENE_MANAGER.input(event)
+        running = not sceneManager.isEmpty()
 
+        sceneManager.inputBatch(events)
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.VIDEORESIZE:
+                window = pygame.display.get_surface()
+
+        if constants.CONFIG_HOT_RELOAD: configStore.poll()
+
+        # A replay runs one update per recorded frame whatever the pacing, so it plays the same at any speed
+        for _ in range(1 if replayer is not None else pacer.getSteps()):
+            sceneManager.update()
+        if constants.SCENE_PRELOADING and not sceneManager.hasPendingWork(): ScenePreloader.getInstance().poll(window)
+        if constants.ADAPTIVE_FRAME_PACING and not sceneManager.hasPendingWork(): continue
+        if replayer is None and not pacer.isRenderDue(): continue
+
+        dirtyRects = sceneManager.draw(window, 1.0 if replayer is not None else pacer.getAlpha())
+        if capture is not None: capture.capture(window)
+
+        presentTime = time.perf_counter()
+        if constants.DIRTY_RECT_RENDERING:
+            if len(dirtyRects) > 0: pygame.display.update(dirtyRects)
+        else:
+            pygame.display.update()
+        if sceneManager.profiler is not None: sceneManager.profiler.endFrame(time.perf_counter() - presentTime)
+
+        if startupTimer is not None:
+            startupTimer.mark("firstFrame")
+            if startupTimer.isOverBudget():
+                LOGGER.warning("main. startup over budget %s", startupTimer.format())
+            else:
+                LOGGER.info("main. startup %s", startupTimer.format())
+            startupTimer = None
 
-        SCENE_MANAGER.update()
-        SCENE_MANAGER.draw(WINDOW)
+    isReplayMatching = True
+    if recorder is not None:
+        recorder.close(frame, getSessionState(sceneManager))
+    if replayer is not None:
+        elapsed = time.perf_counter() - replayStartTime
+        differences = replayer.verify(getSessionState(sceneManager))
+        isReplayMatching = len(differences) == 0
+        LOGGER.info("main. replay frames=%s seconds=%.3f framesPerSecond=%.0f matching=%s", frame, elapsed,
+            frame / max(elapsed, 1e-9), isReplayMatching)
+        for difference in differences:
+            LOGGER.error("main. replay mismatch %s", difference)
 
-        pygame.display.update()
+    if (constants.ADAPTIVE_FRAME_PACING or constants.FIXED_TIMESTEP) and replayer is None:
+        LOGGER.info("main. frame pacing %s", pacer.format())
+
+    LOGGER.info("main. events %s", sceneManager.formatEventStats())
+
+    if sceneManager.profiler is not None:
+        LOGGER.info("main. profiler %s", sceneManager.profiler.format())
+        if constants.PROFILER_EXPORT_PATH is not None: sceneManager.profiler.export(constants.PROFILER_EXPORT_PATH)
+
+    if resultsStore is not None: resultsStore.stop()
+
+    if capture is not None:
+        capture.stop()
+        LOGGER.info("main. capture %s", capture.format())
+
+    if logPipeline is not None:
+        if logPipeline.getDropped() > 0: LOGGER.warning("main. dropped %s log records", logPipeline.getDropped())
+        logPipeline.stop()
 
     pygame.quit()
 
+    if not isReplayMatching: sys.exit(1)
+
 
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,269 @@
+import argparse
+import time
+
+import numpy as np
+
+from modules.game.logic import GameBotLogic, GameUserLogic
+from modules.game.strategies import STRATEGIES, BisectionStrategy, GuessStrategy, RandomStrategy
+from utils.logger import Logger, setLevel as setLogLevel
+
+class GuessDistribution:
+    """
+    Exact probability of a game taking i guesses, indexed by i. Random strategy tails are cut once less than
+    the tolerance is left, the cut mass is kept in tailMass
+    """
+    def __init__(self, probabilities: np.ndarray, worstCase: int) -> None:
+        self.probabilities = probabilities
+        self.worstCase = worstCase
+        self.tailMass = max(0.0, 1.0 - float(probabilities.sum()))
+
+    def getMean(self) -> float:
+        return float(np.dot(np.arange(len(self.probabilities)), self.probabilities))
+
+    def getVariance(self) -> float:
+        counts = np.arange(len(self.probabilities))
+        return float(np.dot((counts - self.getMean()) ** 2, self.probabilities))
+
+    def getPercentile(self, percentile: float) -> int:
+        cumulative = np.cumsum(self.probabilities)
+        return int(min(np.searchsorted(cumulative, cumulative[-1] * percentile / 100.0), len(cumulative) - 1))
+
+    def getWorstCase(self) -> int:
+        return self.worstCase
+
+    def getTailMass(self) -> float:
+        return self.tailMass
+
+
+class DistributionAnalyzer:
+    """
+    Guess count distributions of a GameUserLogic strategy computed by dynamic programming over interval sizes
+    instead of playing games.
+    A range game has the secret uniform over the range. A bot hosted game starts from the hint bounds, so the
+    secret sits a values from the lower hint and b values from the upper one, and the tables run over (a, b)
+    weighted by how often GameBotLogic.deal produces each pair
+    """
+    DEFAULT_TOLERANCE = 1e-12
+
+    # Largest (a, b) table a hint distribution is computed over
+    MAX_HINT_TABLE_SIZE = 1 << 24
+
+    logger = Logger(__name__).getInstance()
+
+    def __init__(self, strategy: GuessStrategy = None, tolerance: float = DEFAULT_TOLERANCE) -> None:
+        self.strategy: GuessStrategy = RandomStrategy() if strategy is None else strategy
+        if type(self.strategy) not in (RandomStrategy, BisectionStrategy):
+            raise ValueError("DistributionAnalyzer. no exact distribution for {}".format(type(self.strategy).__name__))
+
+        self.tolerance = tolerance
+
+        # Distributions by interval size, they only depend on the size so every range of that size reuses them
+        self.randomCache: dict[int, np.ndarray] = {}
+        self.bisectionCache: dict[int, np.ndarray] = {0: np.zeros(1)}
+
+    def getRangeDistribution(self, minRand: int = GameUserLogic.MIN_RAND, maxRand: int = GameUserLogic.MAX_RAND) -> GuessDistribution:
+        size = maxRand - minRand + 1
+        if size <= 0:
+            raise ValueError("DistributionAnalyzer.getRangeDistribution. empty range min={} max={}".format(minRand, maxRand))
+
+        if isinstance(self.strategy, BisectionStrategy):
+            counts = self._getBisectionCounts(size)
+            return GuessDistribution(counts / size, len(counts) - 1)
+
+        return GuessDistribution(self.getRandomDistributions([size])[size], size)
+
+    def getRandomDistributions(self, sizes: list[int]) -> dict[int, np.ndarray]:
+        """
+        Random strategy distributions of several range sizes, one sweep up to the largest missing size fills them all.
+        With C[k][n] the expected number of the n secrets found at guess k, the first guess splits the range
+        uniformly so C[1][n] = 1 and C[k][n] = 2 / n * sum(C[k - 1][m] for m < n)
+        """
+        missing = sorted(set(size for size in sizes if size not in self.randomCache))
+        if len(missing) > 0:
+            maxSize = missing[-1]
+            found = np.zeros(maxSize + 1)
+            found[1:] = 1.0
+            columns = [np.zeros(len(missing)), found[missing] / missing]
+            totals = columns[-1].copy()
+
+            prefix = np.empty(maxSize + 1)
+            guessCount = 1
+            while guessCount < maxSize and np.any(totals < 1.0 - self.tolerance):
+                np.cumsum(found, out=prefix)
+                found[1:] = prefix[:-1]
+                found[1:] *= 2.0 / np.arange(1, maxSize + 1)
+                columns.append(found[missing] / missing)
+                totals += columns[-1]
+                guessCount += 1
+
+            table = np.stack(columns, axis=1)
+            for index, size in enumerate(missing):
+                probabilities = table[index]
+                self.randomCache[size] = probabilities[:np.flatnonzero(probabilities)[-1] + 1]
+
+        return {size: self.randomCache[size] for size in sizes}
+
+    def getHintDistribution(self, minRand: int = GameBotLogic.MIN_RAND, maxRand: int = GameBotLogic.MAX_RAND,
+            hintMinDistance: int = GameBotLogic.HINT_MIN_DISTANCE, hintMaxDistance: int = GameBotLogic.HINT_MAX_DISTANCE) -> GuessDistribution:
+        weights = DistributionAnalyzer.getHintWeights(minRand, maxRand, hintMinDistance, hintMaxDistance)
+        if weights.size > DistributionAnalyzer.MAX_HINT_TABLE_SIZE:
+            raise ValueError("DistributionAnalyzer.getHintDistribution. hint table too large size={}".format(weights.size))
+
+        below = np.arange(weights.shape[0])[:, None]
+        above = np.arange(weights.shape[1])[None, :]
+        sizes = below + above + 1
+        rows, cols = np.nonzero(weights)
+
+        if isinstance(self.strategy, BisectionStrategy):
+            guessCounts = DistributionAnalyzer._getBisectionGuessCounts(rows, cols)
+            probabilities = np.bincount(guessCounts, weights=weights[rows, cols])
+            return GuessDistribution(probabilities, int(guessCounts.max()))
+
+        return GuessDistribution(self._getRandomHintProbabilities(weights, sizes), int((rows + cols).max()) + 1)
+
+    @staticmethod
+    def getHintWeights(minRand: int, maxRand: int, hintMinDistance: int, hintMaxDistance: int) -> np.ndarray:
+        """
+        Probability of the secret starting a values above the lower hint and b values below the upper one, indexed by (a, b).
+        A secret further than hintMaxDistance from both ends of the range always gets the same hints,
+        so only the secrets near the ends are looked at one by one
+        """
+        size = maxRand - minRand + 1
+        if size <= 0 or hintMinDistance < 0 or hintMaxDistance < hintMinDistance:
+            raise ValueError("DistributionAnalyzer.getHintWeights. invalid range or hint distances")
+
+        # Offsets past hintMaxDistance are all clipped to hintMaxDistance + 1
+        clipped = hintMaxDistance + 1
+        nearEnds = np.union1d(np.arange(min(clipped, size)), np.arange(max(0, size - clipped), size))
+        belowOffsets = np.minimum(nearEnds, clipped)
+        aboveOffsets = np.minimum(size - 1 - nearEnds, clipped)
+        multiplicities = np.ones(len(nearEnds))
+        if size > len(nearEnds):
+            belowOffsets = np.append(belowOffsets, clipped)
+            aboveOffsets = np.append(aboveOffsets, clipped)
+            multiplicities = np.append(multiplicities, size - len(nearEnds))
+
+        maxDistance = min(hintMaxDistance, size - 1)
+        belowWeights = DistributionAnalyzer._getDistanceWeights(belowOffsets, maxDistance, hintMinDistance, hintMaxDistance)
+        aboveWeights = DistributionAnalyzer._getDistanceWeights(aboveOffsets, maxDistance, hintMinDistance, hintMaxDistance)
+        return (belowWeights * (multiplicities / size)[:, None]).T @ aboveWeights
+
+    @staticmethod
+    def _getDistanceWeights(offsets: np.ndarray, maxDistance: int, hintMinDistance: int, hintMaxDistance: int) -> np.ndarray:
+        """
+        Row i is the distribution of min(offsets[i], d) over 0..maxDistance with d drawn uniformly from the hint distances
+        """
+        numDistances = hintMaxDistance - hintMinDistance + 1
+        distances = np.arange(maxDistance + 1)[None, :]
+        offsets = offsets[:, None]
+        weights = ((distances >= hintMinDistance) & (distances < offsets)) / numDistances
+        weights += (distances == offsets) * np.clip(hintMaxDistance - offsets + 1, 0, numDistances) / numDistances
+        return weights
+
+    def _getRandomHintProbabilities(self, weights: np.ndarray, sizes: np.ndarray) -> np.ndarray:
+        """
+        With D[k][a, b] the probability of finding the secret at guess k, the guess lands on it with 1 / n and
+        otherwise leaves it with fewer values on one side only: D[1] = 1 / n and
+        D[k][a, b] = (sum(D[k - 1][i, b] for i < a) + sum(D[k - 1][a, j] for j < b)) / n.
+        The two sides shrink together, so they are not treated as independent
+        """
+        found = 1.0 / sizes
+        probabilities = [0.0, float(np.sum(weights * found))]
+        total = probabilities[-1]
+        maxGuesses = int(sizes[weights > 0].max())
+
+        below = np.zeros_like(found)
+        above = np.zeros_like(found)
+        while len(probabilities) <= maxGuesses and total < 1.0 - self.tolerance:
+            np.cumsum(found[:-1, :], axis=0, out=below[1:, :])
+            np.cumsum(found[:, :-1], axis=1, out=above[:, 1:])
+            np.add(below, above, out=found)
+            found /= sizes
+            probabilities.append(float(np.sum(weights * found)))
+            total += probabilities[-1]
+
+        return np.array(probabilities)
+
+    def _getBisectionCounts(self, size: int) -> np.ndarray:
+        """
+        Number of secrets found at each guess count, a range splits into halves of sizes m and size - 1 - m,
+        so only about two sizes per level are ever computed
+        """
+        if size in self.bisectionCache:
+            return self.bisectionCache[size]
+
+        middle = (size - 1) // 2
+        lowerCounts = self._getBisectionCounts(middle)
+        upperCounts = self._getBisectionCounts(size - 1 - middle)
+        counts = np.zeros(max(len(lowerCounts), len(upperCounts)) + 1)
+        counts[1] = 1
+        counts[2:len(lowerCounts) + 1] += lowerCounts[1:]
+        counts[2:len(upperCounts) + 1] += upperCounts[1:]
+
+        self.bisectionCache[size] = counts
+        return counts
+
+    @staticmethod
+    def _getBisectionGuessCounts(below: np.ndarray, above: np.ndarray) -> np.ndarray:
+        """
+        Guess count of a secret with below values under it and above values over it, for all pairs at once
+        """
+        position = below.astype(np.int64)
+        sizes = position + above + 1
+        guessCounts = np.ones(len(position), dtype=np.int64)
+        active = np.arange(len(position))
+
+        while len(active) > 0:
+            middle = (sizes[active] - 1) // 2
+            isLower = position[active] < middle
+            isHigher = position[active] > middle
+            sizes[active] = np.where(isLower, middle, np.where(isHigher, sizes[active] - middle - 1, sizes[active]))
+            position[active] = np.where(isHigher, position[active] - middle - 1, position[active])
+
+            active = active[isLower | isHigher]
+            guessCounts[active] += 1
+
+        return guessCounts
+
+
+def printDistribution(name: str, distribution: GuessDistribution, elapsed: float, showHistogram: bool) -> None:
+    print("{} mean={:.6f} variance={:.6f} p50={} p90={} p99={} p999={} worst={} tail={:.1e} seconds={:.3f}".format(name,
+        distribution.getMean(), distribution.getVariance(), distribution.getPercentile(50), distribution.getPercentile(90),
+        distribution.getPercentile(99), distribution.getPercentile(99.9), distribution.getWorstCase(), distribution.getTailMass(), elapsed))
+    if showHistogram:
+        for count, probability in enumerate(distribution.probabilities):
+            if probability > 0: print("{:6d} {:.12f}".format(count, probability))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Print the exact guess count distribution of a strategy, with and without the bot hints")
+    parser.add_argument("--min", type=int, default=GameBotLogic.MIN_RAND)
+    parser.add_argument("--max", type=int, default=GameBotLogic.MAX_RAND)
+    parser.add_argument("--hint-min", type=int, default=GameBotLogic.HINT_MIN_DISTANCE)
+    parser.add_argument("--hint-max", type=int, default=GameBotLogic.HINT_MAX_DISTANCE)
+    parser.add_argument("--strategy", choices=list(STRATEGIES.keys()), default=RandomStrategy.NAME)
+    parser.add_argument("--tolerance", type=float, default=DistributionAnalyzer.DEFAULT_TOLERANCE)
+    parser.add_argument("--no-hints", action="store_true", help="only compute the range distribution")
+    parser.add_argument("--histogram", action="store_true", help="print the probability of every guess count")
+    parser.add_argument("--log-level", default="WARNING", help="WARNING reports hint distributions too large to compute")
+    args = parser.parse_args()
+    setLogLevel(args.log_level)
+
+    analyzer = DistributionAnalyzer(STRATEGIES[args.strategy](), args.tolerance)
+
+    startTime = time.perf_counter()
+    distribution = analyzer.getRangeDistribution(args.min, args.max)
+    printDistribution("range", distribution, time.perf_counter() - startTime, args.histogram)
+
+    if args.no_hints: return
+
+    startTime = time.perf_counter()
+    try:
+        distribution = analyzer.getHintDistribution(args.min, args.max, args.hint_min, args.hint_max)
+    except ValueError as e:
+        DistributionAnalyzer.logger.warning("main. skipped hint distribution error=%s", e)
+        return
+    printDistribution("hints", distribution, time.perf_counter() - startTime, args.histogram)
+
+
+if __name__ == '__main__':
+    main()
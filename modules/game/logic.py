@@ -1,7 +1,10 @@
+import logging
 import random
 
 from enum import Enum
 
+from modules.game.random_stream import RandomSource
+from modules.game.strategies import GuessStrategy, RandomStrategy
 from utils.logger import Logger
 
 class CheckResult(Enum):
@@ -20,9 +23,14 @@ class GameBotLogic:
 
     logger = Logger(__name__).getInstance()
     
-    def __init__(self) -> None:
-        GameBotLogic._instance = self
-        
+    def __init__(self, minRand: int = MIN_RAND, maxRand: int = MAX_RAND, hintMinDistance: int = HINT_MIN_DISTANCE, 
+            hintMaxDistance: int = HINT_MAX_DISTANCE, rng: RandomSource = random) -> None:
+        self.minRand = minRand
+        self.maxRand = maxRand
+        self.hintMinDistance = hintMinDistance
+        self.hintMaxDistance = hintMaxDistance
+        self.rng = rng
+
         self.count = 0
         self.secretNumber = -1
         self.hintLowerBound = -1
@@ -30,12 +38,11 @@ class GameBotLogic:
 
     def start(self) -> None:
         self.count = 0
-        self.secretNumber = random.randint(GameBotLogic.MIN_RAND, GameBotLogic.MAX_RAND)
-        self.hintLowerBound = max(GameBotLogic.MIN_RAND, self.secretNumber - random.randint(GameBotLogic.HINT_MIN_DISTANCE, GameBotLogic.HINT_MAX_DISTANCE))
-        self.hintUpperBound = min(GameBotLogic.MAX_RAND, self.secretNumber + random.randint(GameBotLogic.HINT_MIN_DISTANCE, GameBotLogic.HINT_MAX_DISTANCE))
+        self.secretNumber, self.hintLowerBound, self.hintUpperBound = GameBotLogic.deal(self.rng, self.minRand, self.maxRand, 
+            self.hintMinDistance, self.hintMaxDistance)
 
-        GameBotLogic.logger.info("GameBotLogic.start. secretNumber={} hintLowerBound={} hintUpperBound={}".format(self.secretNumber, 
-            self.hintLowerBound, self.hintUpperBound))
+        GameBotLogic.logger.info("GameBotLogic.start. secretNumber=%s hintLowerBound=%s hintUpperBound=%s", self.secretNumber, 
+            self.hintLowerBound, self.hintUpperBound)
         
     def getLowerHint(self) -> int:
         return self.hintLowerBound
@@ -46,23 +53,54 @@ class GameBotLogic:
     def getCount(self) -> int:
         return self.count
 
+    def setRandom(self, rng: RandomSource) -> None:
+        self.rng = rng
+
+    def getSnapshot(self) -> dict:
+        return {
+            "count": self.count,
+            "secretNumber": self.secretNumber,
+            "hintLowerBound": self.hintLowerBound,
+            "hintUpperBound": self.hintUpperBound
+        }
+
     def getInstance() -> "GameBotLogic":
         if GameBotLogic._instance is None:
-            GameBotLogic()
+            GameBotLogic._instance = GameBotLogic()
         return GameBotLogic._instance
 
     def checkAnswer(self, answer: int) -> CheckResult:
         self.count += 1
-        GameBotLogic.logger.info("GameBotLogic.checkAnswer. answer={} upperHint={} lowerHint={}".format(answer, self.hintUpperBound, self.hintLowerBound))
-        if answer < self.hintLowerBound or answer > self.hintUpperBound:
-            return CheckResult.INVALID
-        elif answer < self.secretNumber: 
-            self.hintLowerBound = answer
-            return CheckResult.GREATER_THAN
-        elif answer > self.secretNumber: 
-            self.hintUpperBound = answer
-            return CheckResult.LESS_THAN
-        return CheckResult.EQUAL
+        checkResult, self.hintLowerBound, self.hintUpperBound = GameBotLogic.evaluate(answer, self.secretNumber, 
+            self.hintLowerBound, self.hintUpperBound)
+        if GameBotLogic.logger.isEnabledFor(logging.DEBUG):
+            GameBotLogic.logger.debug("GameBotLogic.checkAnswer. answer=%s result=%s upperHint=%s lowerHint=%s", answer, checkResult, 
+                self.hintUpperBound, self.hintLowerBound, extra={"event": "checkAnswer", "answer": answer, "result": checkResult.value, 
+                "count": self.count, "lowerHint": self.hintLowerBound, "upperHint": self.hintUpperBound})
+        return checkResult
+
+    @staticmethod
+    def deal(rng: RandomSource, minRand: int, maxRand: int, hintMinDistance: int, hintMaxDistance: int) -> tuple[int, int, int]:
+        """
+        Draw a secret number and the hint bounds around it
+        """
+        secretNumber = rng.randint(minRand, maxRand)
+        hintLowerBound = max(minRand, secretNumber - rng.randint(hintMinDistance, hintMaxDistance))
+        hintUpperBound = min(maxRand, secretNumber + rng.randint(hintMinDistance, hintMaxDistance))
+        return (secretNumber, hintLowerBound, hintUpperBound)
+
+    @staticmethod
+    def evaluate(answer: int, secretNumber: int, hintLowerBound: int, hintUpperBound: int) -> tuple[CheckResult, int, int]:
+        """
+        Check an answer against the secret number, return the result with the updated hint bounds
+        """
+        if answer < hintLowerBound or answer > hintUpperBound:
+            return (CheckResult.INVALID, hintLowerBound, hintUpperBound)
+        elif answer < secretNumber: 
+            return (CheckResult.GREATER_THAN, answer, hintUpperBound)
+        elif answer > secretNumber: 
+            return (CheckResult.LESS_THAN, hintLowerBound, answer)
+        return (CheckResult.EQUAL, hintLowerBound, hintUpperBound)
 
 class GameUserLogic:
     MAX_RAND = 1000
@@ -72,31 +110,46 @@ class GameUserLogic:
 
     logger = Logger(__name__).getInstance()
     
-    def __init__(self) -> None:
-        GameUserLogic._instance = self
+    def __init__(self, minRand: int = MIN_RAND, maxRand: int = MAX_RAND, rng: RandomSource = random, strategy: GuessStrategy = None) -> None:
+        self.minRand = minRand
+        self.maxRand = maxRand
+        self.rng = rng
+        self.strategy: GuessStrategy = RandomStrategy() if strategy is None else strategy
 
         self.lowerBound = -1
         self.upperBound = -1
         self.guessNumber = -1
         self.isValid = False
+        self.count = 0
 
-    def start(self) -> None:
-        self.lowerBound = GameUserLogic.MIN_RAND
-        self.upperBound = GameUserLogic.MAX_RAND
+    def start(self, lowerBound: int = None, upperBound: int = None) -> None:
+        self.lowerBound = self.minRand if lowerBound is None else lowerBound
+        self.upperBound = self.maxRand if upperBound is None else upperBound
         self.isValid = False
+        self.count = 0
 
         self.guess()
 
-        GameUserLogic.logger.info("GameUserLogic.start. guessNumber={} lowerBound={} upperBound={}".format(self.guessNumber, 
-            self.lowerBound, self.upperBound))
+        GameUserLogic.logger.info("GameUserLogic.start. guessNumber=%s lowerBound=%s upperBound=%s", self.guessNumber, 
+            self.lowerBound, self.upperBound)
 
     def guess(self) -> bool:
         if self.lowerBound > self.upperBound:
             return False
-        GameUserLogic.logger.info("GameUserLogic.guess. lowerBound={} upperBound={}".format(self.lowerBound, self.upperBound))
-        self.guessNumber = random.randint(self.lowerBound, self.upperBound)
+        self.guessNumber = self.strategy.guess(self.lowerBound, self.upperBound, self.rng)
+        self.count += 1
+        if GameUserLogic.logger.isEnabledFor(logging.DEBUG):
+            GameUserLogic.logger.debug("GameUserLogic.guess. guessNumber=%s lowerBound=%s upperBound=%s", self.guessNumber, self.lowerBound, 
+                self.upperBound, extra={"event": "guess", "guessNumber": self.guessNumber, "lowerBound": self.lowerBound, 
+                "upperBound": self.upperBound})
         return True
 
+    def setStrategy(self, strategy: GuessStrategy) -> None:
+        self.strategy = strategy
+
+    def getStrategy(self) -> GuessStrategy:
+        return self.strategy
+
     def updateLower(self) -> None:
         self.lowerBound = self.guessNumber + 1
 
@@ -108,8 +161,22 @@ class GameUserLogic:
 
     def getGuessNumber(self) -> int:
         return self.guessNumber
+
+    def getCount(self) -> int:
+        return self.count
+
+    def setRandom(self, rng: RandomSource) -> None:
+        self.rng = rng
+
+    def getSnapshot(self) -> dict:
+        return {
+            "lowerBound": self.lowerBound,
+            "upperBound": self.upperBound,
+            "guessNumber": self.guessNumber,
+            "isValid": self.isValid
+        }
     
     def getInstance() -> "GameUserLogic":
         if GameUserLogic._instance is None:
-            GameUserLogic()
+            GameUserLogic._instance = GameUserLogic()
         return GameUserLogic._instance
\ No newline at end of file
@@ -0,0 +1,67 @@
+import typing
+
+MASK_64 = (1 << 64) - 1
+GOLDEN_GAMMA = 0x9E3779B97F4A7C15
+MIX_MULTIPLIER_1 = 0xBF58476D1CE4E5B9
+MIX_MULTIPLIER_2 = 0x94D049BB133111EB
+
+# Largest range of a 32 bit draw, the only draw the vectorized BatchSimulator has. CounterRandom
+# draws larger ranges, up to 64 bits, by rejection, which the batch version cannot reproduce
+MAX_DRAW_RANGE = 1 << 32
+MAX_WIDE_DRAW_RANGE = 1 << 64
+
+class Stream:
+    HOST = 1
+    GUESSER = 2
+
+class RandomSource(typing.Protocol):
+    def randint(self, a: int, b: int) -> int: ...
+
+def mix64(value: int) -> int:
+    """
+    SplitMix64 finalizer, the scalar twin of simulator.mix64Array
+    """
+    value = (value + GOLDEN_GAMMA) & MASK_64
+    value = ((value ^ (value >> 30)) * MIX_MULTIPLIER_1) & MASK_64
+    value = ((value ^ (value >> 27)) * MIX_MULTIPLIER_2) & MASK_64
+    return value ^ (value >> 31)
+
+def streamKey(seed: int, stream: int) -> int:
+    return mix64((seed & MASK_64) ^ mix64(stream))
+
+def drawValue(gameKey: int, draw: int) -> int:
+    return mix64((gameKey + draw * GOLDEN_GAMMA) & MASK_64)
+
+def drawBounded(gameKey: int, draw: int, size: int) -> int:
+    return ((drawValue(gameKey, draw) >> 32) * size) >> 32
+
+class CounterRandom:
+    """
+    Counter based random source: the n-th draw of a game only depends on (seed, stream, game, n),
+    so any game of a batch can be replayed on its own with the scalar logic classes
+    """
+    def __init__(self, seed: int, game: int, stream: int) -> None:
+        self.gameKey = mix64(streamKey(seed, stream) ^ game)
+        self.draws = 0
+
+    def randint(self, a: int, b: int) -> int:
+        size = b - a + 1
+        if size > MAX_WIDE_DRAW_RANGE:
+            raise ValueError("CounterRandom.randint. range too large size={}".format(size))
+        if size > MAX_DRAW_RANGE:
+            return a + self._drawWide(size)
+
+        value = a + drawBounded(self.gameKey, self.draws, size)
+        self.draws += 1
+        return value
+
+    def _drawWide(self, size: int) -> int:
+        """
+        Unbiased draw in [0, size) from full 64 bit values, the few low products that would favour some
+        results are drawn again
+        """
+        threshold = (MAX_WIDE_DRAW_RANGE - size) % size
+        while True:
+            product = drawValue(self.gameKey, self.draws) * size
+            self.draws += 1
+            if product & MASK_64 >= threshold: return product >> 64
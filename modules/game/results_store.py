@@ -0,0 +1,376 @@
+import argparse
+import os
+import queue
+import struct
+import threading
+import time
+
+import numpy as np
+
+from utils.logger import Logger, setLevel as setLogLevel
+
+RECORD_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("number", "<i8"),
+    ("tries", "<u4"),
+    ("mode", "u1"),
+    ("valid", "u1"),
+    ("reserved", "V2")
+])
+
+# Fields of a queued game, the rest of the record is filled in when it is written
+QUEUED_DTYPE = np.dtype([(name, RECORD_DTYPE[name]) for name in ("timestamp", "tries", "number", "mode", "valid")])
+
+HEADER = struct.Struct("<4sII4x")
+MAGIC = b"GTNR"
+VERSION = 2
+
+class ResultsSummary:
+    """
+    Aggregates of a set of games, tries past the histogram are counted in its last bin
+    """
+    def __init__(self, histogramSize: int) -> None:
+        self.games = 0
+        self.valid = 0
+        self.triesSum = 0
+        self.histogram = np.zeros(histogramSize, dtype=np.int64)
+
+    def add(self, games: int, valid: int, triesSum: int, histogram: np.ndarray) -> None:
+        self.games += int(games)
+        self.valid += int(valid)
+        self.triesSum += int(triesSum)
+        self.histogram += histogram.astype(np.int64)
+
+    def getGames(self) -> int:
+        return self.games
+
+    def getMeanTries(self) -> float:
+        return self.triesSum / max(1, self.games)
+
+    def getPercentileTries(self, percentile: float) -> int:
+        cumulative = np.cumsum(self.histogram)
+        if cumulative[-1] == 0: return 0
+        return int(np.searchsorted(cumulative, cumulative[-1] * percentile / 100.0))
+
+    def getTrickedRate(self) -> float:
+        """
+        Share of games the host ended without a valid answer, only user hosted games can end that way
+        """
+        return (self.games - self.valid) / max(1, self.games)
+
+
+class ResultsStore:
+    """
+    Append only log of finished games: a 16 byte header then fixed 24 byte records in timestamp order.
+    Games are queued by append and written in batches by a background thread. Every complete block of
+    BLOCK_RECORDS records gets a summary per mode in the .idx file next to the log, so a query reads the
+    summaries of the blocks inside its time range and only scans the records of the blocks at its edges
+    """
+    BLOCK_RECORDS = 1 << 16
+    HISTOGRAM_SIZE = 256
+    MAX_MODES = 4
+    MIN_NUMBER = -(1 << 63)
+    MAX_NUMBER = (1 << 63) - 1
+
+    DEFAULT_BATCH_SIZE = 4096
+
+    BLOCK_DTYPE = np.dtype([
+        ("firstTimestamp", "<i8"),
+        ("lastTimestamp", "<i8"),
+        ("games", "<u8", (MAX_MODES,)),
+        ("valid", "<u8", (MAX_MODES,)),
+        ("triesSum", "<u8", (MAX_MODES,)),
+        ("histogram", "<u4", (MAX_MODES, HISTOGRAM_SIZE))
+    ])
+
+    _instance = None
+
+    logger = Logger(__name__).getInstance()
+
+    def __init__(self, path: str, batchSize: int = DEFAULT_BATCH_SIZE) -> None:
+        self.path = path
+        self.indexPath = path + ".idx"
+        self.batchSize = batchSize
+
+        self.queue: queue.Queue = queue.Queue()
+        self.thread: threading.Thread = None
+        self.lock = threading.Lock()
+
+        self._open()
+
+    def _open(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory != "": os.makedirs(directory, exist_ok=True)
+
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            with open(self.path, "wb") as f:
+                f.write(HEADER.pack(MAGIC, VERSION, RECORD_DTYPE.itemsize))
+
+        with open(self.path, "rb") as f:
+            magic, version, recordSize = HEADER.unpack(f.read(HEADER.size))
+        if magic != MAGIC:
+            raise ValueError("ResultsStore._open. {} is not a results log".format(self.path))
+        if version != VERSION or recordSize != RECORD_DTYPE.itemsize:
+            self._moveAside(version)
+            self._open()
+            return
+
+        # A record cut by a crash is dropped, the games before it are kept
+        recordCount = self._getRecordCount()
+        if os.path.getsize(self.path) != HEADER.size + recordCount * RECORD_DTYPE.itemsize:
+            ResultsStore.logger.warning("ResultsStore._open. truncating a partial record path=%s", self.path)
+            os.truncate(self.path, HEADER.size + recordCount * RECORD_DTYPE.itemsize)
+
+        self.dataFile = open(self.path, "ab")
+        self._syncIndex(recordCount)
+
+    def _moveAside(self, version: int) -> None:
+        """
+        Keep a log of an older version next to the new one, with its index, instead of failing to start
+        """
+        ResultsStore.logger.warning("ResultsStore._moveAside. path=%s has version=%s, starting a version %s log", self.path, version, VERSION)
+        for path in (self.path, self.indexPath):
+            if os.path.exists(path): os.replace(path, "{}.v{}".format(path, version))
+
+    def _syncIndex(self, recordCount: int) -> None:
+        """
+        Summarize the complete blocks the index misses, then keep the records of the last incomplete block
+        in memory until it fills up
+        """
+        blockCount = recordCount // ResultsStore.BLOCK_RECORDS
+        indexedCount = self._loadIndex().shape[0]
+        if indexedCount > blockCount or (os.path.exists(self.indexPath) and
+                os.path.getsize(self.indexPath) != indexedCount * ResultsStore.BLOCK_DTYPE.itemsize):
+            ResultsStore.logger.warning("ResultsStore._syncIndex. rebuilding index path=%s", self.indexPath)
+            indexedCount = 0
+            os.truncate(self.indexPath, 0)
+
+        self.indexFile = open(self.indexPath, "ab")
+        records = self._mapRecords(recordCount)
+        for block in range(indexedCount, blockCount):
+            self._writeBlock(records[block * ResultsStore.BLOCK_RECORDS:(block + 1) * ResultsStore.BLOCK_RECORDS])
+
+        self.tail = np.array(records[blockCount * ResultsStore.BLOCK_RECORDS:])
+        self.recordCount = recordCount
+        self.lastTimestamp = int(records[-1]["timestamp"]) if recordCount > 0 else 0
+
+    def start(self) -> None:
+        if self.thread is not None: return
+
+        self.thread = threading.Thread(target=self._run, name="ResultsStore", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """
+        Write the queued games and close the files
+        """
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+        else:
+            self._drain()
+
+        self.dataFile.close()
+        self.indexFile.close()
+
+    def append(self, mode: int, tries: int, number: int, valid: bool) -> None:
+        """
+        Queue a finished game, safe to call from the frame loop
+        """
+        if mode < 0 or mode >= ResultsStore.MAX_MODES:
+            raise ValueError("ResultsStore.append. invalid mode={}".format(mode))
+        # A number past the 64 bit range would fail its whole batch, it is kept as the nearest limit
+        number = min(max(number, ResultsStore.MIN_NUMBER), ResultsStore.MAX_NUMBER)
+        self.queue.put((time.time_ns() // 1000, tries, number, mode, valid))
+
+    def flush(self) -> None:
+        """
+        Block until every queued game is on disk
+        """
+        if self.thread is None:
+            self._drain()
+        else:
+            self.queue.join()
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < self.batchSize:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            isStopping = batch[-1] is None
+            rows = [row for row in batch if row is not None]
+            try:
+                if len(rows) > 0: self.write(np.array(rows, dtype=QUEUED_DTYPE))
+            except Exception:
+                # A bad batch is lost but the thread keeps writing the next ones
+                ResultsStore.logger.exception("ResultsStore._run. failed to write %s games", len(rows))
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+            if isStopping: return
+
+    def _drain(self) -> None:
+        rows = []
+        while True:
+            try:
+                rows.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+            self.queue.task_done()
+
+        if len(rows) > 0: self.write(np.array(rows, dtype=QUEUED_DTYPE))
+
+    def write(self, rows: np.ndarray) -> None:
+        """
+        Append records, any array with the record fields works. Timestamps are kept non decreasing,
+        a clock going back is written with the last timestamp
+        """
+        records = np.zeros(len(rows), dtype=RECORD_DTYPE)
+        for name in rows.dtype.names:
+            records[name] = rows[name]
+        np.maximum.accumulate(np.maximum(records["timestamp"], self.lastTimestamp), out=records["timestamp"])
+
+        with self.lock:
+            self.dataFile.write(records.tobytes())
+            self.dataFile.flush()
+
+            self.tail = np.concatenate((self.tail, records))
+            while len(self.tail) >= ResultsStore.BLOCK_RECORDS:
+                self._writeBlock(self.tail[:ResultsStore.BLOCK_RECORDS])
+                self.tail = self.tail[ResultsStore.BLOCK_RECORDS:]
+
+            self.recordCount += len(records)
+            self.lastTimestamp = int(records["timestamp"][-1])
+
+    def _writeBlock(self, records: np.ndarray) -> None:
+        block = np.zeros(1, dtype=ResultsStore.BLOCK_DTYPE)
+        block["firstTimestamp"] = records["timestamp"][0]
+        block["lastTimestamp"] = records["timestamp"][-1]
+        for mode in range(ResultsStore.MAX_MODES):
+            games, valid, triesSum, histogram = ResultsStore._summarize(records, mode)
+            block["games"][0, mode] = games
+            block["valid"][0, mode] = valid
+            block["triesSum"][0, mode] = triesSum
+            block["histogram"][0, mode] = histogram
+
+        self.indexFile.write(block.tobytes())
+        self.indexFile.flush()
+
+    @staticmethod
+    def _summarize(records: np.ndarray, mode: int = None) -> tuple[int, int, int, np.ndarray]:
+        if mode is not None: records = records[records["mode"] == mode]
+        tries = records["tries"]
+        histogram = np.bincount(np.minimum(tries, ResultsStore.HISTOGRAM_SIZE - 1), minlength=ResultsStore.HISTOGRAM_SIZE)
+        return (len(records), int(np.count_nonzero(records["valid"])), int(tries.sum(dtype=np.uint64)), histogram)
+
+    def getRecordCount(self) -> int:
+        return self._getRecordCount()
+
+    def _getRecordCount(self) -> int:
+        return (os.path.getsize(self.path) - HEADER.size) // RECORD_DTYPE.itemsize
+
+    def _mapRecords(self, recordCount: int) -> np.ndarray:
+        if recordCount == 0: return np.zeros(0, dtype=RECORD_DTYPE)
+        return np.memmap(self.path, dtype=RECORD_DTYPE, mode="r", offset=HEADER.size, shape=(recordCount,))
+
+    def _loadIndex(self) -> np.ndarray:
+        if not os.path.exists(self.indexPath): return np.zeros(0, dtype=ResultsStore.BLOCK_DTYPE)
+        blockCount = os.path.getsize(self.indexPath) // ResultsStore.BLOCK_DTYPE.itemsize
+        return np.fromfile(self.indexPath, dtype=ResultsStore.BLOCK_DTYPE, count=blockCount)
+
+    def query(self, mode: int = None, startTime: int = None, endTime: int = None) -> ResultsSummary:
+        """
+        Summary of the games of a mode, or of all modes, with startTime <= timestamp < endTime in microseconds
+        """
+        with self.lock:
+            recordCount = self.recordCount
+            blocks = self._loadIndex()[:recordCount // ResultsStore.BLOCK_RECORDS]
+
+        startTime = np.iinfo(np.int64).min if startTime is None else startTime
+        endTime = np.iinfo(np.int64).max if endTime is None else endTime
+        modes = slice(None) if mode is None else slice(mode, mode + 1)
+        records = self._mapRecords(recordCount)
+        summary = ResultsSummary(ResultsStore.HISTOGRAM_SIZE)
+
+        isInside = (blocks["firstTimestamp"] >= startTime) & (blocks["lastTimestamp"] < endTime)
+        inside = blocks[isInside]
+        summary.add(inside["games"][:, modes].sum(), inside["valid"][:, modes].sum(), inside["triesSum"][:, modes].sum(),
+            inside["histogram"][:, modes].sum(axis=(0, 1)))
+
+        isOverlapping = ~isInside & (blocks["lastTimestamp"] >= startTime) & (blocks["firstTimestamp"] < endTime)
+        ranges = [(block * ResultsStore.BLOCK_RECORDS, (block + 1) * ResultsStore.BLOCK_RECORDS) for block in np.flatnonzero(isOverlapping)]
+        ranges.append((len(blocks) * ResultsStore.BLOCK_RECORDS, recordCount))
+        for first, last in ranges:
+            chunk = records[first:last]
+            timestamps = chunk["timestamp"]
+            chunk = chunk[np.searchsorted(timestamps, startTime):np.searchsorted(timestamps, endTime)]
+            summary.add(*ResultsStore._summarize(chunk, mode))
+
+        return summary
+
+    @staticmethod
+    def configure(path: str, batchSize: int = DEFAULT_BATCH_SIZE) -> "ResultsStore":
+        ResultsStore._instance = ResultsStore(path, batchSize)
+        ResultsStore._instance.start()
+        return ResultsStore._instance
+
+    @staticmethod
+    def getInstance() -> "ResultsStore":
+        """
+        The store games are recorded to, None when results are not kept
+        """
+        return ResultsStore._instance
+
+
+def generate(store: ResultsStore, numGames: int, seed: int, batchSize: int = 1 << 20) -> None:
+    """
+    Append synthetic games one minute apart, ending now or after the last game, for sizing and timing queries
+    """
+    rng = np.random.default_rng(seed)
+    startTime = max(store.lastTimestamp + 1, time.time_ns() // 1000 - numGames * 60 * 1000000)
+    for first in range(0, numGames, batchSize):
+        count = min(batchSize, numGames - first)
+        rows = np.zeros(count, dtype=RECORD_DTYPE)
+        rows["timestamp"] = startTime + (first + np.arange(count, dtype=np.int64)) * 60 * 1000000
+        rows["mode"] = rng.integers(0, 2, count)
+        rows["tries"] = rng.geometric(0.1, count)
+        rows["number"] = rng.integers(0, 1001, count)
+        rows["valid"] = (rows["mode"] == 0) | (rng.random(count) < 0.9)
+        store.write(rows)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Query the finished games log")
+    parser.add_argument("--path", default="data/results.bin")
+    parser.add_argument("--mode", type=int, default=None, help="0 for bot hosted games, 1 for user hosted games")
+    parser.add_argument("--since", type=float, default=None, help="unix time in seconds")
+    parser.add_argument("--until", type=float, default=None, help="unix time in seconds")
+    parser.add_argument("--generate", type=int, default=0, help="append this many synthetic games first")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--log-level", default="WARNING", help="level of the log recovery and index rebuild messages")
+    args = parser.parse_args()
+    setLogLevel(args.log_level)
+
+    store = ResultsStore(args.path)
+    if args.generate > 0:
+        startTime = time.perf_counter()
+        generate(store, args.generate, args.seed)
+        print("generated games={} seconds={:.2f}".format(args.generate, time.perf_counter() - startTime))
+
+    startTime = time.perf_counter()
+    summary = store.query(args.mode, None if args.since is None else int(args.since * 1e6), None if args.until is None else int(args.until * 1e6))
+    elapsed = time.perf_counter() - startTime
+    store.stop()
+
+    print("records={} games={} meanTries={:.3f} p50={} p90={} p99={} trickedRate={:.4f} seconds={:.3f}".format(store.getRecordCount(),
+        summary.getGames(), summary.getMeanTries(), summary.getPercentileTries(50), summary.getPercentileTries(90),
+        summary.getPercentileTries(99), summary.getTrickedRate(), elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,12 +1,17 @@
 from enum import Enum
+import typing
 import pygame
 from components.button import Button
 from components.input import InputTextBox
 from components.label import Label
-from components.scene import Scene, SceneManager
+from components.list_view import ListView
+from components.preloader import ScenePreloader
+from components.scene import Scene, SceneManager, SceneRegistry
+from components.widget import Widget
 from modules.game.logic import CheckResult, GameBotLogic, GameUserLogic
+from modules.game.results_store import ResultsStore
 from utils.enum_types import MouseEvent
-from utils.json_reader import JsonReader
+from utils.config import ConfigStore
 from utils.logger import Logger
 import utils.constants as constants
 
@@ -14,32 +19,53 @@ class GameMode(Enum):
     BOT_HOST = 0
     USER_HOST = 1
 
-class GameBotScene(Scene):
-    _instance = None
+# Guess history rows keep the result as a small integer code
+CHECK_RESULT_CODES = {checkResult: code for code, checkResult in enumerate(CheckResult)}
+HISTORY_TEXTS = ["correct", "lower", "higher", "out of range"]
+
+def formatGuess(guess: int, code: int) -> str:
+    return "{}  {}".format(guess, HISTORY_TEXTS[code])
 
+class GameBotScene(Scene):
     logger = Logger(__name__).getInstance()
 
     CONFIG_FILE = "conf/game/GameBotScene.json"
+    WIDGET_SCHEMAS = {
+        "titleLabel": Label.SCHEMA,
+        "questionLabel": Label.SCHEMA,
+        "messageLabel": Label.SCHEMA,
+        "countLabel": Label.SCHEMA,
+        "answerInput": InputTextBox.SCHEMA,
+        "checkBtn": Button.SCHEMA,
+        "historyList": ListView.SCHEMA
+    }
+    STATIC_WIDGETS = ["titleLabel", "checkBtn"]
+    EVENT_TYPES = [pygame.KEYDOWN, pygame.MOUSEWHEEL]
 
     VALID_ANSWER_INPUT = [pygame.K_0, pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4, pygame.K_5, pygame.K_6, pygame.K_7, pygame.K_8, pygame.K_9]
     
     def __init__(self) -> None:
-        GameBotScene._instance = self
-
-        self.conf = JsonReader.load(GameBotScene.CONFIG_FILE)
+        super().__init__()
 
         self.sceneMgr = None
         self.logic: GameBotLogic = GameBotLogic.getInstance()
 
+        self.buildWidgets()
+        self.init()
+
+        ConfigStore.getInstance().watch(GameBotScene.CONFIG_FILE, self.onConfigReload)
+
+    def buildWidgets(self) -> None:
+        self.conf = ConfigStore.getInstance().load(GameBotScene.CONFIG_FILE, GameBotScene.WIDGET_SCHEMAS)
+
         self.titleLabel: Label = Label(conf=self.conf["titleLabel"])
         self.questionLabel: Label = Label(conf=self.conf["questionLabel"])
         self.messageLabel: Label = Label(conf=self.conf["messageLabel"])
         self.countLabel: Label = Label(conf=self.conf["countLabel"])
         self.answerInput: InputTextBox = InputTextBox(conf=self.conf["answerInput"])
         self.checkBtn: Button = Button(conf=self.conf["checkBtn"])
+        self.historyList: ListView = ListView(conf=self.conf["historyList"], formatter=formatGuess)
 
-        self.init()
-        
     def init(self) -> None:
         self.sceneMgr = SceneManager.getInstance()
 
@@ -50,7 +76,12 @@ class GameBotScene(Scene):
 
         self.logic.start()
 
+        if constants.SCENE_PRELOADING: ScenePreloader.getInstance().request(__name__, "EndScene", GameMode.BOT_HOST)
+
     def input(self, event: pygame.event.Event) -> None:
+        if event.type == pygame.MOUSEWHEEL:
+            self.historyList.onMouseWheel(event.y)
+            return
         if event.type == pygame.KEYDOWN:
             if event.key == pygame.K_BACKSPACE:
                 self.answerInput.popText()
@@ -58,22 +89,17 @@ class GameBotScene(Scene):
             if event.key not in GameBotScene.VALID_ANSWER_INPUT:
                 return
 
-            self.answerInput.pushText(event.unicode)
+            # The digit comes from the key, unicode depends on a TEXTINPUT event and the keyboard layout
+            self.answerInput.pushText(str(GameBotScene.VALID_ANSWER_INPUT.index(event.key)))
 
-    def draw(self, screen: pygame.surface.Surface) -> None:
-        screen.fill(constants.BACKGROUND_COLOR)
-
-        self.titleLabel.draw(screen)
+    def update(self) -> None:
+        super().update()
 
         self.questionLabel.setText("Your number is between {} and {}".format(self.logic.getLowerHint(), self.logic.getUpperHint()))
-        self.questionLabel.draw(screen)
-
         self.countLabel.setText("You tried {} times".format(self.logic.getCount()))
-        self.countLabel.draw(screen)
 
-        self.messageLabel.draw(screen)
-        self.answerInput.draw(screen)
-        self.checkBtn.draw(screen)
+    def getWidgets(self) -> typing.List[Widget]:
+        return [self.titleLabel, self.questionLabel, self.countLabel, self.messageLabel, self.answerInput, self.checkBtn, self.historyList]
 
     def onCheckClick(self) -> None:
         answer = self.answerInput.getText()
@@ -83,11 +109,12 @@ class GameBotScene(Scene):
             return
 
         checkResult: CheckResult = self.logic.checkAnswer(int(answer))
-        GameBotScene.logger.info("GameBotScene.onCheckClick. checkResult={}".format(checkResult))
+        GameBotScene.logger.debug("GameBotScene.onCheckClick. checkResult=%s", checkResult)
         if checkResult == CheckResult.EQUAL:
             self.sceneMgr.push(EndScene.getInstance(GameMode.BOT_HOST))
             return
 
+        self.historyList.append(int(answer), CHECK_RESULT_CODES[checkResult])
         self.answerInput.clearText()
         self.messageLabel.clearText()
 
@@ -95,40 +122,53 @@ class GameBotScene(Scene):
         self.questionLabel.clearText()
         self.messageLabel.clearText()
         self.answerInput.clearText()
+        self.historyList.clear()
 
     @staticmethod
     def getInstance() -> "GameBotScene":
-        if GameBotScene._instance is None:
-            GameBotScene()
-        return GameBotScene._instance
+        return SceneRegistry.getInstance().get(GameBotScene)
 
 
 class GameUserScene(Scene):
-    _instance = None
-
     logger = Logger(__name__).getInstance()
 
     CONFIG_FILE = "conf/game/GameUserScene.json"
+    WIDGET_SCHEMAS = {
+        "titleLabel": Label.SCHEMA,
+        "questionLabel": Label.SCHEMA,
+        "answerLabel": Label.SCHEMA,
+        "lowBtn": Button.SCHEMA,
+        "highBtn": Button.SCHEMA,
+        "correctBtn": Button.SCHEMA,
+        "historyList": ListView.SCHEMA
+    }
+    STATIC_WIDGETS = ["titleLabel", "questionLabel", "lowBtn", "highBtn", "correctBtn"]
+    EVENT_TYPES = [pygame.MOUSEWHEEL]
 
     VALID_ANSWER_INPUT = [pygame.K_0, pygame.K_1, pygame.K_2, pygame.K_3, pygame.K_4, pygame.K_5, pygame.K_6, pygame.K_7, pygame.K_8, pygame.K_9]
     
     def __init__(self) -> None:
-        GameUserScene._instance = self
-
-        self.conf = JsonReader.load(GameUserScene.CONFIG_FILE)
+        super().__init__()
 
         self.sceneMgr = None
         self.logic: GameUserLogic = GameUserLogic.getInstance()
 
+        self.buildWidgets()
+        self.init()
+
+        ConfigStore.getInstance().watch(GameUserScene.CONFIG_FILE, self.onConfigReload)
+
+    def buildWidgets(self) -> None:
+        self.conf = ConfigStore.getInstance().load(GameUserScene.CONFIG_FILE, GameUserScene.WIDGET_SCHEMAS)
+
         self.titleLabel: Label = Label(conf=self.conf["titleLabel"])
         self.questionLabel: Label = Label(conf=self.conf["questionLabel"])
         self.answerLabel: Label = Label(conf=self.conf["answerLabel"])
         self.lowBtn: Button = Button(conf=self.conf["lowBtn"])
         self.highBtn: Button = Button(conf=self.conf["highBtn"])
         self.correctBtn: Button = Button(conf=self.conf["correctBtn"])
+        self.historyList: ListView = ListView(conf=self.conf["historyList"], formatter=formatGuess)
 
-        self.init()
-        
     def init(self) -> None:
         self.sceneMgr = SceneManager.getInstance()
 
@@ -141,26 +181,26 @@ class GameUserScene(Scene):
 
         self.logic.start()
 
-        self.logger.info("GameUserScene.onEnter. isValid={} guessNumber={}".format(self.logic.getGuessNumber(), self.logic.isValid))
+        GameUserScene.logger.info("GameUserScene.onEnter. isValid=%s guessNumber=%s", self.logic.isValid, self.logic.getGuessNumber())
 
-        self.questionLabel.setText("Think of some number between {} and {}".format(GameUserLogic.MIN_RAND, GameUserLogic.MAX_RAND))
+        self.questionLabel.setText("Think of some number between {} and {}".format(self.logic.minRand, self.logic.maxRand))
 
-    def draw(self, screen: pygame.surface.Surface) -> None:
-        screen.fill(constants.BACKGROUND_COLOR)
+        if constants.SCENE_PRELOADING: ScenePreloader.getInstance().request(__name__, "EndScene", GameMode.USER_HOST)
 
-        self.titleLabel.draw(screen)
+    def input(self, event: pygame.event.Event) -> None:
+        if event.type == pygame.MOUSEWHEEL:
+            self.historyList.onMouseWheel(event.y)
 
-        self.questionLabel.draw(screen)
+    def update(self) -> None:
+        super().update()
 
         self.answerLabel.setText("Is {} your number?".format(self.logic.getGuessNumber()))
-        self.answerLabel.draw(screen)
-
-        self.lowBtn.draw(screen)
-        self.highBtn.draw(screen)
-        self.correctBtn.draw(screen)
 
+    def getWidgets(self) -> typing.List[Widget]:
+        return [self.titleLabel, self.questionLabel, self.answerLabel, self.lowBtn, self.highBtn, self.correctBtn, self.historyList]
 
     def onLowClick(self) -> None:
+        self.historyList.append(self.logic.getGuessNumber(), CHECK_RESULT_CODES[CheckResult.LESS_THAN])
         self.logic.updateUpper()
 
         isValid: bool = self.logic.guess()
@@ -170,6 +210,7 @@ class GameUserScene(Scene):
             return
 
     def onHighClick(self) -> None:
+        self.historyList.append(self.logic.getGuessNumber(), CHECK_RESULT_CODES[CheckResult.GREATER_THAN])
         self.logic.updateLower()
 
         isValid: bool = self.logic.guess()
@@ -185,33 +226,39 @@ class GameUserScene(Scene):
     def clear(self) -> None:
         self.questionLabel.clearText()
         self.answerLabel.clearText()
+        self.historyList.clear()
 
     @staticmethod
     def getInstance() -> "GameUserScene":
-        if GameUserScene._instance is None:
-            GameUserScene()
-        return GameUserScene._instance
+        return SceneRegistry.getInstance().get(GameUserScene)
 
 
 class EndScene(Scene):
     CONFIG_FILE = "conf/game/EndScene.json"
-
-    _instance = {}
+    WIDGET_SCHEMAS = {
+        "messageLabel": Label.SCHEMA,
+        "returnBtn": Button.SCHEMA
+    }
+    STATIC_WIDGETS = ["messageLabel", "returnBtn"]
 
     def __init__(self, mode: GameMode) -> None:
-        EndScene._instance[mode] = self
-
-        self.conf = JsonReader.load(EndScene.CONFIG_FILE)
+        super().__init__()
 
         self.mode = mode
         self.logic: GameBotLogic | GameUserLogic = GameBotLogic.getInstance() if mode == GameMode.BOT_HOST else GameUserLogic.getInstance()
         self.sceneMgr = None
 
+        self.buildWidgets()
+        self.init()
+
+        ConfigStore.getInstance().watch(EndScene.CONFIG_FILE, self.onConfigReload)
+
+    def buildWidgets(self) -> None:
+        self.conf = ConfigStore.getInstance().load(EndScene.CONFIG_FILE, EndScene.WIDGET_SCHEMAS)
+
         self.messageLabel: Label = Label(conf=self.conf["messageLabel"])
         self.returnBtn: Button = Button(conf=self.conf["returnBtn"])
 
-        self.init()
-
     def init(self) -> None:
         self.sceneMgr = SceneManager.getInstance()
         self.returnBtn.addEventListener(MouseEvent.ON_TOUCH_END, self.onReturnClick)
@@ -223,19 +270,24 @@ class EndScene(Scene):
             message = "Your number is {}".format(self.logic.getGuessNumber()) if self.logic.isValid else "You tricked me. I'm not playing"
             self.messageLabel.setText(message)
 
-    def draw(self, screen: pygame.surface.Surface) -> None:
-        screen.fill(constants.BACKGROUND_COLOR)
+        self.recordResult()
+
+    def recordResult(self) -> None:
+        resultsStore = ResultsStore.getInstance()
+        if resultsStore is None: return
+
+        if self.mode == GameMode.BOT_HOST:
+            resultsStore.append(self.mode.value, self.logic.getCount(), self.logic.secretNumber, True)
+        else:
+            resultsStore.append(self.mode.value, self.logic.getCount(), self.logic.getGuessNumber(), self.logic.isValid)
 
-        self.messageLabel.draw(screen)
-        self.returnBtn.draw(screen)
+    def getWidgets(self) -> typing.List[Widget]:
+        return [self.messageLabel, self.returnBtn]
 
     def onReturnClick(self):
         from modules.lobby.scenes import StartScene
-        self.sceneMgr.clear()
-        self.sceneMgr.push(StartScene.getInstance())
+        self.sceneMgr.popTo(StartScene.getInstance())
 
     @staticmethod
-    def getInstance(mode: GameMode):
-        if mode not in EndScene._instance:
-            EndScene(mode)
-        return EndScene._instance[mode]
\ No newline at end of file
+    def getInstance(mode: GameMode) -> "EndScene":
+        return SceneRegistry.getInstance().get(EndScene, mode)
\ No newline at end of file
@@ -0,0 +1,202 @@
+import argparse
+import time
+
+import numpy as np
+
+from modules.game.logic import CheckResult, GameBotLogic, GameUserLogic
+from modules.game.random_stream import (GOLDEN_GAMMA, MASK_64, MAX_DRAW_RANGE, MIX_MULTIPLIER_1, MIX_MULTIPLIER_2,
+    CounterRandom, Stream, streamKey)
+from modules.game.strategies import STRATEGIES, BisectionStrategy, GuessStrategy, RandomStrategy
+from utils.logger import Logger, setLevel as setLogLevel
+
+def mix64Array(values: np.ndarray) -> np.ndarray:
+    """
+    SplitMix64 finalizer over uint64 arrays, wraps around like random_stream.mix64
+    """
+    values = values + np.uint64(GOLDEN_GAMMA)
+    values = (values ^ (values >> np.uint64(30))) * np.uint64(MIX_MULTIPLIER_1)
+    values = (values ^ (values >> np.uint64(27))) * np.uint64(MIX_MULTIPLIER_2)
+    return values ^ (values >> np.uint64(31))
+
+def drawBoundedArray(gameKeys: np.ndarray, draw: int, sizes: int | np.ndarray) -> np.ndarray:
+    values = mix64Array(gameKeys + np.uint64((draw * GOLDEN_GAMMA) & MASK_64))
+    return ((values >> np.uint64(32)) * np.asarray(sizes, dtype=np.uint64)) >> np.uint64(32)
+
+
+class SimulationResult:
+    def __init__(self, histogram: np.ndarray = None) -> None:
+        self.histogram: np.ndarray = np.zeros(1, dtype=np.int64) if histogram is None else histogram
+
+    def merge(self, other: "SimulationResult") -> None:
+        if len(other.histogram) > len(self.histogram):
+            self.histogram = np.pad(self.histogram, (0, len(other.histogram) - len(self.histogram)))
+        self.histogram[:len(other.histogram)] += other.histogram
+
+    def getNumGames(self) -> int:
+        return int(self.histogram.sum())
+
+    def getDistribution(self) -> np.ndarray:
+        """
+        Probability of a game taking exactly i guesses, indexed by i
+        """
+        return self.histogram / max(1, self.getNumGames())
+
+    def getMean(self) -> float:
+        return float(np.dot(np.arange(len(self.histogram)), self.histogram) / max(1, self.getNumGames()))
+
+    def getVariance(self) -> float:
+        counts = np.arange(len(self.histogram))
+        mean = self.getMean()
+        return float(np.dot((counts - mean) ** 2, self.histogram) / max(1, self.getNumGames()))
+
+    def getPercentile(self, percentile: float) -> int:
+        cumulative = np.cumsum(self.histogram)
+        return int(np.searchsorted(cumulative, cumulative[-1] * percentile / 100.0))
+
+    def getWorstCase(self) -> int:
+        return int(np.flatnonzero(self.histogram)[-1]) if self.getNumGames() > 0 else 0
+
+
+class BatchSimulator:
+    """
+    Plays many independent bot hosted games at once, the guesser follows GameUserLogic inside the bot hints
+    with a random or bisection strategy.
+    Game i always draws the same numbers for a given seed whatever the batch it runs in,
+    so runScalar(i) replays it with GameBotLogic and GameUserLogic and returns the same count
+    """
+    DEFAULT_SEED = 0
+    DEFAULT_BATCH_SIZE = 1 << 18
+    DEFAULT_MAX_ROUNDS = 1 << 16
+
+    logger = Logger(__name__).getInstance()
+
+    def __init__(self, seed: int = DEFAULT_SEED, minRand: int = GameBotLogic.MIN_RAND, maxRand: int = GameBotLogic.MAX_RAND,
+            hintMinDistance: int = GameBotLogic.HINT_MIN_DISTANCE, hintMaxDistance: int = GameBotLogic.HINT_MAX_DISTANCE,
+            maxRounds: int = DEFAULT_MAX_ROUNDS, strategy: GuessStrategy = None) -> None:
+        self.strategy: GuessStrategy = RandomStrategy() if strategy is None else strategy
+        if type(self.strategy) not in (RandomStrategy, BisectionStrategy):
+            raise ValueError("BatchSimulator. no batch version of {}".format(type(self.strategy).__name__))
+        if maxRand - minRand + 1 > MAX_DRAW_RANGE or hintMaxDistance - hintMinDistance + 1 > MAX_DRAW_RANGE:
+            raise ValueError("BatchSimulator. secret and hint ranges are limited to {} values, the batch draws keep 32 bits".format(MAX_DRAW_RANGE))
+
+        self.seed = seed
+        self.minRand = minRand
+        self.maxRand = maxRand
+        self.hintMinDistance = hintMinDistance
+        self.hintMaxDistance = hintMaxDistance
+        self.maxRounds = maxRounds
+
+        self.hostKey = np.uint64(streamKey(seed, Stream.HOST))
+        self.guesserKey = np.uint64(streamKey(seed, Stream.GUESSER))
+
+    def run(self, numGames: int, firstGame: int = 0, batchSize: int = DEFAULT_BATCH_SIZE) -> SimulationResult:
+        result = SimulationResult()
+
+        for batchStart in range(firstGame, firstGame + numGames, batchSize):
+            counts = self.runBatch(batchStart, min(batchSize, firstGame + numGames - batchStart))
+            result.merge(SimulationResult(np.bincount(counts).astype(np.int64)))
+
+        return result
+
+    def runBatch(self, firstGame: int, numGames: int) -> np.ndarray:
+        """
+        Guess count of every game in [firstGame, firstGame + numGames)
+        """
+        games = np.arange(firstGame, firstGame + numGames, dtype=np.uint64) & np.uint64(MASK_64)
+        hostKeys = mix64Array(self.hostKey ^ games)
+        guesserKeys = mix64Array(self.guesserKey ^ games)
+
+        hintSize = self.hintMaxDistance - self.hintMinDistance + 1
+        secrets = self.minRand + drawBoundedArray(hostKeys, 0, self.maxRand - self.minRand + 1).astype(np.int64)
+        lowerBounds = np.maximum(self.minRand, secrets - (self.hintMinDistance + drawBoundedArray(hostKeys, 1, hintSize).astype(np.int64)))
+        upperBounds = np.minimum(self.maxRand, secrets + (self.hintMinDistance + drawBoundedArray(hostKeys, 2, hintSize).astype(np.int64)))
+
+        isBisection = isinstance(self.strategy, BisectionStrategy)
+        counts = np.zeros(numGames, dtype=np.int64)
+        active = np.arange(numGames)
+
+        for roundIndex in range(self.maxRounds):
+            if len(active) == 0: break
+
+            lower = lowerBounds[active]
+            upper = upperBounds[active]
+            secret = secrets[active]
+            if isBisection:
+                guesses = (lower + upper) // 2
+            else:
+                guesses = lower + drawBoundedArray(guesserKeys[active], roundIndex, upper - lower + 1).astype(np.int64)
+
+            isHigher = guesses < secret
+            isLower = guesses > secret
+            lowerBounds[active] = np.where(isHigher, guesses + 1, lower)
+            upperBounds[active] = np.where(isLower, guesses - 1, upper)
+            counts[active] = roundIndex + 1
+
+            active = active[isHigher | isLower]
+
+        if len(active) > 0:
+            BatchSimulator.logger.warning("BatchSimulator.runBatch. %s games hit maxRounds=%s", len(active), self.maxRounds)
+
+        return counts
+
+    def runScalar(self, game: int) -> int:
+        """
+        Play a single game with the scalar logic classes, used to check the batch engine
+        """
+        bot = GameBotLogic(self.minRand, self.maxRand, self.hintMinDistance, self.hintMaxDistance, CounterRandom(self.seed, game, Stream.HOST))
+        user = GameUserLogic(self.minRand, self.maxRand, CounterRandom(self.seed, game, Stream.GUESSER), self.strategy)
+
+        bot.start()
+        user.start(bot.getLowerHint(), bot.getUpperHint())
+
+        while bot.getCount() < self.maxRounds:
+            checkResult = bot.checkAnswer(user.getGuessNumber())
+            if checkResult == CheckResult.EQUAL or checkResult == CheckResult.INVALID:
+                break
+            if checkResult == CheckResult.GREATER_THAN:
+                user.updateLower()
+            else:
+                user.updateUpper()
+            user.guess()
+
+        return bot.getCount()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play many bot hosted games headlessly and print the guess count distribution")
+    parser.add_argument("--games", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=BatchSimulator.DEFAULT_SEED)
+    parser.add_argument("--min", type=int, default=GameBotLogic.MIN_RAND)
+    parser.add_argument("--max", type=int, default=GameBotLogic.MAX_RAND, help="at most {} values from --min".format(MAX_DRAW_RANGE))
+    parser.add_argument("--hint-min", type=int, default=GameBotLogic.HINT_MIN_DISTANCE)
+    parser.add_argument("--hint-max", type=int, default=GameBotLogic.HINT_MAX_DISTANCE)
+    parser.add_argument("--strategy", choices=list(STRATEGIES.keys()), default=RandomStrategy.NAME)
+    parser.add_argument("--batch-size", type=int, default=BatchSimulator.DEFAULT_BATCH_SIZE)
+    parser.add_argument("--verify", type=int, default=0, help="replay the first N games with the scalar classes")
+    parser.add_argument("--log-level", default="WARNING", help="DEBUG traces every guess of the scalar games run by --verify")
+    args = parser.parse_args()
+    setLogLevel(args.log_level)
+
+    try:
+        simulator = BatchSimulator(args.seed, args.min, args.max, args.hint_min, args.hint_max, strategy=STRATEGIES[args.strategy]())
+    except ValueError as e:
+        parser.error(str(e))
+
+    startTime = time.perf_counter()
+    result = simulator.run(args.games, batchSize=args.batch_size)
+    elapsed = time.perf_counter() - startTime
+
+    print("games={} seconds={:.2f} gamesPerMinute={:.0f}".format(result.getNumGames(), elapsed, result.getNumGames() / elapsed * 60))
+    print("mean={:.4f} variance={:.4f} p50={} p90={} p99={} worst={}".format(result.getMean(), result.getVariance(),
+        result.getPercentile(50), result.getPercentile(90), result.getPercentile(99), result.getWorstCase()))
+    for count, numGames in enumerate(result.histogram):
+        if numGames > 0: print("{:4d} {}".format(count, numGames))
+
+    if args.verify > 0:
+        batchCounts = simulator.runBatch(0, args.verify)
+        mismatches = [game for game in range(args.verify) if simulator.runScalar(game) != batchCounts[game]]
+        print("verify games={} mismatches={}".format(args.verify, len(mismatches)))
+
+
+if __name__ == '__main__':
+    main()
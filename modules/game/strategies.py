@@ -0,0 +1,204 @@
+import abc
+import bisect
+import math
+
+from modules.game.random_stream import RandomSource
+
+EULER_GAMMA = 0.5772156649015329
+
+def harmonic(n: int) -> float:
+    if n <= 64:
+        return math.fsum(1.0 / k for k in range(1, n + 1))
+    return math.log(n) + EULER_GAMMA + 1.0 / (2 * n) - 1.0 / (12 * n * n) + 1.0 / (120 * n ** 4)
+
+class GuessStrategy(abc.ABC):
+    """
+    Picks the next guess inside [lowerBound, upperBound], the secret is known to be in this range
+    """
+    NAME = ""
+
+    # Deterministic strategies are evaluated by walking their decision tree up to this many values
+    MAX_EVALUATE_SIZE = 1 << 20
+
+    @abc.abstractmethod
+    def guess(self, lowerBound: int, upperBound: int, rng: RandomSource) -> int:
+        pass
+
+    def getExpectedGuesses(self, lowerBound: int, upperBound: int) -> float:
+        """
+        Mean number of guesses for a secret drawn uniformly from the range
+        """
+        size = self._getSize(lowerBound, upperBound)
+        totalDepth, _ = self._walk(lowerBound, upperBound)
+        return totalDepth / size
+
+    def _getSize(self, lowerBound: int, upperBound: int) -> int:
+        if upperBound < lowerBound:
+            raise ValueError("{}. empty range lowerBound={} upperBound={}".format(type(self).__name__, lowerBound, upperBound))
+        return upperBound - lowerBound + 1
+
+    def getWorstCaseGuesses(self, lowerBound: int, upperBound: int) -> int:
+        self._getSize(lowerBound, upperBound)
+        _, maxDepth = self._walk(lowerBound, upperBound)
+        return maxDepth
+
+    def _walk(self, lowerBound: int, upperBound: int) -> tuple[int, int]:
+        size = upperBound - lowerBound + 1
+        if size > GuessStrategy.MAX_EVALUATE_SIZE:
+            raise ValueError("{}._walk. range too large to evaluate size={}".format(type(self).__name__, size))
+
+        totalDepth = 0
+        maxDepth = 0
+        pending = [(lowerBound, upperBound, 1)]
+        while len(pending) > 0:
+            lower, upper, depth = pending.pop()
+            if lower > upper: continue
+
+            guessNumber = self.guess(lower, upper, None)
+            totalDepth += depth
+            maxDepth = max(maxDepth, depth)
+            pending.append((lower, guessNumber - 1, depth + 1))
+            pending.append((guessNumber + 1, upper, depth + 1))
+
+        return (totalDepth, maxDepth)
+
+class RandomStrategy(GuessStrategy):
+    NAME = "random"
+
+    def guess(self, lowerBound: int, upperBound: int, rng: RandomSource) -> int:
+        return rng.randint(lowerBound, upperBound)
+
+    def getExpectedGuesses(self, lowerBound: int, upperBound: int) -> float:
+        # Mean successful search cost in a random binary search tree
+        size = self._getSize(lowerBound, upperBound)
+        return 2 * (1 + 1 / size) * harmonic(size) - 3
+
+    def getWorstCaseGuesses(self, lowerBound: int, upperBound: int) -> int:
+        return self._getSize(lowerBound, upperBound)
+
+class BisectionStrategy(GuessStrategy):
+    NAME = "bisection"
+
+    def guess(self, lowerBound: int, upperBound: int, rng: RandomSource) -> int:
+        return (lowerBound + upperBound) // 2
+
+    def getExpectedGuesses(self, lowerBound: int, upperBound: int) -> float:
+        # Bisection builds a complete tree: every level but the deepest is full
+        size = self._getSize(lowerBound, upperBound)
+        depth = size.bit_length()
+        totalDepth = (depth - 2) * (1 << (depth - 1)) + 1 + depth * (size - (1 << (depth - 1)) + 1)
+        return totalDepth / size
+
+    def getWorstCaseGuesses(self, lowerBound: int, upperBound: int) -> int:
+        return self._getSize(lowerBound, upperBound).bit_length()
+
+class WeightedMidpointStrategy(GuessStrategy):
+    """
+    Guesses the weighted median of a prior over the remaining range. The prior is a histogram of
+    equal width buckets over [minRand, maxRand], uniform inside each bucket, so a guess costs
+    O(log buckets) whatever the size of the range
+    """
+    NAME = "weighted"
+
+    def __init__(self, weights: list[float], minRand: int, maxRand: int) -> None:
+        if len(weights) == 0 or min(weights) < 0 or sum(weights) <= 0:
+            raise ValueError("WeightedMidpointStrategy. weights must be non negative with a positive sum")
+
+        self.minRand = minRand
+        self.maxRand = maxRand
+        self.weights = list(weights)
+        self.bucketStarts = [minRand + (maxRand - minRand + 1) * i // len(weights) for i in range(len(weights) + 1)]
+        self.prefixWeights = [0.0]
+        for weight in self.weights:
+            self.prefixWeights.append(self.prefixWeights[-1] + weight)
+
+    def guess(self, lowerBound: int, upperBound: int, rng: RandomSource) -> int:
+        lowerBucket = self._getBucket(lowerBound)
+        upperBucket = self._getBucket(upperBound)
+        if lowerBucket == upperBucket:
+            return (lowerBound + upperBound) // 2
+
+        lowerMass = self._getMassBelow(lowerBound)
+        upperMass = self._getMassBelow(upperBound + 1)
+        if upperMass <= lowerMass:
+            return (lowerBound + upperBound) // 2
+
+        target = (lowerMass + upperMass) / 2
+        bucket = min(max(bisect.bisect_right(self.prefixWeights, target) - 1, lowerBucket), upperBucket)
+        bucketSize = self.bucketStarts[bucket + 1] - self.bucketStarts[bucket]
+        offset = 0
+        if self.weights[bucket] > 0:
+            offset = int((target - self.prefixWeights[bucket]) / self.weights[bucket] * bucketSize)
+
+        return min(max(self.bucketStarts[bucket] + offset, lowerBound), upperBound)
+
+    def _getBucket(self, value: int) -> int:
+        return min(max(bisect.bisect_right(self.bucketStarts, value) - 1, 0), len(self.weights) - 1)
+
+    def _getMassBelow(self, value: int) -> float:
+        if value <= self.minRand: return 0.0
+        if value > self.maxRand: return self.prefixWeights[-1]
+
+        bucket = self._getBucket(value)
+        bucketSize = self.bucketStarts[bucket + 1] - self.bucketStarts[bucket]
+        return self.prefixWeights[bucket] + self.weights[bucket] * (value - self.bucketStarts[bucket]) / bucketSize
+
+class DecisionTreeStrategy(GuessStrategy):
+    """
+    Precomputes every guess of another deterministic strategy over a fixed range,
+    a guess is then a single table lookup. Ranges outside the table fall back to the base strategy
+    """
+    NAME = "tree"
+
+    def __init__(self, minRand: int, maxRand: int, base: GuessStrategy = None) -> None:
+        self.base = BisectionStrategy() if base is None else base
+        if isinstance(self.base, RandomStrategy):
+            raise ValueError("DecisionTreeStrategy. base strategy must be deterministic")
+
+        self.minRand = minRand
+        self.maxRand = maxRand
+        self.guesses: dict[tuple[int, int], int] = {}
+
+        totalDepth = 0
+        maxDepth = 0
+        pending = [(minRand, maxRand, 1)]
+        if maxRand - minRand + 1 > GuessStrategy.MAX_EVALUATE_SIZE:
+            raise ValueError("DecisionTreeStrategy. range too large size={}".format(maxRand - minRand + 1))
+
+        while len(pending) > 0:
+            lower, upper, depth = pending.pop()
+            if lower > upper: continue
+
+            guessNumber = self.base.guess(lower, upper, None)
+            self.guesses[(lower, upper)] = guessNumber
+            totalDepth += depth
+            maxDepth = max(maxDepth, depth)
+            pending.append((lower, guessNumber - 1, depth + 1))
+            pending.append((guessNumber + 1, upper, depth + 1))
+
+        self.expectedGuesses = totalDepth / (maxRand - minRand + 1)
+        self.worstCaseGuesses = maxDepth
+
+    def guess(self, lowerBound: int, upperBound: int, rng: RandomSource) -> int:
+        guessNumber = self.guesses.get((lowerBound, upperBound))
+        if guessNumber is None:
+            return self.base.guess(lowerBound, upperBound, rng)
+        return guessNumber
+
+    def getExpectedGuesses(self, lowerBound: int, upperBound: int) -> float:
+        if lowerBound == self.minRand and upperBound == self.maxRand:
+            return self.expectedGuesses
+        return super().getExpectedGuesses(lowerBound, upperBound)
+
+    def getWorstCaseGuesses(self, lowerBound: int, upperBound: int) -> int:
+        if lowerBound == self.minRand and upperBound == self.maxRand:
+            return self.worstCaseGuesses
+        return super().getWorstCaseGuesses(lowerBound, upperBound)
+
+# Strategies the command line tools can run by name. The batch simulator, the tournament and the analytics
+# have vectorized versions of these two only, weighted needs a prior and tree a fixed range, both play
+# through GameUserLogic
+STRATEGIES: dict[str, type[GuessStrategy]] = {
+    RandomStrategy.NAME: RandomStrategy,
+    BisectionStrategy.NAME: BisectionStrategy
+}
@@ -0,0 +1,234 @@
+import argparse
+import json
+import os
+import statistics
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+
+from modules.game.logic import GameBotLogic
+from modules.game.random_stream import MAX_DRAW_RANGE
+from modules.game.simulator import BatchSimulator, SimulationResult
+from modules.game.strategies import STRATEGIES, RandomStrategy
+from utils.logger import Logger, setLevel as setLogLevel
+
+class Entrant:
+    """
+    A guesser strategy playing against a host setup, written strategy:min:max:hintMin:hintMax,
+    the host fields can be left out to keep the GameBotLogic defaults
+    """
+    def __init__(self, strategy: str, minRand: int = GameBotLogic.MIN_RAND, maxRand: int = GameBotLogic.MAX_RAND,
+            hintMinDistance: int = GameBotLogic.HINT_MIN_DISTANCE, hintMaxDistance: int = GameBotLogic.HINT_MAX_DISTANCE) -> None:
+        if strategy not in STRATEGIES:
+            raise ValueError("Entrant. unknown strategy={}".format(strategy))
+        if maxRand - minRand + 1 > MAX_DRAW_RANGE or hintMaxDistance - hintMinDistance + 1 > MAX_DRAW_RANGE:
+            raise ValueError("Entrant. secret and hint ranges are limited to {} values".format(MAX_DRAW_RANGE))
+
+        self.strategy = strategy
+        self.minRand = minRand
+        self.maxRand = maxRand
+        self.hintMinDistance = hintMinDistance
+        self.hintMaxDistance = hintMaxDistance
+
+    def getName(self) -> str:
+        return "{}:{}:{}:{}:{}".format(self.strategy, self.minRand, self.maxRand, self.hintMinDistance, self.hintMaxDistance)
+
+    def createSimulator(self, seed: int) -> BatchSimulator:
+        return BatchSimulator(seed, self.minRand, self.maxRand, self.hintMinDistance, self.hintMaxDistance, strategy=STRATEGIES[self.strategy]())
+
+    @staticmethod
+    def parse(text: str) -> "Entrant":
+        fields = text.split(":")
+        if len(fields) not in (1, 3, 5):
+            raise ValueError("Entrant.parse. expected strategy[:min:max[:hintMin:hintMax]] got={}".format(text))
+        return Entrant(fields[0], *[int(field) for field in fields[1:]])
+
+def runShard(seed: int, entrantNames: list[str], firstGame: int, numGames: int) -> dict:
+    """
+    Play games [firstGame, firstGame + numGames) for every entrant. Entrants play the same game indices with the
+    same seed, so entrants sharing a host setup face the same secrets and hints and are compared game by game
+    """
+    counts = [Entrant.parse(name).createSimulator(seed).runBatch(firstGame, numGames) for name in entrantNames]
+    differences = [count - counts[0] for count in counts]
+    return {
+        "firstGame": firstGame,
+        "histograms": [np.bincount(count).tolist() for count in counts],
+        "differenceSums": [int(difference.sum()) for difference in differences],
+        "differenceSquareSums": [int(np.dot(difference, difference)) for difference in differences]
+    }
+
+
+class TournamentResult:
+    """
+    Per entrant guess count histograms, plus sums of the game by game difference to the first entrant.
+    Everything is an integer sum, so the totals do not depend on the order the shards finish in
+    """
+    def __init__(self, numEntrants: int) -> None:
+        self.results = [SimulationResult() for _ in range(numEntrants)]
+        self.differenceSums = [0] * numEntrants
+        self.differenceSquareSums = [0] * numEntrants
+        self.completedShards: set[int] = set()
+
+    def merge(self, shard: dict) -> None:
+        for index, histogram in enumerate(shard["histograms"]):
+            self.results[index].merge(SimulationResult(np.array(histogram, dtype=np.int64)))
+            self.differenceSums[index] += shard["differenceSums"][index]
+            self.differenceSquareSums[index] += shard["differenceSquareSums"][index]
+        self.completedShards.add(shard["firstGame"])
+
+    def getMeanInterval(self, index: int, z: float) -> tuple[float, float]:
+        result = self.results[index]
+        return (result.getMean(), z * (result.getVariance() / max(1, result.getNumGames())) ** 0.5)
+
+    def getDifferenceInterval(self, index: int, z: float) -> tuple[float, float]:
+        """
+        Mean extra guesses over the first entrant and the half width of its confidence interval
+        """
+        numGames = max(1, self.results[index].getNumGames())
+        mean = self.differenceSums[index] / numGames
+        variance = max(0.0, self.differenceSquareSums[index] / numGames - mean * mean)
+        return (mean, z * (variance / numGames) ** 0.5)
+
+    def toDict(self) -> dict:
+        return {
+            "histograms": [result.histogram.tolist() for result in self.results],
+            "differenceSums": self.differenceSums,
+            "differenceSquareSums": self.differenceSquareSums,
+            "completedShards": sorted(self.completedShards)
+        }
+
+    @staticmethod
+    def fromDict(data: dict) -> "TournamentResult":
+        result = TournamentResult(len(data["histograms"]))
+        result.results = [SimulationResult(np.array(histogram, dtype=np.int64)) for histogram in data["histograms"]]
+        result.differenceSums = list(data["differenceSums"])
+        result.differenceSquareSums = list(data["differenceSquareSums"])
+        result.completedShards = set(data["completedShards"])
+        return result
+
+
+class Tournament:
+    """
+    Splits the games into fixed shards of consecutive game indices and runs them on a process pool.
+    A shard always plays the same games whatever worker runs it, so the result of a seed does not depend
+    on the worker count. Finished shards are saved to the checkpoint, a rerun with the same settings skips them
+    """
+    DEFAULT_SEED = 0
+    DEFAULT_SHARD_SIZE = 1 << 18
+    DEFAULT_CHECKPOINT_INTERVAL = 10.0
+
+    logger = Logger(__name__).getInstance()
+
+    def __init__(self, entrants: list[Entrant], numGames: int, seed: int = DEFAULT_SEED, shardSize: int = DEFAULT_SHARD_SIZE,
+            workers: int = None, checkpointPath: str = None, checkpointInterval: float = DEFAULT_CHECKPOINT_INTERVAL) -> None:
+        if len(entrants) == 0:
+            raise ValueError("Tournament. no entrants")
+
+        self.entrants = entrants
+        self.numGames = numGames
+        self.seed = seed
+        self.shardSize = shardSize
+        self.workers = os.cpu_count() if workers is None else workers
+        self.checkpointPath = checkpointPath
+        self.checkpointInterval = checkpointInterval
+
+        self.result = self._loadCheckpoint()
+
+    def getSettings(self) -> dict:
+        return {
+            "entrants": [entrant.getName() for entrant in self.entrants],
+            "numGames": self.numGames,
+            "seed": self.seed,
+            "shardSize": self.shardSize
+        }
+
+    def run(self) -> TournamentResult:
+        entrantNames = [entrant.getName() for entrant in self.entrants]
+        pending = [firstGame for firstGame in range(0, self.numGames, self.shardSize) if firstGame not in self.result.completedShards]
+        if len(self.result.completedShards) > 0:
+            Tournament.logger.info("Tournament.run. resuming completed=%s pending=%s", len(self.result.completedShards), len(pending))
+
+        lastCheckpoint = time.perf_counter()
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                # Keep a couple of shards per worker in flight so finished ones are merged while the rest run
+                shards = iter(pending)
+                futures = set()
+                while True:
+                    while len(futures) < 2 * self.workers:
+                        firstGame = next(shards, None)
+                        if firstGame is None: break
+                        futures.add(executor.submit(runShard, self.seed, entrantNames, firstGame, min(self.shardSize, self.numGames - firstGame)))
+                    if len(futures) == 0: break
+
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self.result.merge(future.result())
+
+                    if time.perf_counter() - lastCheckpoint >= self.checkpointInterval:
+                        self._saveCheckpoint()
+                        lastCheckpoint = time.perf_counter()
+        finally:
+            # An interrupted run keeps the shards merged so far
+            self._saveCheckpoint()
+
+        return self.result
+
+    def _loadCheckpoint(self) -> TournamentResult:
+        if self.checkpointPath is None or not os.path.exists(self.checkpointPath):
+            return TournamentResult(len(self.entrants))
+
+        with open(self.checkpointPath) as f:
+            data = json.load(f)
+        if data["settings"] != self.getSettings():
+            raise ValueError("Tournament._loadCheckpoint. {} was written with other settings".format(self.checkpointPath))
+        return TournamentResult.fromDict(data["result"])
+
+    def _saveCheckpoint(self) -> None:
+        if self.checkpointPath is None: return
+
+        # Written aside then renamed, an interrupted save leaves the previous checkpoint intact
+        tempPath = self.checkpointPath + ".tmp"
+        with open(tempPath, "w") as f:
+            json.dump({"settings": self.getSettings(), "result": self.result.toDict()}, f)
+        os.replace(tempPath, self.checkpointPath)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play strategies and host setups against each other on all cores")
+    parser.add_argument("--entrant", action="append", default=None,
+        help="strategy[:min:max[:hintMin:hintMax]], repeat for each entrant, the first one is the baseline. "
+        "Ranges are limited to 2^32 values")
+    parser.add_argument("--games", type=int, default=10000000)
+    parser.add_argument("--seed", type=int, default=Tournament.DEFAULT_SEED)
+    parser.add_argument("--shard-size", type=int, default=Tournament.DEFAULT_SHARD_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--checkpoint", metavar="PATH", help="save progress here and resume from it")
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--log-level", default="WARNING", help="INFO also reports resuming from a checkpoint")
+    args = parser.parse_args()
+    setLogLevel(args.log_level)
+
+    try:
+        entrants = [Entrant.parse(text) for text in (args.entrant or [RandomStrategy.NAME, "bisection"])]
+    except ValueError as e:
+        parser.error(str(e))
+    tournament = Tournament(entrants, args.games, args.seed, args.shard_size, args.workers, args.checkpoint)
+
+    startTime = time.perf_counter()
+    result = tournament.run()
+    elapsed = time.perf_counter() - startTime
+
+    z = statistics.NormalDist().inv_cdf(0.5 + args.confidence / 2)
+    print("games={} workers={} seconds={:.2f} confidence={}".format(args.games, tournament.workers, elapsed, args.confidence))
+    for index, entrant in enumerate(entrants):
+        mean, halfWidth = result.getMeanInterval(index, z)
+        difference, differenceHalfWidth = result.getDifferenceInterval(index, z)
+        simulation = result.results[index]
+        print("{:32s} mean={:.4f}±{:.4f} vsBaseline={:+.4f}±{:.4f} p50={} p99={} worst={}".format(entrant.getName(), mean, halfWidth,
+            difference, differenceHalfWidth, simulation.getPercentile(50), simulation.getPercentile(99), simulation.getWorstCase()))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,48 +1,60 @@
+import typing
 import pygame
 from components.button import Button
-from components.scene import Scene, SceneManager
-from modules.game.scenes import GameBotScene, GameUserScene
+from components.preloader import ScenePreloader
+from components.scene import Scene, SceneManager, SceneRegistry
+from components.widget import Widget
 from utils.enum_types import MouseEvent
-from utils.json_reader import JsonReader
+from utils.config import ConfigStore
 import utils.constants as constants
 
 
 class StartScene(Scene):
     CONFIG_FILE = "conf/lobby/StartScene.json"
-
-    _instance = None
+    WIDGET_SCHEMAS = {
+        "startBotHostBtn": Button.SCHEMA,
+        "startUserHostBtn": Button.SCHEMA
+    }
+    STATIC_WIDGETS = ["startBotHostBtn", "startUserHostBtn"]
 
     def __init__(self) -> None:
-        StartScene._instance = self
+        super().__init__()
 
         self.sceneMgr = None
 
-        self.conf = JsonReader.load(StartScene.CONFIG_FILE)
+        self.buildWidgets()
+        self.init()
+
+        ConfigStore.getInstance().watch(StartScene.CONFIG_FILE, self.onConfigReload)
+
+    def buildWidgets(self) -> None:
+        self.conf = ConfigStore.getInstance().load(StartScene.CONFIG_FILE, StartScene.WIDGET_SCHEMAS)
 
         self.startBotHostBtn: Button = Button(conf=self.conf["startBotHostBtn"])
         self.startUserHostBtn: Button = Button(conf=self.conf["startUserHostBtn"])
 
-        self.init()
-
     def init(self) -> None:
         self.sceneMgr = SceneManager.getInstance()
 
         self.startBotHostBtn.addEventListener(MouseEvent.ON_TOUCH_END, self.onStartBotHostClick)
         self.startUserHostBtn.addEventListener(MouseEvent.ON_TOUCH_END, self.onStartUserHostClick)
 
-    def draw(self, screen: pygame.surface.Surface) -> None:
-        screen.fill(constants.BACKGROUND_COLOR)
-        self.startBotHostBtn.draw(screen)
-        self.startUserHostBtn.draw(screen)
+    def onEnter(self) -> None:
+        if constants.SCENE_PRELOADING:
+            ScenePreloader.getInstance().request("modules.game.scenes", "GameBotScene")
+            ScenePreloader.getInstance().request("modules.game.scenes", "GameUserScene")
+
+    def getWidgets(self) -> typing.List[Widget]:
+        return [self.startBotHostBtn, self.startUserHostBtn]
 
     def onStartBotHostClick(self):
+        from modules.game.scenes import GameBotScene
         self.sceneMgr.push(GameBotScene.getInstance())
 
     def onStartUserHostClick(self):
+        from modules.game.scenes import GameUserScene
         self.sceneMgr.push(GameUserScene.getInstance())
 
     @staticmethod
-    def getInstance():
-        if (StartScene._instance == None):
-            StartScene()
-        return StartScene._instance
\ No newline at end of file
+    def getInstance() -> "StartScene":
+        return SceneRegistry.getInstance().get(StartScene)
\ No newline at end of file
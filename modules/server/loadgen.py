@@ -0,0 +1,161 @@
+import argparse
+import asyncio
+import collections
+import time
+
+from modules.game.logic import CheckResult
+from modules.server.server import Command, GameServer, Reply
+from utils.logger import setLevel as setLogLevel
+
+class GameClient:
+    """
+    One connection shared by many sessions. Requests are pipelined, replies come back in request order
+    """
+    def __init__(self) -> None:
+        self.reader: asyncio.StreamReader = None
+        self.writer: asyncio.StreamWriter = None
+        self.pending: collections.deque[asyncio.Future] = collections.deque()
+        self.readTask: asyncio.Task = None
+
+    async def connect(self, host: str, port: int) -> None:
+        self.reader, self.writer = await asyncio.open_connection(host, port)
+        self.readTask = asyncio.create_task(self._readLoop())
+
+    async def close(self) -> None:
+        self.writer.close()
+        await self.writer.wait_closed()
+        if self.readTask is not None:
+            await self.readTask
+
+    def request(self, line: str) -> asyncio.Future:
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append(future)
+        self.writer.write(line.encode())
+        return future
+
+    async def _readLoop(self) -> None:
+        while True:
+            line = await self.reader.readline()
+            if not line: break
+
+            future = self.pending.popleft()
+            if not future.done(): future.set_result(line.decode().split())
+
+        while len(self.pending) > 0:
+            future = self.pending.popleft()
+            if not future.done(): future.set_exception(ConnectionError("GameClient. connection closed"))
+
+class LoadReport:
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.guesses = 0
+        self.games = 0
+        self.errors = 0
+        self.elapsed = 0.0
+
+    def getPercentile(self, percentile: float) -> float:
+        if len(self.latencies) == 0: return 0.0
+
+        latencies = sorted(self.latencies)
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percentile / 100.0))]
+
+    def format(self) -> str:
+        return "games={} guesses={} errors={} seconds={:.2f} guessesPerSecond={:.0f} p50={:.3f}ms p99={:.3f}ms".format(
+            self.games, self.guesses, self.errors, self.elapsed, self.guesses / max(self.elapsed, 1e-9),
+            self.getPercentile(50) * 1000, self.getPercentile(99) * 1000)
+
+class LoadGenerator:
+    """
+    Drives many concurrent sessions, each one plays a whole game by bisection inside the hints
+    """
+    DEFAULT_SESSIONS = 10000
+    DEFAULT_CONNECTIONS = 64
+
+    def __init__(self, host: str, port: int, sessions: int = DEFAULT_SESSIONS, connections: int = DEFAULT_CONNECTIONS) -> None:
+        self.host = host
+        self.port = port
+        self.sessions = sessions
+        self.connections = connections
+        self.report = LoadReport()
+
+    async def run(self) -> LoadReport:
+        clients = [GameClient() for _ in range(self.connections)]
+        await asyncio.gather(*[client.connect(self.host, self.port) for client in clients])
+
+        startTime = time.perf_counter()
+        await asyncio.gather(*[self._playSession(clients[i % len(clients)]) for i in range(self.sessions)])
+        self.report.elapsed = time.perf_counter() - startTime
+
+        for client in clients:
+            await client.close()
+
+        return self.report
+
+    async def _timedRequest(self, client: GameClient, line: str) -> list[str]:
+        startTime = time.perf_counter()
+        reply = await client.request(line)
+        self.report.latencies.append(time.perf_counter() - startTime)
+        return reply
+
+    async def _playSession(self, client: GameClient) -> None:
+        reply = await self._timedRequest(client, "{}\n".format(Command.START))
+        if reply[0] != Reply.STARTED:
+            self.report.errors += 1
+            return
+
+        sessionId = int(reply[1])
+        lowerBound = int(reply[2])
+        upperBound = int(reply[3])
+
+        while lowerBound <= upperBound:
+            answer = (lowerBound + upperBound) // 2
+            reply = await self._timedRequest(client, "{} {} {}\n".format(Command.GUESS, sessionId, answer))
+            if reply[0] != Reply.RESULT:
+                self.report.errors += 1
+                return
+
+            self.report.guesses += 1
+            checkResult = CheckResult(reply[2])
+            if checkResult == CheckResult.EQUAL:
+                self.report.games += 1
+                return
+            if checkResult == CheckResult.GREATER_THAN:
+                lowerBound = answer + 1
+            elif checkResult == CheckResult.LESS_THAN:
+                upperBound = answer - 1
+            else:
+                self.report.errors += 1
+                return
+
+        self.report.errors += 1
+
+
+async def runLocal(sessions: int, connections: int) -> LoadReport:
+    server = GameServer()
+    port = await server.start(GameServer.DEFAULT_HOST, 0)
+    try:
+        return await LoadGenerator(GameServer.DEFAULT_HOST, port, sessions, connections).run()
+    finally:
+        await server.close()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Play many concurrent sessions against a GameServer")
+    parser.add_argument("--host", default=GameServer.DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=GameServer.DEFAULT_PORT)
+    parser.add_argument("--sessions", type=int, default=LoadGenerator.DEFAULT_SESSIONS)
+    parser.add_argument("--connections", type=int, default=LoadGenerator.DEFAULT_CONNECTIONS)
+    parser.add_argument("--local", action="store_true", help="start a server in this process on a free port")
+    parser.add_argument("--log-level", default="WARNING", help="INFO also shows where the server started by --local listens")
+    args = parser.parse_args()
+    setLogLevel(args.log_level)
+
+    if args.local:
+        report = asyncio.run(runLocal(args.sessions, args.connections))
+    else:
+        report = asyncio.run(LoadGenerator(args.host, args.port, args.sessions, args.connections).run())
+
+    print(report.format())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+import argparse
+import array
+import asyncio
+import random
+
+from modules.game.logic import CheckResult, GameBotLogic
+from modules.game.random_stream import RandomSource
+from utils.logger import Logger, setLevel as setLogLevel
+
+class Command:
+    START = "START"
+    GUESS = "GUESS"
+    END = "END"
+
+class Reply:
+    STARTED = "STARTED"
+    RESULT = "RESULT"
+    ENDED = "ENDED"
+    ERROR = "ERROR"
+
+class SessionTable:
+    """
+    Bot hosted games stored column wise, one slot per live session. Freed slots are reused
+    """
+    def __init__(self) -> None:
+        self.secrets = array.array("q")
+        self.lowerBounds = array.array("q")
+        self.upperBounds = array.array("q")
+        self.counts = array.array("q")
+
+        self.slots: dict[int, int] = {}
+        self.freeSlots: list[int] = []
+        self.nextSessionId = 1
+
+    def create(self, secretNumber: int, hintLowerBound: int, hintUpperBound: int) -> int:
+        if len(self.freeSlots) > 0:
+            slot = self.freeSlots.pop()
+            self.secrets[slot] = secretNumber
+            self.lowerBounds[slot] = hintLowerBound
+            self.upperBounds[slot] = hintUpperBound
+            self.counts[slot] = 0
+        else:
+            slot = len(self.secrets)
+            self.secrets.append(secretNumber)
+            self.lowerBounds.append(hintLowerBound)
+            self.upperBounds.append(hintUpperBound)
+            self.counts.append(0)
+
+        sessionId = self.nextSessionId
+        self.nextSessionId += 1
+        self.slots[sessionId] = slot
+        return sessionId
+
+    def guess(self, sessionId: int, answer: int) -> tuple[CheckResult, int, int, int]:
+        """
+        Return the check result with the guess count and the hint bounds after the guess
+        """
+        slot = self.slots[sessionId]
+        checkResult, hintLowerBound, hintUpperBound = GameBotLogic.evaluate(answer, self.secrets[slot],
+            self.lowerBounds[slot], self.upperBounds[slot])
+
+        self.counts[slot] += 1
+        self.lowerBounds[slot] = hintLowerBound
+        self.upperBounds[slot] = hintUpperBound
+
+        return (checkResult, self.counts[slot], hintLowerBound, hintUpperBound)
+
+    def remove(self, sessionId: int) -> bool:
+        slot = self.slots.pop(sessionId, None)
+        if slot is None: return False
+
+        self.freeSlots.append(slot)
+        return True
+
+    def has(self, sessionId: int) -> bool:
+        return sessionId in self.slots
+
+    def __len__(self) -> int:
+        return len(self.slots)
+
+class GameServer:
+    """
+    Line protocol, one request per line:
+        START                 -> STARTED <session> <lowerHint> <upperHint>
+        GUESS <session> <n>   -> RESULT <session> <CheckResult value> <count> <lowerHint> <upperHint>
+        END <session>         -> ENDED <session>
+    Anything else gets ERROR <message>. A session ends by itself on an equal result. A line longer than
+    the stream limit gets an ERROR and the connection is closed
+    """
+    DEFAULT_HOST = "127.0.0.1"
+    DEFAULT_PORT = 8765
+    WRITE_HIGH_WATER = 1 << 16
+    CLOSE_TIMEOUT = 5.0
+    MAX_SESSIONS_PER_CONNECTION = 256
+
+    logger = Logger(__name__).getInstance()
+
+    def __init__(self, minRand: int = GameBotLogic.MIN_RAND, maxRand: int = GameBotLogic.MAX_RAND,
+            hintMinDistance: int = GameBotLogic.HINT_MIN_DISTANCE, hintMaxDistance: int = GameBotLogic.HINT_MAX_DISTANCE,
+            rng: RandomSource = None) -> None:
+        self.minRand = minRand
+        self.maxRand = maxRand
+        self.hintMinDistance = hintMinDistance
+        self.hintMaxDistance = hintMaxDistance
+        self.rng: RandomSource = random.Random() if rng is None else rng
+
+        self.sessions = SessionTable()
+        self.server: asyncio.base_events.Server = None
+        self.connectionTasks: set[asyncio.Task] = set()
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> int:
+        self.server = await asyncio.start_server(self.onConnection, host, port)
+        port = self.server.sockets[0].getsockname()[1]
+        GameServer.logger.info("GameServer.start. host=%s port=%s", host, port)
+        return port
+
+    async def close(self) -> None:
+        """
+        Stop accepting clients and give open connections some time to finish on their own
+        """
+        if self.server is None: return
+
+        self.server.close()
+        await self.server.wait_closed()
+
+        if len(self.connectionTasks) > 0:
+            _, pending = await asyncio.wait(self.connectionTasks, timeout=GameServer.CLOSE_TIMEOUT)
+            for task in pending:
+                task.cancel()
+
+    async def serveForever(self) -> None:
+        await self.server.serve_forever()
+
+    async def onConnection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        ownedSessions: set[int] = set()
+        task = asyncio.current_task()
+        self.connectionTasks.add(task)
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line: break
+
+                writer.write(self.handle(line, ownedSessions).encode())
+                if writer.transport.get_write_buffer_size() > GameServer.WRITE_HIGH_WATER:
+                    await writer.drain()
+        except ValueError:
+            # readline gives up on a line over the stream limit, the rest of the stream cannot be framed
+            GameServer.logger.warning("GameServer.onConnection. request line over the stream limit, closing")
+            writer.write("{} request too long\n".format(Reply.ERROR).encode())
+        except ConnectionError:
+            pass
+        finally:
+            for sessionId in ownedSessions:
+                self.sessions.remove(sessionId)
+            self.connectionTasks.discard(task)
+            writer.close()
+
+    def handle(self, line: bytes, ownedSessions: set[int]) -> str:
+        parts = line.split()
+        if len(parts) == 0:
+            return "{} empty request\n".format(Reply.ERROR)
+
+        command = parts[0].decode(errors="replace").upper()
+        try:
+            if command == Command.START and len(parts) == 1:
+                if len(ownedSessions) >= GameServer.MAX_SESSIONS_PER_CONNECTION:
+                    return "{} too many sessions, at most {} per connection\n".format(Reply.ERROR, GameServer.MAX_SESSIONS_PER_CONNECTION)
+
+                secretNumber, hintLowerBound, hintUpperBound = GameBotLogic.deal(self.rng, self.minRand, self.maxRand,
+                    self.hintMinDistance, self.hintMaxDistance)
+                sessionId = self.sessions.create(secretNumber, hintLowerBound, hintUpperBound)
+                ownedSessions.add(sessionId)
+                return "{} {} {} {}\n".format(Reply.STARTED, sessionId, hintLowerBound, hintUpperBound)
+
+            if command == Command.GUESS and len(parts) == 3:
+                sessionId = int(parts[1])
+                if not self._isOwned(sessionId, ownedSessions):
+                    return "{} unknown session {}\n".format(Reply.ERROR, sessionId)
+
+                checkResult, count, hintLowerBound, hintUpperBound = self.sessions.guess(sessionId, int(parts[2]))
+                if checkResult == CheckResult.EQUAL:
+                    self.sessions.remove(sessionId)
+                    ownedSessions.discard(sessionId)
+                return "{} {} {} {} {} {}\n".format(Reply.RESULT, sessionId, checkResult.value, count, hintLowerBound, hintUpperBound)
+
+            if command == Command.END and len(parts) == 2:
+                sessionId = int(parts[1])
+                if not self._isOwned(sessionId, ownedSessions):
+                    return "{} unknown session {}\n".format(Reply.ERROR, sessionId)
+
+                self.sessions.remove(sessionId)
+                ownedSessions.discard(sessionId)
+                return "{} {}\n".format(Reply.ENDED, sessionId)
+        except ValueError:
+            return "{} malformed request\n".format(Reply.ERROR)
+
+        return "{} unknown command\n".format(Reply.ERROR)
+
+    def _isOwned(self, sessionId: int, ownedSessions: set[int]) -> bool:
+        """
+        Sessions of other connections are reported as unknown, ids are sequential and easy to guess
+        """
+        return sessionId in ownedSessions and self.sessions.has(sessionId)
+
+
+async def serve(host: str, port: int, seed: int = None) -> None:
+    server = GameServer(rng=random.Random(seed))
+    await server.start(host, port)
+    await server.serveForever()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Host bot games for many clients")
+    parser.add_argument("--host", default=GameServer.DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=GameServer.DEFAULT_PORT)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--log-level", default="INFO", help="INFO shows the address the server listens on")
+    args = parser.parse_args()
+    setLogLevel(args.log_level)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.seed))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
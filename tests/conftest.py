@@ -0,0 +1,6 @@
+import os
+import sys
+
+# Widgets need a pygame display, tests run headless from any folder
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
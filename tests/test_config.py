@@ -0,0 +1,87 @@
+import json
+import os
+
+import pytest
+
+from components.list_view import ListView
+from utils.config import ConfigError, ConfigField, ConfigSchema, ConfigStore, toColor, toInt, toPositiveInt
+
+class BoxConfig:
+    __slots__ = ("width", "color")
+
+SCHEMA = ConfigSchema(BoxConfig, [
+    ConfigField("width", 10, toPositiveInt),
+    ConfigField("color", (0, 0, 0), toColor)
+])
+
+def writeJson(path: str, data: dict, modifiedTime: float) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f)
+    os.utime(path, (modifiedTime, modifiedTime))
+
+def testDefaultsAreFilledIn() -> None:
+    config = SCHEMA.compile({"width": 4}, "box")
+    assert (config.width, config.color) == (4, (0, 0, 0))
+
+@pytest.mark.parametrize("block, message", [
+    ([1, 2], "box must be an object"),
+    ({"height": 1}, "box unknown keys ['height']"),
+    ({"width": 0}, "box.width invalid value 0"),
+    ({"width": True}, "box.width invalid value True"),
+    ({"color": [0, 0, 256]}, "box.color invalid value")
+])
+def testInvalidBlocksRaise(block, message: str) -> None:
+    with pytest.raises(ConfigError, match=message.replace("[", r"\[").replace("]", r"\]")):
+        SCHEMA.compile(block, "box")
+
+def testToIntRejectsFloats() -> None:
+    with pytest.raises(TypeError):
+        toInt(1.0)
+
+def testWidgetConfRaises() -> None:
+    with pytest.raises(ConfigError):
+        ListView(conf={"rowHeight": 0})
+    with pytest.raises(ValueError):
+        ListView(rowHeight=0)
+
+def testStoreReportsMissingBlockAndFile(tmp_path) -> None:
+    path = str(tmp_path / "scene.json")
+    writeJson(path, {"other": {}}, 1000)
+    store = ConfigStore()
+
+    with pytest.raises(ConfigError, match="missing block box"):
+        store.load(path, {"box": SCHEMA})
+    with pytest.raises(ConfigError, match="cannot be read"):
+        store.load(str(tmp_path / "missing.json"), {"box": SCHEMA})
+
+def testPollKeepsPreviousConfigOnError(tmp_path) -> None:
+    path = str(tmp_path / "scene.json")
+    writeJson(path, {"box": {"width": 3}}, 1000)
+    store = ConfigStore()
+    assert store.load(path, {"box": SCHEMA})["box"].width == 3
+
+    reloads = []
+    store.watch(path, lambda: reloads.append(path))
+    writeJson(path, {"box": {"width": -3}}, 2000)
+    assert store.poll(force=True) == []
+    assert reloads == []
+    assert store.compiledFiles[path][1]["box"].width == 3
+
+    writeJson(path, {"box": {"width": 5}}, 3000)
+    assert store.poll(force=True) == [path]
+    assert reloads == [path]
+    assert store.load(path, {"box": SCHEMA})["box"].width == 5
+
+def testCacheIsUsedUntilFileChanges(tmp_path) -> None:
+    path = str(tmp_path / "scene.json")
+    cacheDir = str(tmp_path / "cache")
+    writeJson(path, {"box": {"width": 7}}, 1000)
+    ConfigStore(cacheDir).load(path, {"box": SCHEMA})
+    assert len(os.listdir(cacheDir)) == 1
+
+    store = ConfigStore(cacheDir)
+    assert store.load(path, {"box": SCHEMA})["box"].width == 7
+    assert store.rawFiles == {}
+
+    writeJson(path, {"box": {"width": 8}}, 2000)
+    assert store.load(path, {"box": SCHEMA})["box"].width == 8
@@ -0,0 +1,102 @@
+import os
+
+import numpy as np
+import pytest
+
+from modules.game.results_store import HEADER, RECORD_DTYPE, ResultsStore
+
+NUM_RECORDS = 2 * ResultsStore.BLOCK_RECORDS + 1000
+
+def makeRows(numRows: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    rows = np.zeros(numRows, dtype=RECORD_DTYPE)
+    rows["timestamp"] = np.arange(numRows, dtype=np.int64) * 10
+    rows["mode"] = rng.integers(0, 2, numRows)
+    rows["tries"] = rng.integers(1, 300, numRows)
+    rows["number"] = rng.integers(0, 1001, numRows)
+    rows["valid"] = rng.random(numRows) < 0.9
+    return rows
+
+def checkQuery(store: ResultsStore, rows: np.ndarray, mode: int, startTime: int, endTime: int) -> None:
+    selected = rows[(rows["timestamp"] >= startTime) & (rows["timestamp"] < endTime)]
+    if mode is not None: selected = selected[selected["mode"] == mode]
+
+    summary = store.query(mode, startTime, endTime)
+    assert summary.getGames() == len(selected)
+    assert summary.valid == np.count_nonzero(selected["valid"])
+    assert summary.triesSum == int(selected["tries"].sum())
+    assert summary.histogram.tolist() == np.bincount(np.minimum(selected["tries"], ResultsStore.HISTOGRAM_SIZE - 1),
+        minlength=ResultsStore.HISTOGRAM_SIZE).tolist()
+
+@pytest.fixture
+def path(tmp_path) -> str:
+    return str(tmp_path / "results.log")
+
+def testQueryMatchesRecords(path: str) -> None:
+    rows = makeRows(NUM_RECORDS)
+    store = ResultsStore(path)
+    store.write(rows)
+
+    lastTime = int(rows["timestamp"][-1]) + 1
+    for mode in (None, 0, 1, 3):
+        for startTime, endTime in ((None, None), (0, lastTime), (5, lastTime - 5), (123455, 700005), (10, 10)):
+            checkQuery(store, rows, mode, 0 if startTime is None else startTime, lastTime if endTime is None else endTime)
+    store.stop()
+
+def testReopenKeepsRecordsAndIndex(path: str) -> None:
+    rows = makeRows(NUM_RECORDS, seed=1)
+    store = ResultsStore(path)
+    store.write(rows)
+    store.stop()
+
+    store = ResultsStore(path)
+    assert store.getRecordCount() == NUM_RECORDS
+    checkQuery(store, rows, None, 0, int(rows["timestamp"][-1]) + 1)
+    checkQuery(store, rows, 1, 1000, 900000)
+    store.stop()
+
+def testReopenRebuildsLostIndex(path: str) -> None:
+    rows = makeRows(NUM_RECORDS, seed=2)
+    store = ResultsStore(path)
+    store.write(rows)
+    store.stop()
+    os.remove(path + ".idx")
+
+    store = ResultsStore(path)
+    assert os.path.getsize(path + ".idx") == 2 * ResultsStore.BLOCK_DTYPE.itemsize
+    checkQuery(store, rows, 0, 0, int(rows["timestamp"][-1]) + 1)
+    store.stop()
+
+def testReopenDropsPartialRecord(path: str) -> None:
+    store = ResultsStore(path)
+    store.write(makeRows(10))
+    store.stop()
+    with open(path, "ab") as f:
+        f.write(b"\0" * 5)
+
+    store = ResultsStore(path)
+    assert store.getRecordCount() == 10
+    assert os.path.getsize(path) == HEADER.size + 10 * RECORD_DTYPE.itemsize
+    store.stop()
+
+def testAppendIsWrittenByThread(path: str) -> None:
+    store = ResultsStore(path, batchSize=4)
+    store.start()
+    for tries in range(1, 11):
+        store.append(tries % 2, tries, 1 << 70, tries != 3)
+    store.flush()
+
+    summary = store.query()
+    assert (summary.getGames(), summary.valid, summary.triesSum) == (10, 9, 55)
+    assert store.query(1).getGames() == 5
+    store.stop()
+
+    records = np.fromfile(path, dtype=RECORD_DTYPE, offset=HEADER.size)
+    assert np.all(records["number"] == ResultsStore.MAX_NUMBER)
+    assert np.all(np.diff(records["timestamp"]) >= 0)
+
+def testAppendRejectsUnknownMode(path: str) -> None:
+    store = ResultsStore(path)
+    with pytest.raises(ValueError):
+        store.append(ResultsStore.MAX_MODES, 1, 1, True)
+    store.stop()
@@ -0,0 +1,130 @@
+import pytest
+
+from components.scene import Scene, SceneManager, SceneRegistry
+
+class RecordingScene(Scene):
+    def __init__(self, name: str, events: list) -> None:
+        super().__init__()
+        self.name = name
+        self.events = events
+    def onEnter(self) -> None:
+        self.events.append("enter " + self.name)
+    def onExit(self) -> None:
+        self.events.append("exit " + self.name)
+
+class NamedScene(Scene):
+    def __init__(self, name: str) -> None:
+        super().__init__()
+        self.name = name
+        self.isReleased = False
+    def release(self) -> None:
+        super().release()
+        self.isReleased = True
+
+@pytest.fixture
+def sceneMgr():
+    sceneMgr = SceneManager(maxDepth=3)
+    yield sceneMgr
+    SceneManager._instance = None
+
+@pytest.fixture
+def events() -> list:
+    return []
+
+def makeScenes(events: list, names: str) -> list[RecordingScene]:
+    return [RecordingScene(name, events) for name in names]
+
+def testPushAndPopExitBeforeEnter(sceneMgr: SceneManager, events: list) -> None:
+    a, b = makeScenes(events, "ab")
+    sceneMgr.push(a)
+    sceneMgr.push(b)
+    assert sceneMgr.pop() is b
+    assert sceneMgr.getTop() is a
+    assert events == ["enter a", "exit a", "enter b", "exit b", "enter a"]
+
+def testPopEmptiesStack(sceneMgr: SceneManager, events: list) -> None:
+    a, = makeScenes(events, "a")
+    sceneMgr.push(a)
+    assert sceneMgr.pop() is a
+    assert sceneMgr.pop() is None
+    assert sceneMgr.isEmpty()
+    assert events == ["enter a", "exit a"]
+
+def testReplace(sceneMgr: SceneManager, events: list) -> None:
+    a, b, c = makeScenes(events, "abc")
+    sceneMgr.push(a)
+    sceneMgr.push(b)
+    assert sceneMgr.replace(c) is b
+    assert sceneMgr.scenes == [a, c]
+    assert events[-2:] == ["exit b", "enter c"]
+
+def testPopToRemovesScenesAbove(sceneMgr: SceneManager, events: list) -> None:
+    a, b, c = makeScenes(events, "abc")
+    for scene in (a, b, c):
+        sceneMgr.push(scene)
+    del events[:]
+
+    sceneMgr.popTo(a)
+    assert sceneMgr.scenes == [a]
+    assert events == ["exit c", "enter a"]
+
+    sceneMgr.popTo(a)
+    assert events == ["exit c", "enter a"]
+
+def testPopToUnknownSceneClearsStack(sceneMgr: SceneManager, events: list) -> None:
+    a, b, c = makeScenes(events, "abc")
+    sceneMgr.push(a)
+    sceneMgr.push(b)
+    del events[:]
+
+    sceneMgr.popTo(c)
+    assert sceneMgr.scenes == [c]
+    assert events == ["exit b", "enter c"]
+
+def testPushPastMaxDepthDropsOldest(sceneMgr: SceneManager, events: list) -> None:
+    scenes = makeScenes(events, "abcd")
+    for scene in scenes:
+        sceneMgr.push(scene)
+
+    assert sceneMgr.scenes == scenes[1:]
+    assert events.count("exit a") == 1
+    assert sceneMgr.pop() is scenes[3]
+    assert sceneMgr.getTop() is scenes[2]
+
+def testRegistryBuildsOnce(sceneMgr: SceneManager) -> None:
+    registry = SceneRegistry(capacity=2)
+    a = registry.get(NamedScene, "a")
+    assert registry.get(NamedScene, "a") is a
+    assert registry.has(NamedScene, "a")
+    assert registry.getStats() == {"scenes": 1, "builds": 1, "evictions": 0}
+
+def testRegistryEvictsLeastRecentlyUsed(sceneMgr: SceneManager) -> None:
+    registry = SceneRegistry(capacity=2)
+    a = registry.get(NamedScene, "a")
+    b = registry.get(NamedScene, "b")
+    registry.get(NamedScene, "a")
+    registry.get(NamedScene, "c")
+
+    assert not registry.has(NamedScene, "b")
+    assert registry.has(NamedScene, "a")
+    assert b.isReleased and not a.isReleased
+    assert registry.get(NamedScene, "b") is not b
+    assert registry.getStats()["builds"] == 4
+
+def testRegistryKeepsScenesOnStack(sceneMgr: SceneManager) -> None:
+    registry = SceneRegistry(capacity=1)
+    a = registry.get(NamedScene, "a")
+    sceneMgr.push(a)
+    b = registry.get(NamedScene, "b")
+    sceneMgr.push(b)
+
+    # The stack already fills the registry, the new scene is still handed out unreleased
+    c = registry.get(NamedScene, "c")
+    assert registry.has(NamedScene, "a") and registry.has(NamedScene, "b")
+    assert registry.getStats()["scenes"] == 3
+    assert not c.isReleased
+
+    sceneMgr.replace(c)
+    d = registry.get(NamedScene, "d")
+    assert not registry.has(NamedScene, "b")
+    assert b.isReleased and not a.isReleased and not c.isReleased and not d.isReleased
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+
+from modules.game.analytics import DistributionAnalyzer
+from modules.game.random_stream import MAX_DRAW_RANGE, CounterRandom
+from modules.game.simulator import BatchSimulator
+from modules.game.strategies import BisectionStrategy, RandomStrategy
+from modules.game.tournament import Entrant, Tournament
+
+@pytest.mark.parametrize("strategy", [RandomStrategy, BisectionStrategy])
+def testBatchMatchesScalar(strategy) -> None:
+    simulator = BatchSimulator(seed=7, strategy=strategy())
+    batchCounts = simulator.runBatch(0, 300)
+    assert [simulator.runScalar(game) for game in range(300)] == batchCounts.tolist()
+
+def testBatchDoesNotDependOnBatchSize() -> None:
+    simulator = BatchSimulator(seed=3)
+    assert np.array_equal(simulator.run(1000, batchSize=1000).histogram, simulator.run(1000, batchSize=37).histogram)
+
+def testBatchRejectsWideRanges() -> None:
+    with pytest.raises(ValueError):
+        BatchSimulator(minRand=0, maxRand=MAX_DRAW_RANGE)
+
+def testWideRandintStaysInRange() -> None:
+    rng = CounterRandom(1, 2, 3)
+    lower = -(1 << 40)
+    upper = 1 << 62
+    assert all(lower <= rng.randint(lower, upper) <= upper for _ in range(1000))
+
+@pytest.mark.parametrize("strategy", [RandomStrategy, BisectionStrategy])
+@pytest.mark.parametrize("size", [1, 2, 7, 100, 1000])
+def testRangeDistributionMatchesClosedForm(strategy, size: int) -> None:
+    distribution = DistributionAnalyzer(strategy()).getRangeDistribution(1, size)
+    assert distribution.getMean() == pytest.approx(strategy().getExpectedGuesses(1, size), rel=1e-9)
+    assert distribution.getWorstCase() == strategy().getWorstCaseGuesses(1, size)
+
+def testEmptyRangeRaises() -> None:
+    with pytest.raises(ValueError):
+        RandomStrategy().getExpectedGuesses(5, 4)
+    with pytest.raises(ValueError):
+        DistributionAnalyzer().getRangeDistribution(5, 4)
+
+def testTournamentDoesNotDependOnWorkers() -> None:
+    entrants = [Entrant.parse("random"), Entrant.parse("bisection:1:500")]
+    single = Tournament(entrants, 5000, seed=11, shardSize=1000, workers=1).run()
+    parallel = Tournament(entrants, 5000, seed=11, shardSize=1000, workers=3).run()
+    assert single.toDict() == parallel.toDict()
+
+def testTournamentResumesFromCheckpoint(tmp_path) -> None:
+    entrants = [Entrant.parse("random"), Entrant.parse("bisection")]
+    checkpointPath = str(tmp_path / "checkpoint.json")
+    expected = Tournament(entrants, 3000, seed=5, shardSize=1000, workers=1, checkpointPath=checkpointPath).run()
+
+    resumed = Tournament(entrants, 3000, seed=5, shardSize=1000, workers=1, checkpointPath=checkpointPath)
+    assert resumed.result.completedShards == {0, 1000, 2000}
+    assert resumed.run().toDict() == expected.toDict()
+
+def testEntrantRejectsWideRanges() -> None:
+    with pytest.raises(ValueError):
+        Entrant.parse("random:0:{}".format(MAX_DRAW_RANGE))
@@ -0,0 +1,207 @@
+import abc
+import os
+import queue
+import threading
+import typing
+
+import numpy as np
+import pygame
+
+from utils.logger import Logger
+
+class FrameWriter(abc.ABC):
+    """
+    Encodes frames given as (height, width, 3) RGB arrays
+    """
+    def open(self, width: int, height: int, fps: int) -> None:
+        pass
+
+    @abc.abstractmethod
+    def write(self, frame: np.ndarray) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+class PngSequenceWriter(FrameWriter):
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        self.index = 0
+
+    def open(self, width: int, height: int, fps: int) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+
+    def write(self, frame: np.ndarray) -> None:
+        self.index += 1
+        surface = pygame.image.frombuffer(np.ascontiguousarray(frame), (frame.shape[1], frame.shape[0]), "RGB")
+        pygame.image.save(surface, os.path.join(self.directory, "frame_{:06d}.png".format(self.index)))
+
+class RawWriter(FrameWriter):
+    """
+    Headerless rgb24 stream, the size and rate go on the command line of the tool reading it
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.file: typing.BinaryIO = None
+
+    def open(self, width: int, height: int, fps: int) -> None:
+        self.file = open(self.path, "wb")
+
+    def write(self, frame: np.ndarray) -> None:
+        self.file.write(np.ascontiguousarray(frame).data)
+
+    def close(self) -> None:
+        if self.file is not None: self.file.close()
+
+class Y4mWriter(RawWriter):
+    """
+    YUV4MPEG2 stream in 4:2:0 with full range BT.601 colors, which most video tools read directly
+    """
+    def open(self, width: int, height: int, fps: int) -> None:
+        super().open(width, height, fps)
+        self.file.write("YUV4MPEG2 W{} H{} F{}:1 Ip A1:1 C420jpeg\n".format(width, height, fps).encode("ascii"))
+
+    def write(self, frame: np.ndarray) -> None:
+        rgb = frame.astype(np.float32)
+        red, green, blue = rgb[:, :, 0], rgb[:, :, 1], rgb[:, :, 2]
+        luma = 0.299 * red + 0.587 * green + 0.114 * blue
+
+        # Chroma is averaged over 2x2 pixels, an odd last row or column is repeated
+        height, width = luma.shape
+        padded = np.pad(rgb, ((0, height % 2), (0, width % 2), (0, 0)), mode="edge")
+        quads = padded.reshape(padded.shape[0] // 2, 2, padded.shape[1] // 2, 2, 3).mean(axis=(1, 3))
+        red, green, blue = quads[:, :, 0], quads[:, :, 1], quads[:, :, 2]
+        blueDifference = 128 - 0.168736 * red - 0.331264 * green + 0.5 * blue
+        redDifference = 128 + 0.5 * red - 0.418688 * green - 0.081312 * blue
+
+        self.file.write(b"FRAME\n")
+        for plane in (luma, blueDifference, redDifference):
+            self.file.write(np.clip(plane + 0.5, 0, 255).astype(np.uint8).data)
+
+def createWriter(path: str) -> FrameWriter:
+    """
+    Pick the output from the path: .y4m and .raw are video streams, anything else is a PNG directory
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".y4m": return Y4mWriter(path)
+    if extension == ".raw": return RawWriter(path)
+    return PngSequenceWriter(path)
+
+
+class FrameCapture:
+    """
+    Copies every captured frame of a 32 bit surface into one of a fixed pool of preallocated arrays, a single
+    memory copy straight from the surface buffer, then hands it to a writer thread through a bounded queue.
+    When the writer falls behind and no array is free the frame is dropped instead of stalling the game loop,
+    unless the capture is blocking, for replays where every frame matters more than the frame rate
+    """
+    DEFAULT_POOL_SIZE = 8
+
+    logger = Logger(__name__).getInstance()
+
+    def __init__(self, writer: FrameWriter, fps: int, poolSize: int = DEFAULT_POOL_SIZE, isBlocking: bool = False) -> None:
+        self.writer = writer
+        self.fps = fps
+        self.poolSize = poolSize
+        self.isBlocking = isBlocking
+
+        self.size: tuple[int, int] = None
+        self.lastDroppedSize: tuple[int, int] = None
+        self.shifts: tuple[int, int, int] = None
+        self.freeSlots: queue.Queue = queue.Queue(poolSize)
+        self.filledSlots: queue.Queue = queue.Queue(poolSize + 1)
+        self.thread: threading.Thread = None
+
+        self.captured = 0
+        self.written = 0
+        self.dropped = 0
+        self.maxQueued = 0
+
+    def capture(self, surface: pygame.surface.Surface) -> bool:
+        """
+        Queue the current content of surface, return False if the frame was dropped
+        """
+        if self.thread is None: self._start(surface)
+
+        if surface.get_size() != self.size:
+            if surface.get_size() != self.lastDroppedSize:
+                FrameCapture.logger.warning("FrameCapture.capture. dropping frames of size=%s, capture size=%s", surface.get_size(), self.size)
+            self.lastDroppedSize = surface.get_size()
+            self.dropped += 1
+            return False
+
+        try:
+            slot = self.freeSlots.get(self.isBlocking)
+        except queue.Empty:
+            self.dropped += 1
+            return False
+
+        width, height = self.size
+        buffer = surface.get_buffer()
+        np.copyto(slot, np.frombuffer(buffer, dtype=np.uint32).reshape(height, surface.get_pitch() // 4)[:, :width])
+        del buffer
+
+        self.filledSlots.put_nowait(slot)
+        self.captured += 1
+        self.maxQueued = max(self.maxQueued, self.filledSlots.qsize())
+        return True
+
+    def _start(self, surface: pygame.surface.Surface) -> None:
+        if surface.get_bytesize() != 4:
+            raise ValueError("FrameCapture._start. only 32 bit surfaces can be captured, got {} bytes per pixel".format(surface.get_bytesize()))
+
+        self.size = surface.get_size()
+        self.shifts = surface.get_shifts()[:3]
+        width, height = self.size
+        for _ in range(self.poolSize):
+            self.freeSlots.put_nowait(np.empty((height, width), dtype=np.uint32))
+
+        self.writer.open(width, height, self.fps)
+        self.thread = threading.Thread(target=self._run, name="FrameCapture", daemon=True)
+        self.thread.start()
+
+    def _run(self) -> None:
+        while True:
+            slot = self.filledSlots.get()
+            if slot is None: return
+
+            try:
+                frame = np.empty(slot.shape + (3,), dtype=np.uint8)
+                for channel, shift in enumerate(self.shifts):
+                    np.right_shift(slot, shift, out=frame[:, :, channel], casting="unsafe")
+                self.freeSlots.put_nowait(slot)
+                slot = None
+
+                self.writer.write(frame)
+                self.written += 1
+            except Exception:
+                # A blocking capture waits for free slots, the thread has to outlive a failing writer
+                FrameCapture.logger.exception("FrameCapture._run. failed to write frame=%s", self.written + 1)
+            finally:
+                if slot is not None: self.freeSlots.put_nowait(slot)
+
+    def stop(self) -> None:
+        """
+        Write the queued frames and close the output
+        """
+        if self.thread is None: return
+
+        self.filledSlots.put(None)
+        self.thread.join()
+        self.thread = None
+        self.writer.close()
+
+    def getQueued(self) -> int:
+        return self.filledSlots.qsize()
+
+    def getStats(self) -> dict:
+        return {
+            "captured": self.captured,
+            "written": self.written,
+            "dropped": self.dropped,
+            "queued": self.getQueued(),
+            "maxQueued": self.maxQueued
+        }
+
+    def format(self) -> str:
+        return " ".join("{}={}".format(key, value) for key, value in self.getStats().items())
@@ -0,0 +1,258 @@
+import hashlib
+import json
+import os
+import pickle
+import threading
+import time
+import typing
+
+from utils.logger import Logger
+
+class ConfigError(Exception):
+    pass
+
+class ConfigField:
+    def __init__(self, key: str, default: typing.Any, convert: typing.Callable[[typing.Any], typing.Any] = None, attr: str = None) -> None:
+        self.key = key
+        self.attr = key if attr is None else attr
+        self.default = default
+        self.convert = convert
+
+class ConfigSchema:
+    """
+    Turns a widget block of a json file into an instance of a slotted config class with every default resolved
+    """
+    def __init__(self, configClass: type, fields: typing.List[ConfigField]) -> None:
+        self.configClass = configClass
+        self.fields = fields
+        self.keys = set(field.key for field in fields)
+
+    def compile(self, block: dict, where: str = "") -> typing.Any:
+        if not isinstance(block, dict):
+            raise ConfigError("{} must be an object".format(where))
+
+        unknownKeys = set(block.keys()) - self.keys
+        if len(unknownKeys) > 0:
+            raise ConfigError("{} unknown keys {}".format(where, sorted(unknownKeys)))
+
+        config = self.configClass()
+        for field in self.fields:
+            if field.key not in block:
+                setattr(config, field.attr, field.default)
+                continue
+
+            try:
+                value = block[field.key] if field.convert is None else field.convert(block[field.key])
+            except (KeyError, TypeError, ValueError) as e:
+                raise ConfigError("{}.{} invalid value {!r}: {}".format(where, field.key, block[field.key], e))
+            setattr(config, field.attr, value)
+
+        return config
+
+    def ensure(self, conf: typing.Any) -> typing.Any:
+        return self.compile(conf, self.configClass.__name__) if isinstance(conf, dict) else conf
+
+    def getSignature(self) -> str:
+        return "{}:{}".format(self.configClass.__name__, ",".join("{}={!r}".format(field.key, field.default) for field in self.fields))
+
+def toInt(value: typing.Any) -> int:
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise TypeError("expected an integer")
+    return value
+
+def toPositiveInt(value: typing.Any) -> int:
+    if toInt(value) <= 0:
+        raise ValueError("expected a positive integer")
+    return value
+
+def toBool(value: typing.Any) -> bool:
+    if not isinstance(value, bool):
+        raise TypeError("expected a boolean")
+    return value
+
+def toStr(value: typing.Any) -> str:
+    if not isinstance(value, str):
+        raise TypeError("expected a string")
+    return value
+
+def toColor(value: typing.Any) -> tuple[int, int, int]:
+    if not isinstance(value, (list, tuple)) or len(value) not in (3, 4) or any(not 0 <= toInt(channel) <= 255 for channel in value):
+        raise ValueError("expected 3 or 4 channels between 0 and 255")
+    return tuple(value)
+
+def toIntTuple(value: typing.Any) -> tuple[int, ...]:
+    if not isinstance(value, (list, tuple)) or len(value) < 2:
+        raise ValueError("expected at least 2 integers")
+    return tuple(toInt(item) for item in value)
+
+def toEnum(enumType: type) -> typing.Callable[[typing.Any], typing.Any]:
+    def convert(value: typing.Any) -> typing.Any:
+        return enumType[toStr(value)]
+    return convert
+
+class ConfigStore:
+    """
+    Parsed and compiled scene configurations, cached by file modification time.
+    Watched files are checked by poll() and their listeners called after a successful reload
+    """
+    DEFAULT_ROOT = "conf"
+    DEFAULT_POLL_INTERVAL_MS = 1000
+    CACHE_VERSION = 1
+
+    _instance = None
+
+    logger = Logger(__name__).getInstance()
+
+    def __init__(self, cacheDir: str = None, pollIntervalMs: int = DEFAULT_POLL_INTERVAL_MS) -> None:
+        self.cacheDir = cacheDir
+        self.pollIntervalMs = pollIntervalMs
+
+        self.rawFiles: dict[str, tuple[float, dict]] = {}
+        self.compiledFiles: dict[str, tuple[float, dict[str, typing.Any]]] = {}
+        self.schemas: dict[str, dict[str, ConfigSchema]] = {}
+        self.listeners: dict[str, typing.List[typing.Callable[[], None]]] = {}
+        self.watchedTimes: dict[str, float] = {}
+        self.lastPollTime = 0.0
+        # Scenes can be preloaded from a background thread
+        self.lock = threading.RLock()
+
+    def preload(self, root: str = DEFAULT_ROOT) -> int:
+        """
+        Parse every json file under root once, return the number of files read
+        """
+        count = 0
+        for directory, _, fileNames in os.walk(root):
+            for fileName in sorted(fileNames):
+                if not fileName.endswith(".json"): continue
+
+                self._loadRaw(os.path.join(directory, fileName).replace(os.sep, "/"))
+                count += 1
+        return count
+
+    def load(self, fileName: str, schemas: dict[str, ConfigSchema]) -> dict[str, typing.Any]:
+        """
+        Compiled config of every widget block declared in schemas, raise ConfigError on a missing or invalid block
+        """
+        with self.lock:
+            self.schemas[fileName] = schemas
+            modifiedTime = self._getModifiedTime(fileName)
+
+            cached = self.compiledFiles.get(fileName)
+            if cached is not None and cached[0] == modifiedTime:
+                return cached[1]
+
+            compiled = self._loadCache(fileName, modifiedTime, schemas)
+            if compiled is None:
+                compiled = self._compile(fileName, self._loadRaw(fileName), schemas)
+                self._saveCache(fileName, modifiedTime, schemas, compiled)
+
+            self.compiledFiles[fileName] = (modifiedTime, compiled)
+            self.watchedTimes.setdefault(fileName, modifiedTime)
+            return compiled
+
+    def watch(self, fileName: str, listener: typing.Callable[[], None]) -> None:
+        self.listeners.setdefault(fileName, []).append(listener)
+        self.watchedTimes.setdefault(fileName, self._getModifiedTime(fileName))
+
+    def unwatch(self, fileName: str, listener: typing.Callable[[], None]) -> None:
+        if listener in self.listeners.get(fileName, []):
+            self.listeners[fileName].remove(listener)
+
+    def poll(self, force: bool = False) -> typing.List[str]:
+        """
+        Reload watched files changed on disk and notify their listeners, return the reloaded files
+        """
+        now = time.perf_counter()
+        if not force and (now - self.lastPollTime) * 1000 < self.pollIntervalMs: return []
+        self.lastPollTime = now
+
+        reloaded = []
+        for fileName, knownTime in list(self.watchedTimes.items()):
+            try:
+                modifiedTime = self._getModifiedTime(fileName)
+            except ConfigError:
+                continue
+            if modifiedTime == knownTime: continue
+
+            self.watchedTimes[fileName] = modifiedTime
+            if fileName in self.schemas:
+                try:
+                    self.load(fileName, self.schemas[fileName])
+                except ConfigError as e:
+                    ConfigStore.logger.error("ConfigStore.poll. keep previous config, %s", e)
+                    continue
+
+            ConfigStore.logger.info("ConfigStore.poll. reloaded fileName=%s", fileName)
+            reloaded.append(fileName)
+            for listener in list(self.listeners.get(fileName, [])):
+                listener()
+
+        return reloaded
+
+    def _getModifiedTime(self, fileName: str) -> float:
+        try:
+            return os.stat(fileName).st_mtime
+        except OSError as e:
+            raise ConfigError("{} cannot be read: {}".format(fileName, e))
+
+    def _loadRaw(self, fileName: str) -> dict:
+        modifiedTime = self._getModifiedTime(fileName)
+
+        cached = self.rawFiles.get(fileName)
+        if cached is not None and cached[0] == modifiedTime:
+            return cached[1]
+
+        try:
+            with open(fileName) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ConfigError("{} cannot be parsed: {}".format(fileName, e))
+        if not isinstance(data, dict):
+            raise ConfigError("{} must contain an object".format(fileName))
+
+        self.rawFiles[fileName] = (modifiedTime, data)
+        return data
+
+    def _compile(self, fileName: str, data: dict, schemas: dict[str, ConfigSchema]) -> dict[str, typing.Any]:
+        compiled = {}
+        for name, schema in schemas.items():
+            if name not in data:
+                raise ConfigError("{} missing block {}".format(fileName, name))
+            compiled[name] = schema.compile(data[name], "{}:{}".format(fileName, name))
+        return compiled
+
+    def _getCachePath(self, fileName: str, schemas: dict[str, ConfigSchema]) -> str:
+        signature = "|".join("{}={}".format(name, schema.getSignature()) for name, schema in schemas.items())
+        digest = hashlib.sha1("{}|{}|{}".format(ConfigStore.CACHE_VERSION, fileName, signature).encode()).hexdigest()
+        return os.path.join(self.cacheDir, "{}.pickle".format(digest))
+
+    def _loadCache(self, fileName: str, modifiedTime: float, schemas: dict[str, ConfigSchema]) -> dict[str, typing.Any]:
+        if self.cacheDir is None: return None
+
+        try:
+            with open(self._getCachePath(fileName, schemas), "rb") as f:
+                cachedTime, compiled = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            return None
+        return compiled if cachedTime == modifiedTime else None
+
+    def _saveCache(self, fileName: str, modifiedTime: float, schemas: dict[str, ConfigSchema], compiled: dict[str, typing.Any]) -> None:
+        if self.cacheDir is None: return
+
+        try:
+            os.makedirs(self.cacheDir, exist_ok=True)
+            with open(self._getCachePath(fileName, schemas), "wb") as f:
+                pickle.dump((modifiedTime, compiled), f)
+        except OSError as e:
+            ConfigStore.logger.warning("ConfigStore._saveCache. cannot write cache for %s: %s", fileName, e)
+
+    @staticmethod
+    def configure(cacheDir: str = None, pollIntervalMs: int = DEFAULT_POLL_INTERVAL_MS) -> "ConfigStore":
+        ConfigStore._instance = ConfigStore(cacheDir, pollIntervalMs)
+        return ConfigStore._instance
+
+    @staticmethod
+    def getInstance() -> "ConfigStore":
+        if ConfigStore._instance is None:
+            ConfigStore._instance = ConfigStore()
+        return ConfigStore._instance
@@ -2,4 +2,44 @@ GAME = "Guess The Number"
 WIDTH = 500
 HEIGHT = 500
 FPS = 60
-BACKGROUND_COLOR = (0, 0, 0)
\ No newline at end of file
+BACKGROUND_COLOR = (0, 0, 0)
+RESIZABLE_WINDOW = False
+
+DIRTY_RECT_RENDERING = False
+STATIC_LAYER_RENDERING = True
+SCENE_PRELOADING = True
+SCENE_STACK_MAX_DEPTH = 8
+SCENE_CACHE_SIZE = 6
+
+ADAPTIVE_FRAME_PACING = False
+IDLE_WAIT_TIMEOUT_MS = 1000
+
+EVENT_FILTERING = True
+MAX_EVENTS_PER_FRAME = 64
+
+FIXED_TIMESTEP = False
+UPDATE_RATE = 60
+MAX_CATCH_UP_STEPS = 5
+
+CONFIG_ROOT = "conf"
+CONFIG_CACHE_DIR = None
+CONFIG_HOT_RELOAD = False
+CONFIG_POLL_INTERVAL_MS = 1000
+
+STARTUP_BUDGET_MS = 500
+
+LOG_LEVEL = "INFO"
+LOG_ASYNC = True
+LOG_QUEUE_SIZE = 10000
+LOG_JSON_PATH = None
+LOG_SAMPLING = {}
+LOG_RATE_LIMITS = {}
+
+PROFILER_ENABLED = False
+PROFILER_WINDOW_SIZE = 600
+PROFILER_EXPORT_PATH = None
+
+RESULTS_STORE_ENABLED = True
+RESULTS_STORE_PATH = "data/results.bin"
+
+CAPTURE_POOL_SIZE = 8
\ No newline at end of file
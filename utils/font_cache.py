@@ -0,0 +1,42 @@
+import threading
+import pygame
+
+
+class FontCache:
+    """
+    Fonts are created on first use and shared, the font module is initialised by the first request
+    """
+    DEFAULT_NAME = None
+    DEFAULT_SIZE = 30
+
+    _instance = None
+
+    def __init__(self) -> None:
+        self.fonts: dict[tuple[str, int], pygame.font.Font] = {}
+        self.lock = threading.Lock()
+
+    def get(self, name: str = DEFAULT_NAME, size: int = DEFAULT_SIZE) -> pygame.font.Font:
+        key = (name, size)
+
+        font = self.fonts.get(key)
+        if font is not None: return font
+
+        with self.lock:
+            font = self.fonts.get(key)
+            if font is None:
+                if not pygame.font.get_init(): pygame.font.init()
+                font = pygame.font.Font(name, size)
+                self.fonts[key] = font
+            return font
+
+    def getDefault(self) -> pygame.font.Font:
+        return self.get(FontCache.DEFAULT_NAME, FontCache.DEFAULT_SIZE)
+
+    def clear(self) -> None:
+        self.fonts.clear()
+
+    @staticmethod
+    def getInstance() -> "FontCache":
+        if FontCache._instance is None:
+            FontCache._instance = FontCache()
+        return FontCache._instance
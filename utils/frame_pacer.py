@@ -0,0 +1,192 @@
+import time
+import typing
+import pygame
+
+class FramePacer:
+    """
+    Runs the loop at the target frame rate while there is work, otherwise sleeps in pygame.event.wait
+    until an event comes in or the idle timeout expires
+    """
+    def __init__(self, fps: int, idleTimeoutMs: int, isAdaptive: bool = False) -> None:
+        self.fps = fps
+        self.idleTimeoutMs = idleTimeoutMs
+        self.isAdaptive = isAdaptive
+
+        self.clock: pygame.time.Clock = pygame.time.Clock()
+        self.lastTime = time.perf_counter()
+
+        self.idleSeconds = 0.0
+        self.activeSeconds = 0.0
+        self.idleFrames = 0
+        self.activeFrames = 0
+        self.wakeUps = 0
+
+    def nextFrame(self, hasPendingWork: bool) -> typing.List[pygame.event.Event]:
+        """
+        Wait for the next frame and return the events to process in it
+        """
+        if not self.isAdaptive or hasPendingWork or pygame.event.peek():
+            self.clock.tick(self.fps)
+            self.activeFrames += 1
+            self._addTime(False)
+            return pygame.event.get()
+
+        self._addTime(False)
+        event = pygame.event.wait(self.idleTimeoutMs)
+        self.idleFrames += 1
+        self._addTime(True)
+
+        if event.type == pygame.NOEVENT: return []
+
+        self.wakeUps += 1
+        # The wait skipped clock.tick, keep the clock from counting the idle time as a long frame
+        self.clock.tick()
+        return [event] + pygame.event.get()
+
+    def getSteps(self) -> int:
+        """
+        Updates to run this frame, one per frame as update is tied to the frame rate
+        """
+        return 1
+
+    def isRenderDue(self) -> bool:
+        return True
+
+    def getAlpha(self) -> float:
+        return 1.0
+
+    def _addTime(self, isIdle: bool) -> None:
+        now = time.perf_counter()
+        if isIdle:
+            self.idleSeconds += now - self.lastTime
+        else:
+            self.activeSeconds += now - self.lastTime
+        self.lastTime = now
+
+    def getStats(self) -> dict:
+        return {
+            "idleSeconds": self.idleSeconds,
+            "activeSeconds": self.activeSeconds,
+            "idleFrames": self.idleFrames,
+            "activeFrames": self.activeFrames,
+            "wakeUps": self.wakeUps
+        }
+
+    def format(self) -> str:
+        totalSeconds = max(self.idleSeconds + self.activeSeconds, 1e-9)
+        return "idle={:.1f}s ({:.0%}) active={:.1f}s idleFrames={} activeFrames={} wakeUps={}".format(self.idleSeconds, 
+            self.idleSeconds / totalSeconds, self.activeSeconds, self.idleFrames, self.activeFrames, self.wakeUps)
+
+
+class FixedStepPacer:
+    """
+    Runs update at a fixed rate and renders at its own rate. Real time goes into an accumulator that is spent
+    in whole update steps, at most maxCatchUpSteps per frame, a slower backlog is dropped so the game slows down
+    instead of spiralling. The time left in the accumulator is the interpolation alpha between the last two steps.
+    When adaptive it sleeps in pygame.event.wait like FramePacer while there is no work
+    """
+    DEFAULT_MAX_CATCH_UP_STEPS = 5
+
+    def __init__(self, updateRate: int, renderRate: int, idleTimeoutMs: int, isAdaptive: bool = False,
+            maxCatchUpSteps: int = DEFAULT_MAX_CATCH_UP_STEPS) -> None:
+        self.stepSeconds = 1 / updateRate
+        self.renderSeconds = 1 / renderRate
+        self.idleTimeoutMs = idleTimeoutMs
+        self.isAdaptive = isAdaptive
+        self.maxCatchUpSteps = maxCatchUpSteps
+
+        self.lastTime = time.perf_counter()
+        self.nextRenderTime = self.lastTime
+        self.accumulator = 0.0
+        self.steps = 0
+        self.renderDue = False
+
+        self.frames = 0
+        self.updates = 0
+        self.renders = 0
+        self.skippedRenders = 0
+        self.catchUpSteps = 0
+        self.droppedSteps = 0
+        self.maxSteps = 0
+        self.wakeUps = 0
+
+    def nextFrame(self, hasPendingWork: bool) -> typing.List[pygame.event.Event]:
+        """
+        Wait until the next update step or render is due and return the events to process in this frame
+        """
+        self.frames += 1
+        if self.isAdaptive and not hasPendingWork and not pygame.event.peek():
+            event = pygame.event.wait(self.idleTimeoutMs)
+            # Nothing moved while idle, start over instead of catching up with the time spent waiting
+            self.lastTime = time.perf_counter()
+            self.nextRenderTime = self.lastTime
+            self.accumulator = 0.0
+            self.steps = 0
+            self.renderDue = True
+            if event.type == pygame.NOEVENT: return []
+
+            self.wakeUps += 1
+            return [event] + pygame.event.get()
+
+        now = time.perf_counter()
+        wakeTime = min(self.lastTime + self.stepSeconds - self.accumulator, self.nextRenderTime)
+        if wakeTime > now:
+            time.sleep(wakeTime - now)
+            now = time.perf_counter()
+
+        self._advance(now)
+        return pygame.event.get()
+
+    def _advance(self, now: float) -> None:
+        self.accumulator += now - self.lastTime
+        self.lastTime = now
+
+        steps = int(self.accumulator / self.stepSeconds)
+        if steps > self.maxCatchUpSteps:
+            self.droppedSteps += steps - self.maxCatchUpSteps
+            steps = self.maxCatchUpSteps
+        self.accumulator = min(self.accumulator - steps * self.stepSeconds, self.stepSeconds)
+
+        self.steps = steps
+        self.updates += steps
+        self.catchUpSteps += max(0, steps - 1)
+        self.maxSteps = max(self.maxSteps, steps)
+
+        self.renderDue = now >= self.nextRenderTime
+        if not self.renderDue: return
+
+        # Render times missed by a slow frame are skipped, the schedule stays on the render rate grid
+        missed = int((now - self.nextRenderTime) / self.renderSeconds)
+        self.skippedRenders += missed
+        self.nextRenderTime += (missed + 1) * self.renderSeconds
+        self.renders += 1
+
+    def getSteps(self) -> int:
+        """
+        Update steps due in this frame
+        """
+        return self.steps
+
+    def isRenderDue(self) -> bool:
+        return self.renderDue
+
+    def getAlpha(self) -> float:
+        """
+        How far real time is past the last update step, in steps, for drawing between the last two states
+        """
+        return self.accumulator / self.stepSeconds
+
+    def getStats(self) -> dict:
+        return {
+            "frames": self.frames,
+            "updates": self.updates,
+            "renders": self.renders,
+            "skippedRenders": self.skippedRenders,
+            "catchUpSteps": self.catchUpSteps,
+            "droppedSteps": self.droppedSteps,
+            "maxSteps": self.maxSteps,
+            "wakeUps": self.wakeUps
+        }
+
+    def format(self) -> str:
+        return " ".join("{}={}".format(key, value) for key, value in self.getStats().items())
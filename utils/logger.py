@@ -1,13 +1,200 @@
+import atexit
+import json
 import logging
+import logging.handlers
+import queue
+import threading
+import time
 
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s - %(message)s"
+
+# The root stays at WARNING until the game or a tool picks a level, other libraries follow it too
 logging.basicConfig(
-    format="%(asctime)s %(levelname)s %(name)s - %(message)s"
+    format=LOG_FORMAT,
+    level=logging.WARNING
 )
 
 class Logger:
-    def __init__(self, name: str, level: int = logging.DEBUG) -> None:
+    def __init__(self, name: str, level: int = logging.NOTSET) -> None:
+        """
+        Loggers follow the root level by default so configure() can silence hot paths before any message is built
+        """
         self.logger = logging.getLogger(name)
         self.logger.setLevel(level)
 
     def getInstance(self):
-        return self.logger
\ No newline at end of file
+        return self.logger
+
+class DropQueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a bounded queue without waiting. The message is formatted later by the writer thread,
+    records that do not fit in the queue are counted and dropped
+    """
+    def __init__(self, recordQueue: queue.Queue) -> None:
+        super().__init__(recordQueue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class SampleFilter(logging.Filter):
+    """
+    Keep one of every `every` records of a logger below minLevel
+    """
+    def __init__(self, every: int, minLevel: int = logging.WARNING) -> None:
+        super().__init__()
+        self.every = every
+        self.minLevel = minLevel
+        self.seen = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.minLevel or self.every <= 1: return True
+
+        self.seen += 1
+        return self.seen % self.every == 1
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket: at most `rate` records per second of a logger below minLevel, with bursts up to `burst`
+    """
+    def __init__(self, rate: float, burst: int = None, minLevel: int = logging.WARNING) -> None:
+        super().__init__()
+        self.rate = rate
+        self.burst = max(1, int(rate)) if burst is None else burst
+        self.minLevel = minLevel
+
+        self.tokens = float(self.burst)
+        self.lastTime = time.monotonic()
+        self.suppressed = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.minLevel: return True
+
+        now = time.monotonic()
+        self.tokens = min(float(self.burst), self.tokens + (now - self.lastTime) * self.rate)
+        self.lastTime = now
+
+        if self.tokens < 1.0:
+            self.suppressed += 1
+            return False
+
+        self.tokens -= 1.0
+        return True
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    One json object per record. Values passed with extra={...} are written as fields next to the message
+    """
+    RESERVED = set(logging.LogRecord("", 0, "", 0, "", (), None).__dict__.keys()) | {"message", "asctime"}
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": record.created,
+            "level": record.levelname,
+            "name": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in JsonLinesFormatter.RESERVED: data[key] = value
+        if record.exc_info:
+            data["exception"] = self.formatException(record.exc_info)
+
+        return json.dumps(data, default=str)
+
+class LogPipeline:
+    """
+    Root logging setup: callers only enqueue, a QueueListener thread formats and writes to stderr
+    and optionally to a json lines file
+    """
+    DEFAULT_QUEUE_SIZE = 10000
+
+    _instance = None
+
+    def __init__(self, level: int | str = logging.INFO, queueSize: int = DEFAULT_QUEUE_SIZE, jsonPath: str = None) -> None:
+        self.level = level
+        self.handlers: list[logging.Handler] = []
+
+        streamHandler = logging.StreamHandler()
+        streamHandler.setFormatter(logging.Formatter(LOG_FORMAT))
+        self.handlers.append(streamHandler)
+
+        if jsonPath is not None:
+            fileHandler = logging.FileHandler(jsonPath, encoding="utf-8")
+            fileHandler.setFormatter(JsonLinesFormatter())
+            self.handlers.append(fileHandler)
+
+        self.queueHandler = DropQueueHandler(queue.Queue(queueSize))
+        self.queueHandler.setLevel(level)
+        self.listener = logging.handlers.QueueListener(self.queueHandler.queue, *self.handlers, respect_handler_level=True)
+        self.lock = threading.Lock()
+        self.isRunning = False
+
+    def start(self) -> None:
+        with self.lock:
+            if self.isRunning: return
+
+            root = logging.getLogger()
+            for handler in list(root.handlers):
+                root.removeHandler(handler)
+            root.addHandler(self.queueHandler)
+            root.setLevel(self.level)
+
+            self.listener.start()
+            self.isRunning = True
+
+    def stop(self) -> None:
+        """
+        Write out what is still queued and restore a direct stderr handler
+        """
+        with self.lock:
+            if not self.isRunning: return
+
+            self.listener.stop()
+            root = logging.getLogger()
+            root.removeHandler(self.queueHandler)
+            for handler in self.handlers[1:]:
+                handler.close()
+            root.addHandler(self.handlers[0])
+            self.isRunning = False
+
+    def getDropped(self) -> int:
+        return self.queueHandler.dropped
+
+    @staticmethod
+    def getInstance() -> "LogPipeline":
+        return LogPipeline._instance
+
+def setLevel(level: int | str) -> None:
+    """
+    Level of the root logger the game loggers follow, for tools writing their few records directly
+    """
+    logging.getLogger().setLevel(level)
+
+def configure(level: int | str = logging.INFO, queueSize: int = LogPipeline.DEFAULT_QUEUE_SIZE, jsonPath: str = None,
+        sampling: dict[str, int] = None, rateLimits: dict[str, float] = None) -> LogPipeline:
+    """
+    Route all logging through a background writer thread. sampling maps a logger name to keep 1 of N records,
+    rateLimits maps a logger name to the records per second it may emit, both only below WARNING
+    """
+    if LogPipeline._instance is not None:
+        LogPipeline._instance.stop()
+
+    for name in set(sampling or {}) | set(rateLimits or {}):
+        namedLogger = logging.getLogger(name)
+        for oldFilter in list(namedLogger.filters):
+            if isinstance(oldFilter, (SampleFilter, RateLimitFilter)): namedLogger.removeFilter(oldFilter)
+    for name, every in (sampling or {}).items():
+        logging.getLogger(name).addFilter(SampleFilter(every))
+    for name, rate in (rateLimits or {}).items():
+        logging.getLogger(name).addFilter(RateLimitFilter(rate))
+
+    LogPipeline._instance = LogPipeline(level, queueSize, jsonPath)
+    LogPipeline._instance.start()
+    atexit.register(LogPipeline._instance.stop)
+    return LogPipeline._instance
@@ -0,0 +1,161 @@
+import array
+import csv
+import json
+import time
+import typing
+
+
+class RollingStats:
+    """
+    Last `size` samples in a ring buffer, percentiles are computed on request
+    """
+    DEFAULT_SIZE = 600
+
+    def __init__(self, size: int = DEFAULT_SIZE) -> None:
+        self.size = size
+        self.samples = array.array("d", bytes(8 * size))
+        self.count = 0
+        self.totalCount = 0
+        self.maxValue = 0.0
+
+    def add(self, value: float) -> None:
+        self.samples[self.totalCount % self.size] = value
+        self.totalCount += 1
+        self.count = min(self.count + 1, self.size)
+        if value > self.maxValue: self.maxValue = value
+
+    def getPercentile(self, percentile: float) -> float:
+        if self.count == 0: return 0.0
+
+        samples = sorted(self.samples[:self.count])
+        return samples[min(self.count - 1, int(self.count * percentile / 100.0))]
+
+    def getMean(self) -> float:
+        if self.count == 0: return 0.0
+        return sum(self.samples[:self.count]) / self.count
+
+    def getMax(self) -> float:
+        """
+        Largest sample since the profiler started, not only inside the window
+        """
+        return self.maxValue
+
+class FrameProfiler:
+    """
+    Collects input, update and draw time per scene and per widget. Times added during a frame are summed
+    and pushed into rolling stats by endFrame, frames whose work exceeds the budget are counted as overruns
+    """
+    FRAME = "frame"
+    INPUT = "input"
+    UPDATE = "update"
+    DRAW = "draw"
+
+    def __init__(self, budgetMs: float, windowSize: int = RollingStats.DEFAULT_SIZE) -> None:
+        self.budgetMs = budgetMs
+        self.windowSize = windowSize
+
+        self.stats: dict[tuple[str, str], RollingStats] = {}
+        self.current: dict[tuple[str, str], float] = {}
+        self.frameWork = 0.0
+        self.frames = 0
+        self.overruns = 0
+        self.isOverlayVisible = False
+
+    def add(self, scope: str, phase: str, seconds: float) -> None:
+        key = (scope, phase)
+        self.current[key] = self.current.get(key, 0.0) + seconds
+
+    def addWork(self, scope: str, phase: str, seconds: float) -> None:
+        """
+        Add a top level measurement, it also counts towards the frame time
+        """
+        self.add(scope, phase, seconds)
+        self.frameWork += seconds
+
+    def endFrame(self, presentSeconds: float = 0.0) -> None:
+        frameMs = (self.frameWork + presentSeconds) * 1000
+        self._getStats(FrameProfiler.FRAME, FrameProfiler.FRAME).add(frameMs)
+        for key, seconds in self.current.items():
+            self._getStats(*key).add(seconds * 1000)
+
+        self.frames += 1
+        if frameMs > self.budgetMs: self.overruns += 1
+
+        self.current.clear()
+        self.frameWork = 0.0
+
+    def instrument(self, scope: str, widgets: dict[str, typing.Any]) -> None:
+        """
+        Time update and the draw, drawStatic and drawDynamic of every widget not instrumented yet.
+        Widgets rebuilt by a config reload get wrapped again
+        """
+        for name, widget in widgets.items():
+            if "draw" in widget.__dict__: continue
+
+            widgetScope = "{}.{}".format(scope, name)
+            widget.update = self._wrap(widgetScope, FrameProfiler.UPDATE, widget.update)
+            # A draw calling the widget's own drawStatic or drawDynamic is only counted once
+            depth = [0]
+            for methodName in ("draw", "drawStatic", "drawDynamic"):
+                setattr(widget, methodName, self._wrap(widgetScope, FrameProfiler.DRAW, getattr(widget, methodName), depth))
+
+    def _wrap(self, scope: str, phase: str, method: typing.Callable, depth: list[int] = None) -> typing.Callable:
+        depth = [0] if depth is None else depth
+        def timed(*args, **kwargs):
+            if depth[0] > 0: return method(*args, **kwargs)
+
+            depth[0] += 1
+            startTime = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.add(scope, phase, time.perf_counter() - startTime)
+                depth[0] -= 1
+        return timed
+
+    def _getStats(self, scope: str, phase: str) -> RollingStats:
+        key = (scope, phase)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = RollingStats(self.windowSize)
+            self.stats[key] = stats
+        return stats
+
+    def getRows(self) -> typing.List[dict]:
+        rows = []
+        for (scope, phase), stats in sorted(self.stats.items()):
+            rows.append({
+                "scope": scope,
+                "phase": phase,
+                "samples": stats.totalCount,
+                "mean": round(stats.getMean(), 4),
+                "p50": round(stats.getPercentile(50), 4),
+                "p95": round(stats.getPercentile(95), 4),
+                "p99": round(stats.getPercentile(99), 4),
+                "max": round(stats.getMax(), 4)
+            })
+        return rows
+
+    def getSummary(self, scope: str = FRAME, phase: str = FRAME) -> str:
+        stats = self._getStats(scope, phase)
+        name = scope if scope == phase else "{} {}".format(scope, phase)
+        return "{} p50={:.2f} p95={:.2f} p99={:.2f} max={:.2f}ms".format(name, stats.getPercentile(50),
+            stats.getPercentile(95), stats.getPercentile(99), stats.getMax())
+
+    def format(self) -> str:
+        return "frames={} overruns={} budget={:.2f}ms {}".format(self.frames, self.overruns, self.budgetMs, self.getSummary())
+
+    def export(self, path: str) -> None:
+        """
+        Write all stats to path, as json when it ends with .json otherwise as csv
+        """
+        rows = self.getRows()
+        if path.endswith(".json"):
+            with open(path, "w") as f:
+                json.dump({"frames": self.frames, "overruns": self.overruns, "budgetMs": self.budgetMs, "stats": rows}, f, indent=2)
+            return
+
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=["scope", "phase", "samples", "mean", "p50", "p95", "p99", "max"])
+            writer.writeheader()
+            writer.writerows(rows)
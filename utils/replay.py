@@ -0,0 +1,94 @@
+import json
+import typing
+import pygame
+
+class ReplayError(Exception):
+    pass
+
+def encodeEvent(event: pygame.event.Event) -> dict:
+    """
+    Keep the plain attributes of an event, window handles and other objects are left out
+    """
+    attributes = {}
+    for key, value in event.dict.items():
+        if value is None or isinstance(value, (bool, int, float, str)):
+            attributes[key] = value
+        elif isinstance(value, (list, tuple)) and all(isinstance(item, (bool, int, float)) for item in value):
+            attributes[key] = list(value)
+    return {"type": event.type, "attributes": attributes}
+
+def decodeEvent(data: dict) -> pygame.event.Event:
+    attributes = {key: tuple(value) if isinstance(value, list) else value for key, value in data["attributes"].items()}
+    return pygame.event.Event(data["type"], attributes)
+
+class InputRecorder:
+    """
+    Writes the events fed to the scenes as json lines: a header with the seed, one line per frame that
+    had events and a final line with the frame count and the session state
+    """
+    VERSION = 1
+
+    def __init__(self, path: str, seed: int) -> None:
+        self.path = path
+        self.seed = seed
+        self.file = open(path, "w")
+        self._write({"kind": "header", "version": InputRecorder.VERSION, "seed": seed})
+
+    def recordFrame(self, frame: int, events: typing.List[pygame.event.Event]) -> None:
+        if len(events) == 0: return
+        self._write({"kind": "frame", "frame": frame, "events": [encodeEvent(event) for event in events]})
+
+    def close(self, frameCount: int, state: dict) -> None:
+        self._write({"kind": "end", "frames": frameCount, "state": state})
+        self.file.close()
+
+    def _write(self, data: dict) -> None:
+        self.file.write(json.dumps(data, separators=(",", ":")))
+        self.file.write("\n")
+
+class InputReplayer:
+    """
+    Feeds a recording back frame by frame and checks the session ends in the recorded state
+    """
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.seed: int = None
+        self.frameCount = 0
+        self.expectedState: dict = None
+        self.frames: dict[int, typing.List[pygame.event.Event]] = {}
+
+        self._load()
+
+    def _load(self) -> None:
+        with open(self.path) as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+
+        if len(lines) == 0 or lines[0].get("kind") != "header":
+            raise ReplayError("{} is not a recording".format(self.path))
+        if lines[0]["version"] != InputRecorder.VERSION:
+            raise ReplayError("{} has version {}, expected {}".format(self.path, lines[0]["version"], InputRecorder.VERSION))
+        if lines[-1].get("kind") != "end":
+            raise ReplayError("{} is incomplete, the recorded session did not exit".format(self.path))
+
+        self.seed = lines[0]["seed"]
+        self.frameCount = lines[-1]["frames"]
+        self.expectedState = lines[-1]["state"]
+        for line in lines[1:-1]:
+            self.frames[line["frame"]] = [decodeEvent(event) for event in line["events"]]
+
+    def getEvents(self, frame: int) -> typing.List[pygame.event.Event]:
+        return self.frames.get(frame, [])
+
+    def isFinished(self, frame: int) -> bool:
+        return frame >= self.frameCount
+
+    def verify(self, state: dict) -> typing.List[str]:
+        """
+        Differences between the recorded final state and the replayed one, empty when they match
+        """
+        state = json.loads(json.dumps(state))
+        differences = []
+        for key in sorted(set(self.expectedState) | set(state)):
+            if self.expectedState.get(key) != state.get(key):
+                differences.append("{}: recorded={} replayed={}".format(key, self.expectedState.get(key), state.get(key)))
+        return differences
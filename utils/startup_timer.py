@@ -0,0 +1,38 @@
+import time
+
+
+class StartupTimer:
+    """
+    Splits the time from process start to the first presented frame into named phases
+    """
+    def __init__(self, budgetMs: float, startTime: float = None) -> None:
+        self.budgetMs = budgetMs
+        self.startTime = time.perf_counter() if startTime is None else startTime
+        self.lastTime = self.startTime
+        self.phases: list[tuple[str, float]] = []
+
+    def mark(self, phase: str) -> float:
+        """
+        Close the phase running since the previous mark, return its duration in milliseconds
+        """
+        now = time.perf_counter()
+        elapsedMs = (now - self.lastTime) * 1000
+        self.lastTime = now
+        self.phases.append((phase, elapsedMs))
+        return elapsedMs
+
+    def getTotalMs(self) -> float:
+        return (self.lastTime - self.startTime) * 1000
+
+    def isOverBudget(self) -> bool:
+        return self.getTotalMs() > self.budgetMs
+
+    def getStats(self) -> dict[str, float]:
+        stats = {phase: elapsedMs for phase, elapsedMs in self.phases}
+        stats["total"] = self.getTotalMs()
+        stats["budget"] = self.budgetMs
+        return stats
+
+    def format(self) -> str:
+        return " ".join("{}={:.1f}ms".format(phase, elapsedMs) for phase, elapsedMs in self.phases) + \
+            " total={:.1f}ms budget={:.0f}ms".format(self.getTotalMs(), self.budgetMs)
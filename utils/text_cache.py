@@ -0,0 +1,69 @@
+import collections
+import threading
+import pygame
+
+
+class TextCache:
+    DEFAULT_MAX_SIZE = 256
+
+    _instance = None
+
+    def __init__(self, maxSize: int = DEFAULT_MAX_SIZE) -> None:
+        self.maxSize = maxSize
+        self.surfaces: collections.OrderedDict[tuple, pygame.surface.Surface] = collections.OrderedDict()
+        # Held while rendering, so a preload thread never renders text at the same time as the frame loop
+        self.lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, font: pygame.font.Font, text: str, antialias: bool, color: tuple[int, int, int]) -> pygame.surface.Surface:
+        with self.lock:
+            key = (font, text, antialias, tuple(color))
+
+            surface = self.surfaces.get(key)
+            if surface is not None:
+                self.hits += 1
+                self.surfaces.move_to_end(key)
+                return surface
+
+            self.misses += 1
+            surface = font.render(text, antialias, color)
+            self.surfaces[key] = surface
+
+            if len(self.surfaces) > self.maxSize:
+                self.surfaces.popitem(last=False)
+                self.evictions += 1
+
+            return surface
+
+    def setMaxSize(self, maxSize: int) -> None:
+        self.maxSize = maxSize
+
+        while len(self.surfaces) > self.maxSize:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+
+    def getStats(self) -> dict:
+        return {
+            "size": len(self.surfaces),
+            "maxSize": self.maxSize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    def resetStats(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def clear(self) -> None:
+        self.surfaces.clear()
+
+    @staticmethod
+    def getInstance() -> "TextCache":
+        if TextCache._instance is None:
+            TextCache._instance = TextCache()
+        return TextCache._instance
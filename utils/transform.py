@@ -2,58 +2,31 @@ from utils.enum_types import AlignType
 
 
 class TransformUtils:
+    """
+    Offsets are looked up instead of branched on: each AlignType maps to how many half sizes
+    the anchor point sits from the top left corner, horizontally and vertically
+    """
+    HALF_SIZES: dict[AlignType, tuple[int, int]] = {
+        AlignType.MID_CENTER: (1, 1),
+        AlignType.MID_RIGHT: (2, 1),
+        AlignType.MID_LEFT: (0, 1),
+        AlignType.TOP_CENTER: (1, 0),
+        AlignType.TOP_RIGHT: (2, 0),
+        AlignType.TOP_LEFT: (0, 0),
+        AlignType.BOTTOM_CENTER: (1, 2),
+        AlignType.BOTTOM_RIGHT: (2, 2),
+        AlignType.BOTTOM_LEFT: (0, 2)
+    }
     
     @staticmethod
     def alignAnchor(type: AlignType, x: int, y: int, width: int, height: int) -> tuple[int, int]:
-        posX = x
-        posY = y
-        if type == AlignType.MID_CENTER: 
-            posX = x - width // 2
-            posY = y - height // 2
-        elif type == AlignType.MID_RIGHT:
-            posX = x - width
-            posY = y - height // 2
-        elif type == AlignType.MID_LEFT:
-            posY = y - height // 2
-        elif type == AlignType.TOP_CENTER:
-            posX = x - width // 2
-        elif type == AlignType.TOP_RIGHT:
-            posX = x - width
-        elif type == AlignType.BOTTOM_CENTER:
-            posX = x - width // 2
-            posY = y - height
-        elif type == AlignType.BOTTOM_LEFT:
-            posY = y - height
-        elif type == AlignType.BOTTOM_RIGHT:
-            posX = x - width
-            posY = y - height
-        return (posX, posY)
+        halfX, halfY = TransformUtils.HALF_SIZES[type]
+        return (x - width * halfX // 2, y - height * halfY // 2)
 
     @staticmethod
     def alignContent(type: AlignType, containerX: int, containerY: int, containerWidth: int, containerHeight: int) -> tuple[int, int]: 
         """
         Container must have TOP_LEFT anchor
         """
-        posX = containerX
-        posY = containerY
-        if type == AlignType.MID_CENTER: 
-            posX += containerWidth // 2
-            posY += containerHeight // 2
-        elif type == AlignType.MID_RIGHT:
-            posX += containerWidth
-            posY += containerHeight // 2
-        elif type == AlignType.MID_LEFT:
-            posY += containerHeight // 2
-        elif type == AlignType.TOP_CENTER:
-            posX += containerWidth // 2
-        elif type == AlignType.TOP_RIGHT:
-            posX += containerWidth
-        elif type == AlignType.BOTTOM_CENTER:
-            posX += containerWidth // 2
-            posY += containerHeight
-        elif type == AlignType.BOTTOM_LEFT:
-            posY += containerHeight
-        elif type == AlignType.BOTTOM_RIGHT:
-            posX += containerWidth
-            posY += containerHeight
-        return (posX, posY)
\ No newline at end of file
+        halfX, halfY = TransformUtils.HALF_SIZES[type]
+        return (containerX + containerWidth * halfX // 2, containerY + containerHeight * halfY // 2)
\ No newline at end of file